@@ -1,8 +1,12 @@
 ﻿using Microsoft.AspNetCore.Mvc;
+using System.Security.Cryptography;
+using System.Text;
 using System.Text.Json;
 using ApiGateway.Models.Entities;
+using ApiGateway.Services;
+using Microsoft.AspNetCore.Http.Features;
 using Microsoft.EntityFrameworkCore;
-using Microsoft.Extensions.AI;
+using Polly;
 
 
 namespace ApiGateway.Controllers
@@ -14,199 +18,487 @@ namespace ApiGateway.Controllers
     /// </summary>
     [Route("api/[controller]")]
     [ApiController]
+    [ServiceFilter(typeof(ApiKeyAuthFilter))]
     public class APIServicesController : Controller
     {
         private readonly CryptoDbContext _db;
         private readonly RedisCacheContext _redisCache;
+        private readonly MarketDataService _marketData;
+        private readonly AgentService _agent;
+        private readonly ILogger<APIServicesController> _logger;
+
+        private static readonly int[] SupportedHistoryRanges = [1, 7, 30, 365];
+        private static readonly TimeSpan QueuePositionInterval = TimeSpan.FromMilliseconds(250);
+
+        /// <summary>
+        /// The most candles returned by one Candles request; longer ranges keep the newest ones.
+        /// </summary>
+        private const int MaxCandles = 1000;
+
+        // The list is static, so its validator is computed once and lets clients revalidate with If-None-Match
+        private static readonly string SupportedCurrenciesETag =
+            $"\"{Convert.ToHexString(SHA256.HashData(JsonSerializer.SerializeToUtf8Bytes(SupportedCurrencies.ByName)))[..16]}\"";
         
         /// <summary>
         /// Initializes a new instance of the <see cref="UsersController"/> class with the specified database context.
         /// </summary>
         /// <param name="db">The database context used to access user data.</param>
         /// <param name="distributedCache">Redis database context used to access logged-in user data.</param>
-        public APIServicesController(CryptoDbContext db, RedisCacheContext distributedCache)
+        /// <param name="marketData">Cached, coalesced access to the Coinlore and CoinGecko APIs.</param>
+        /// <param name="agent">Conversations, queueing and answer cache of the AI agent.</param>
+        /// <param name="logger">Logger of agent and parsing failures.</param>
+        public APIServicesController(CryptoDbContext db, RedisCacheContext distributedCache, MarketDataService marketData,
+            AgentService agent, ILogger<APIServicesController> logger)
         {
             _db = db;
             _redisCache = distributedCache;
+            _marketData = marketData;
+            _agent = agent;
+            _logger = logger;
         }
 
         /// <summary>
-        /// Sends a prompt to a local TinyLlama model running at http://localhost:11434/api/generate
-        /// and returns the AI-generated response.
+        /// Sends a prompt to the AI agent and returns its complete answer. The prompt continues the
+        /// user's conversation, waits in the agent queue for the model, and opening prompts that were
+        /// asked before are answered from the cache.
         /// </summary>
         /// <param name="prompt">The prompt string to be processed by the AI agent.</param>
         /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
-        /// <returns>Returns the response generated by the AI model or an error if the request fails.</returns>
+        /// <returns>
+        /// Returns the response generated by the AI model, or 503 with a Retry-After header if the
+        /// queue is full or the model is unavailable.
+        /// </returns>
         [HttpPost("Agent")]
         public async Task<IActionResult> AskLAgent([FromForm] string prompt, [FromHeader(Name = "X-Api-Key")] string apiKey)
         {
-            var user = await GetUserByApiKey(apiKey);
-            if (user == null)
-                return Unauthorized("Invalid or missing API key: X-Api-Key=YOUR-API-KEY");
+            var agentPrompt = await _agent.Prepare(HttpContext.GetApiUser(), prompt);
+            var answer = agentPrompt.CachedAnswer;
 
-            OllamaChatClient chatClient = new OllamaChatClient(endpoint: new Uri("http://192.168.33.51:11434"), modelId: "tinyllama:latest");
-            List<ChatMessage> chatHistory = [];
+            if (answer == null)
+            {
+                using var ticket = _agent.Enqueue(agentPrompt, HttpContext.RequestAborted);
+                if (ticket == null)
+                    return AgentBusy();
+
+                var text = new StringBuilder();
+                try
+                {
+                    await ticket.Ready;
+                    await foreach (var token in _agent.Generate(agentPrompt, HttpContext.RequestAborted))
+                        text.Append(token);
+                }
+                catch (Exception ex) when (ex is ExecutionRejectedException or HttpRequestException)
+                {
+                    _logger.LogWarning(ex, "AI agent request failed");
+                    return StatusCode(StatusCodes.Status503ServiceUnavailable, "AI agent is unavailable.");
+                }
+                answer = text.ToString();
+            }
 
-            chatHistory.Add(new ChatMessage(ChatRole.User, prompt));
+            await _agent.Complete(agentPrompt, answer);
+            var response = "AI Agent Response: " + answer;
+            _logger.LogDebug("{AgentResponse}", response);
 
-            var response = "AI Agent Response: ";
+            return Ok(new { AgentResponse = response });
+        }
 
-            await foreach (var item in chatClient.GetStreamingResponseAsync(chatHistory))
+        /// <summary>
+        /// Streaming variant of <see cref="AskLAgent"/>. Relays the model's tokens to the client as
+        /// Server-Sent Events as soon as Ollama produces them, so the first token is not delayed
+        /// by the rest of the completion. While the prompt waits for the model, <c>event: queued</c>
+        /// messages with <c>{"position": n}</c> report its place in the queue whenever it changes.
+        /// Each token is <c>data: {"token": "..."}</c>; the stream ends with an <c>event: done</c> message,
+        /// or <c>event: error</c> if the model fails mid-stream. Closing the connection cancels generation.
+        /// </summary>
+        /// <param name="prompt">The prompt string to be processed by the AI agent.</param>
+        /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <returns>
+        /// A <c>text/event-stream</c> response, <c>Unauthorized</c> if the API key is invalid, or 503
+        /// with a Retry-After header if the queue is full.
+        /// </returns>
+        [HttpPost("AgentStream")]
+        public async Task<IActionResult> AskAgentStream([FromForm] string prompt, [FromHeader(Name = "X-Api-Key")] string apiKey)
+        {
+            var cancellationToken = HttpContext.RequestAborted;
+            var agentPrompt = await _agent.Prepare(HttpContext.GetApiUser(), prompt);
+
+            // Cached answers do not need the model, so they never wait in the queue
+            using var ticket = agentPrompt.CachedAnswer == null ? _agent.Enqueue(agentPrompt, cancellationToken) : null;
+            if (agentPrompt.CachedAnswer == null && ticket == null)
+                return AgentBusy();
+
+            Response.ContentType = "text/event-stream";
+            Response.Headers.CacheControl = "no-cache";
+            HttpContext.Features.Get<IHttpResponseBodyFeature>()?.DisableBuffering();
+
+            try
+            {
+                var answer = new StringBuilder();
+                if (ticket == null)
+                {
+                    answer.Append(agentPrompt.CachedAnswer);
+                    await WriteEvent(null, new { token = agentPrompt.CachedAnswer }, cancellationToken);
+                }
+                else
+                {
+                    var lastPosition = 0;
+                    while (!ticket.Ready.IsCompleted)
+                    {
+                        var position = ticket.Position;
+                        if (position > 0 && position != lastPosition)
+                            await WriteEvent("queued", new { position }, cancellationToken);
+                        lastPosition = position;
+                        await Task.WhenAny(ticket.Ready, Task.Delay(QueuePositionInterval, cancellationToken));
+                    }
+                    await ticket.Ready;
+
+                    await foreach (var token in _agent.Generate(agentPrompt, cancellationToken))
+                    {
+                        answer.Append(token);
+                        await WriteEvent(null, new { token }, cancellationToken);
+                    }
+                }
+
+                await _agent.Complete(agentPrompt, answer.ToString());
+                await WriteEvent("done", new { }, cancellationToken);
+            }
+            catch (OperationCanceledException)
             {
-                Console.Write(item.Text);
-                response += item.Text;
+                // The client stopped the response mid-stream
+            }
+            catch (Exception ex) when (ex is ExecutionRejectedException or HttpRequestException)
+            {
+                _logger.LogWarning(ex, "AI agent request failed");
+                if (!Response.HasStarted)
+                    return StatusCode(StatusCodes.Status503ServiceUnavailable, "AI agent is unavailable.");
+                await WriteEvent("error", new { message = "AI agent is unavailable." }, cancellationToken);
             }
 
-            chatHistory.Add(new ChatMessage(ChatRole.Assistant, response));
-            Console.WriteLine();
+            return new EmptyResult();
+        }
 
-            return Ok(new { AgentResponse = response });
+        /// <summary>
+        /// Clears the user's conversation with the AI agent, so the next prompt starts a new one.
+        /// </summary>
+        /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <returns>A confirmation message.</returns>
+        [HttpDelete("AgentSession")]
+        public async Task<IActionResult> ResetAgentSession([FromHeader(Name = "X-Api-Key")] string apiKey)
+        {
+            await _agent.Reset(HttpContext.GetApiUser());
+            return Ok(new { Message = "Conversation cleared." });
         }
 
         /// <summary>
-        /// Fetches the current information of a cryptocurrency from the Coinlore API based on its ID,
-        /// stores the price and symbol in memory, and logs the history to the console.
+        /// The answer to a prompt that found the agent queue full: clients should retry shortly.
+        /// </summary>
+        private ObjectResult AgentBusy()
+        {
+            Response.Headers.RetryAfter = "5";
+            return StatusCode(StatusCodes.Status503ServiceUnavailable, "AI agent is busy, try again shortly.");
+        }
+
+        /// <summary>
+        /// Writes and flushes one Server-Sent Event; <paramref name="name"/> is omitted for token messages.
+        /// </summary>
+        private async Task WriteEvent(string? name, object data, CancellationToken cancellationToken)
+        {
+            var message = $"data: {JsonSerializer.Serialize(data)}\n\n";
+            await Response.WriteAsync(name == null ? message : $"event: {name}\n{message}", cancellationToken);
+            await Response.Body.FlushAsync(cancellationToken);
+        }
+
+        /// <summary>
+        /// Fetches the current quote of a cryptocurrency from the Coinlore API and its price history
+        /// from CoinGecko, falling back to the locally collected history when CoinGecko is unavailable.
         /// </summary>
         /// <param name="id">The Coinlore ID of the cryptocurrency.</param>
         /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <param name="days">History range in days: 1, 7, 30 or 365. Defaults to 1.</param>
+        /// <param name="since">
+        /// Optional Unix time in milliseconds of the newest point the client already stores.
+        /// When set, only points after it (and within the range) are returned.
+        /// </param>
+        /// <param name="delta">Whether the history timestamps are delta encoded. Defaults to false.</param>
         /// <returns>
-        /// Returns the API response as-is if successful. Also appends the current price and symbol to
-        /// the local in-memory history list.
+        /// A <see cref="CurrencyInfo"/> with the typed quote and the history as columnar
+        /// <c>{ timestamps, prices, delta }</c> arrays with millisecond timestamps, oldest first.
         /// </returns>
         [HttpPost("CurrencyInfo")]
-        public async Task<IActionResult> GetCryptoCurrencyInfo([FromForm] int id, [FromHeader(Name = "X-Api-Key")] string apiKey)
+        public async Task<IActionResult> GetCryptoCurrencyInfo([FromForm] int id, [FromHeader(Name = "X-Api-Key")] string apiKey,
+            [FromForm] int days = 1, [FromForm] long since = 0, [FromForm] bool delta = false)
         {
+            if (!SupportedHistoryRanges.Contains(days))
+                return BadRequest("Supported history ranges are 1, 7, 30 and 365 days.");
+
             if (string.IsNullOrEmpty(id.ToString()))
                 return BadRequest("Currency ID is required.");    
             
-            var user = await GetUserByApiKey(apiKey);
-            
-            if (string.IsNullOrEmpty(apiKey) || user == null)
-                return Unauthorized("Invalid or missing API key: X-Api-Key=YOUR-API-KEY");
-
             // Step 1: Fetch Currency data from CoinLore
-            var client = new HttpClient();
-            var response = await client.GetAsync("https://api.coinlore.net/api/ticker/?id=" + id);
-
-            if (response.IsSuccessStatusCode)
+            MarketDataEntry ticker;
+            try
+            {
+                ticker = await _marketData.GetTicker(id);
+            }
+            catch (HttpRequestException ex)
             {
-                var content = await response.Content.ReadAsStringAsync();
-                var priceHistory = new List<PriceHistory>();
+                return StatusCode((int?)ex.StatusCode ?? StatusCodes.Status502BadGateway, "Failed to fetch data");
+            }
 
-                try
+            try
+            {
+                var data = JsonSerializer.Deserialize<List<Dictionary<string, object>>>(ticker.Content);
+                if (data != null && data.Count > 0)
                 {
-                    var data = JsonSerializer.Deserialize<List<Dictionary<string, object>>>(content);
-                    if (data != null && data.Count > 0)
+                    var quote = CurrencyQuote.FromTicker(data[0]);
+
+                    // Step 2: Fetch historical data from CoinGecko; clients that already have the
+                    // older points only receive the tail after 'since'
+                    var rangeStart = DateTimeOffset.UtcNow.AddDays(-days);
+                    var historyStart = since > 0
+                        ? DateTimeOffset.FromUnixTimeMilliseconds(Math.Max(since, rangeStart.ToUnixTimeMilliseconds()))
+                        : rangeStart;
+
+                    MarketDataEntry chart;
+                    try
                     {
-                        var item = data[0];
-                        var nameId = item["nameid"].ToString()?.ToLower();
-                        var symbol= item["symbol"].ToString();
-
-                        // Step 2: Fetch historical data from CoinGecko
-                        var chartUrl = $"https://api.coingecko.com/api/v3/coins/{nameId}/market_chart?vs_currency=usd&days=1";
-                        var chartResponse = await client.GetAsync(chartUrl);
-
-                        // Fallback: Query local DB for historical prices
-                        if (!chartResponse.IsSuccessStatusCode)
-                        {
-                            var oneDayAgo = DateTime.UtcNow.AddDays(-1);
-                            var localHistory = await _db.PriceHistories
-                                .Where(p => p.CryptoId == id && p.Timestamp >= oneDayAgo)
-                                .OrderByDescending(p => p.Timestamp)
-                                .ToListAsync();
-                            
-                            return Ok(new { currencyData = content, currencyHistory = localHistory });
-                        }
-
-                        var chartContent = await chartResponse.Content.ReadAsStringAsync();
-
-                        var chartJson = JsonDocument.Parse(chartContent);
-                        var prices = chartJson.RootElement.GetProperty("prices");
-
-                        foreach (var pricePoint in prices.EnumerateArray())
-                        {
-                            var timestamp = DateTimeOffset.FromUnixTimeMilliseconds((long)pricePoint[0].GetDouble()).UtcDateTime;
-                            var value = pricePoint[1].GetDecimal();
-
-                            var record = new PriceHistory
-                            {
-                                CryptoId = id,
-                                Symbol = symbol ?? "UNKNOWN",
-                                Timestamp = timestamp,
-                                Price = value
-                            };
-
-                            priceHistory.Add(record);
-                            _db.PriceHistories.Add(record);
-                        }
-
-                        await _db.SaveChangesAsync();
-                        return Ok(new { currencyData = content, currencyHistory = priceHistory });
+                        chart = await _marketData.GetChart(quote.NameId.ToLower(), days);
+                    }
+                    catch (HttpRequestException)
+                    {
+                        // Fallback: the locally collected history, as raw points for a day and
+                        // as candle closes for longer ranges
+                        var localPoints = days == 1
+                            ? await GetStoredPoints(id, historyStart.UtcDateTime)
+                            : await GetStoredCloses(id, CandleRollup.ForRange(TimeSpan.FromDays(days)), historyStart.UtcDateTime);
+                        return Ok(new CurrencyInfo { Quote = quote, History = PriceColumns.Create(localPoints, delta), Partial = true });
+                    }
+
+                    using var chartJson = JsonDocument.Parse(chart.Content);
+                    var prices = chartJson.RootElement.GetProperty("prices");
+                    var points = new List<(long, decimal)>(prices.GetArrayLength());
+
+                    foreach (var pricePoint in prices.EnumerateArray())
+                    {
+                        var timestampMs = (long)pricePoint[0].GetDouble();
+                        if (timestampMs <= since)
+                            continue;
+
+                        points.Add((timestampMs, pricePoint[1].GetDecimal()));
                     }
-                }
-                catch (Exception ex)
-                {
-                    Console.WriteLine("Failed to parse or store price: " + ex.Message);
-                    return StatusCode(500, "Internal error while processing crypto data.");
-                }
 
+                    // Persisting the series is left to PriceHistoryCollector, so reads never write
+                    return Ok(new CurrencyInfo { Quote = quote, History = PriceColumns.Create(points, delta) });
+                }
+            }
+            catch (Exception ex)
+            {
+                _logger.LogError(ex, "Failed to parse price of currency {CryptoId}", id);
+                return StatusCode(500, "Internal error while processing crypto data.");
             }
 
-            return StatusCode((int)response.StatusCode, "Failed to fetch data");
+            return NotFound("Currency not found.");
         }
 
         /// <summary>
-        /// Retrieves a list of supported cryptocurrencies along with their
-        /// respective values for the external API.
+        /// Reads the collected price points of a cryptocurrency after <paramref name="start"/>.
         /// </summary>
-        /// <param name="apiKey">The API key identifying the user.
-        /// Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <param name="id">The Coinlore ID of the cryptocurrency.</param>
+        /// <param name="start">Only points after this UTC time are returned.</param>
+        /// <returns>(Unix time in milliseconds, price) pairs, oldest first.</returns>
+        private async Task<List<(long, decimal)>> GetStoredPoints(int id, DateTime start)
+        {
+            var history = await _db.PriceHistories
+                .AsNoTracking()
+                .Where(p => p.CryptoId == id && p.Timestamp > start)
+                .OrderBy(p => p.Timestamp)
+                .Select(p => new { p.Timestamp, p.Price })
+                .ToListAsync();
+
+            return history
+                .Select(p => (new DateTimeOffset(p.Timestamp, TimeSpan.Zero).ToUnixTimeMilliseconds(), p.Price))
+                .ToList();
+        }
+
+        /// <summary>
+        /// Reads the close prices of the candles of a cryptocurrency that open after <paramref name="start"/>,
+        /// one row per bucket instead of every collected point.
+        /// </summary>
+        /// <param name="id">The Coinlore ID of the cryptocurrency.</param>
+        /// <param name="resolution">The width of the candles.</param>
+        /// <param name="start">Only candles opening after this UTC time are returned.</param>
+        /// <returns>(Unix time in milliseconds, close price) pairs, oldest first.</returns>
+        private async Task<List<(long, decimal)>> GetStoredCloses(int id, CandleResolution resolution, DateTime start)
+        {
+            var candles = await _db.PriceCandles
+                .AsNoTracking()
+                .Where(c => c.CryptoId == id && c.Resolution == resolution && c.OpenTime > start)
+                .OrderBy(c => c.OpenTime)
+                .Select(c => new { c.OpenTime, c.Close })
+                .ToListAsync();
+
+            return candles
+                .Select(c => (new DateTimeOffset(c.OpenTime, TimeSpan.Zero).ToUnixTimeMilliseconds(), c.Close))
+                .ToList();
+        }
+
+        /// <summary>
+        /// Returns the OHLC candles of a cryptocurrency, rolled up from the collected price history.
+        /// </summary>
+        /// <param name="id">The Coinlore ID of the cryptocurrency.</param>
+        /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <param name="resolution">
+        /// The candle width: 1m, 5m, 1h or 1d. When omitted, the width that draws the range with a few
+        /// hundred candles is used (1h up to 30 days, 1d beyond).
+        /// </param>
+        /// <param name="from">Unix time in milliseconds of the range start. Defaults to one day before <paramref name="to"/>.</param>
+        /// <param name="to">Unix time in milliseconds of the range end. Defaults to now.</param>
         /// <returns>
-        /// An <see cref="IActionResult"/> containing a dictionary of supported currencies
-        /// if the API key is valid; otherwise, returns <c>Unauthorized</c>.
+        /// The candles that open within the range as columnar <c>{ resolution, timestamps, open, high, low, close }</c>
+        /// arrays, oldest first and at most the newest 1000.
         /// </returns>
-        [HttpGet("SupportedCurrencies")]
-        public async Task<IActionResult> GetCurrencyList([FromHeader(Name = "X-Api-Key")] string apiKey)
-        {            
-            var user = await GetUserByApiKey(apiKey);
-            if(string.IsNullOrEmpty(apiKey) || user == null)
-                return Unauthorized("Invalid or missing API key: X-Api-Key=YOUR-API-KEY");
-            
-            var currencyList = new Dictionary<string, int>
-            {
-                {"Bitcoin (BTC)", 90}, {"Ethereum (ETH)", 80}, {"Solana (SOL)", 48543},
-                {"Ripple (XRP)", 58}, {"Litecoin (LTC)", 1}, {"Cardano (ADA)", 257}
-            };
-            
-            return Ok(new { SupportedCurrencies = currencyList });
+        [HttpGet("Candles")]
+        public async Task<IActionResult> GetCandles([FromQuery] int id, [FromHeader(Name = "X-Api-Key")] string apiKey,
+            [FromQuery] string? resolution = null, [FromQuery] long from = 0, [FromQuery] long to = 0)
+        {
+            if (!SupportedCurrencies.Ids.Contains(id))
+                return NotFound("Currency not found.");
+
+            var maxTime = DateTimeOffset.MaxValue.ToUnixTimeMilliseconds();
+            if (from > maxTime || to > maxTime)
+                return BadRequest("The range must end before the year 10000.");
+
+            var end = to > 0 ? DateTimeOffset.FromUnixTimeMilliseconds(to) : DateTimeOffset.UtcNow;
+            var start = from > 0 ? DateTimeOffset.FromUnixTimeMilliseconds(from) : end.AddDays(-1);
+            if (start >= end)
+                return BadRequest("The range must start before it ends.");
+
+            CandleResolution width;
+            if (string.IsNullOrEmpty(resolution))
+                width = CandleRollup.ForRange(end - start);
+            else if (!CandleRollup.Resolutions.TryGetValue(resolution, out width))
+                return BadRequest("Supported resolutions are 1m, 5m, 1h and 1d.");
+
+            // The newest candles are read backwards along the (CryptoId, Resolution, OpenTime) key
+            var candles = await _db.PriceCandles
+                .AsNoTracking()
+                .Where(c => c.CryptoId == id && c.Resolution == width
+                            && c.OpenTime >= start.UtcDateTime && c.OpenTime < end.UtcDateTime)
+                .OrderByDescending(c => c.OpenTime)
+                .Take(MaxCandles)
+                .ToListAsync();
+            candles.Reverse();
+
+            return Ok(CandleColumns.Create(width, candles));
         }
-        
+
         /// <summary>
-        /// Retrieves a user object by their API key.
-        /// Checks Redis cache first, then falls back to MySQL if not found.
+        /// Returns the price points of a cryptocurrency that are newer than <paramref name="since"/>,
+        /// so live charts can poll for deltas instead of re-downloading the whole history.
         /// </summary>
-        /// <param name="apiKey">The API key associated with the user.</param>
+        /// <param name="id">The Coinlore ID of the cryptocurrency.</param>
+        /// <param name="since">Unix time in milliseconds of the newest point the client already has.</param>
+        /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
         /// <returns>
-        /// A <see cref="User"/> object if found; otherwise null.
+        /// The new points as <c>{ timestamp, price }</c> pairs with millisecond timestamps,
+        /// or the upstream status code if the quote could not be fetched.
         /// </returns>
-        private async Task<User?> GetUserByApiKey(string apiKey)
+        [HttpGet("Ticker")]
+        public async Task<IActionResult> GetTicker([FromQuery] int id, [FromQuery] long since, [FromHeader(Name = "X-Api-Key")] string apiKey)
         {
-            var cachedUser = await _redisCache.GetUserByApiKey(apiKey);
+            MarketDataEntry ticker;
+            try
+            {
+                ticker = await _marketData.GetTicker(id);
+            }
+            catch (HttpRequestException ex)
+            {
+                return StatusCode((int?)ex.StatusCode ?? StatusCodes.Status502BadGateway, "Failed to fetch data");
+            }
+
+            var data = JsonSerializer.Deserialize<List<Dictionary<string, object>>>(ticker.Content);
+            if (data == null || data.Count == 0)
+                return NotFound("Currency not found.");
 
-            if (cachedUser != null)
+            // A point is stamped with the time its quote was fetched, so pollers see each quote once
+            var timestamp = new DateTimeOffset(ticker.FetchedAt, TimeSpan.Zero).ToUnixTimeMilliseconds();
+            var price = decimal.Parse(data[0]["price_usd"].ToString() ?? "0", System.Globalization.CultureInfo.InvariantCulture);
+
+            var points = timestamp > since
+                ? new[] { new { Timestamp = timestamp, Price = price } }
+                : [];
+
+            return Ok(new { CryptoId = id, Points = points });
+        }
+
+        /// <summary>
+        /// Returns the current quote of every supported cryptocurrency, fetched from Coinlore in a
+        /// single batched call and shared by all clients for the ticker's freshness window.
+        /// </summary>
+        /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <returns>
+        /// The quotes as <c>{ cryptoId, name, symbol, priceUsd, percentChange1h, percentChange24h, percentChange7d }</c>
+        /// in the order of SupportedCurrencies, or the upstream status code if they could not be fetched.
+        /// </returns>
+        [HttpGet("Quotes")]
+        public async Task<IActionResult> GetQuotes([FromHeader(Name = "X-Api-Key")] string apiKey)
+        {
+            MarketDataEntry tickers;
+            try
             {
-                // Parse or return cached data
-                return cachedUser;
+                tickers = await _marketData.GetTickers(SupportedCurrencies.Ids);
             }
+            catch (HttpRequestException ex)
+            {
+                return StatusCode((int?)ex.StatusCode ?? StatusCodes.Status502BadGateway, "Failed to fetch data");
+            }
+
+            var data = JsonSerializer.Deserialize<List<Dictionary<string, object>>>(tickers.Content) ?? [];
+            var byId = data.ToDictionary(t => int.Parse(t["id"].ToString()!));
+
+            static decimal ParseField(Dictionary<string, object> ticker, string field) =>
+                decimal.TryParse(ticker[field].ToString(), System.Globalization.NumberStyles.Float,
+                    System.Globalization.CultureInfo.InvariantCulture, out var value) ? value : 0;
+
+            var quotes = SupportedCurrencies.ByName
+                .Where(c => byId.ContainsKey(c.Value))
+                .Select(c => new
+                {
+                    CryptoId = c.Value,
+                    Name = c.Key,
+                    Symbol = byId[c.Value]["symbol"].ToString(),
+                    PriceUsd = ParseField(byId[c.Value], "price_usd"),
+                    PercentChange1h = ParseField(byId[c.Value], "percent_change_1h"),
+                    PercentChange24h = ParseField(byId[c.Value], "percent_change_24h"),
+                    PercentChange7d = ParseField(byId[c.Value], "percent_change_7d")
+                })
+                .ToList();
+
+            Response.Headers.CacheControl = "private, max-age=10";
+            return Ok(new { Quotes = quotes, FetchedAt = tickers.FetchedAt });
+        }
+
+        /// <summary>
+        /// Retrieves a list of supported cryptocurrencies along with their
+        /// respective values for the external API.
+        /// </summary>
+        /// <param name="apiKey">The API key identifying the user.
+        /// Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <returns>
+        /// An <see cref="IActionResult"/> containing a dictionary of supported currencies
+        /// if the API key is valid; <c>304 Not Modified</c> if the client's If-None-Match
+        /// header matches the current ETag; otherwise, returns <c>Unauthorized</c>.
+        /// </returns>
+        [HttpGet("SupportedCurrencies")]
+        public IActionResult GetCurrencyList([FromHeader(Name = "X-Api-Key")] string apiKey)
+        {
+            Response.Headers.ETag = SupportedCurrenciesETag;
+            Response.Headers.CacheControl = "private, max-age=86400";
+
+            if (Request.Headers.IfNoneMatch.Contains(SupportedCurrenciesETag))
+                return StatusCode(StatusCodes.Status304NotModified);
             
-            Console.WriteLine("Fetching user from MySQL");
-            var user = await _db.Users.FirstOrDefaultAsync(u => u.ApiKey == Guid.Parse(apiKey));
-            
-            if(user == null)
-                return null;
-            
-            await _redisCache.SetUserByApiKey(apiKey, user);
-            return user;
+            return Ok(new { SupportedCurrencies = SupportedCurrencies.ByName });
         }
     }
 }
@@ -0,0 +1,240 @@
+﻿using Microsoft.AspNetCore.Mvc;
+using System.Text.Json;
+using ApiGateway.Models.Entities;
+using ApiGateway.Services;
+using Microsoft.AspNetCore.Http.Features;
+using Microsoft.EntityFrameworkCore;
+using Microsoft.Extensions.Options;
+
+
+namespace ApiGateway.Controllers
+{
+    /// <summary>
+    /// Controller responsible for price alerts: registering, listing and deleting a user's alerts,
+    /// and streaming them to the client as they fire.
+    /// Access this controller using http://hostip:5182/Alerts/{Operation}
+    /// </summary>
+    [Route("api/[controller]")]
+    [ApiController]
+    [ServiceFilter(typeof(ApiKeyAuthFilter))]
+    public class AlertsController : Controller
+    {
+        private const int MaxListedAlerts = 200;
+        private static readonly TimeSpan KeepAliveInterval = TimeSpan.FromSeconds(30);
+        private static readonly JsonSerializerOptions EventJsonOptions = new(JsonSerializerDefaults.Web);
+
+        private readonly CryptoDbContext _db;
+        private readonly MarketDataService _marketData;
+        private readonly AlertEngine _alerts;
+        private readonly AlertOptions _options;
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="AlertsController"/> class.
+        /// </summary>
+        /// <param name="db">The database context used to store alerts.</param>
+        /// <param name="marketData">Cached access to the Coinlore ticker, for the price an alert starts from.</param>
+        /// <param name="alerts">Evaluates the active alerts and streams the fired ones.</param>
+        /// <param name="options">Per-user alert limits.</param>
+        public AlertsController(CryptoDbContext db, MarketDataService marketData, AlertEngine alerts, IOptions<AlertOptions> options)
+        {
+            _db = db;
+            _marketData = marketData;
+            _alerts = alerts;
+            _options = options.Value;
+        }
+
+        /// <summary>
+        /// Lists the user's alerts, active and fired, newest first.
+        /// </summary>
+        /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <param name="cryptoId">Optional cryptocurrency to list the alerts of.</param>
+        /// <returns>The alerts, at most the newest 200.</returns>
+        [HttpGet]
+        public async Task<IActionResult> GetAlerts([FromHeader(Name = "X-Api-Key")] string apiKey, [FromQuery] int? cryptoId = null)
+        {
+            var user = HttpContext.GetApiUser();
+            var query = _db.PriceAlerts.AsNoTracking().Where(a => a.WalletId == user.WalletId);
+            if (cryptoId != null)
+                query = query.Where(a => a.CryptoId == cryptoId);
+
+            var alerts = await query
+                .OrderByDescending(a => a.CreatedAt)
+                .Take(MaxListedAlerts)
+                .ToListAsync();
+
+            return Ok(new { Alerts = alerts });
+        }
+
+        /// <summary>
+        /// Registers a price alert. It fires once, on the first evaluation pass whose price reaches it.
+        /// </summary>
+        /// <param name="cryptoId">The Coinlore ID of the cryptocurrency to watch.</param>
+        /// <param name="type">"above" or "below" a price, or "move" by a percentage in either direction.</param>
+        /// <param name="threshold">The price in USD, or the percentage for "move" alerts.</param>
+        /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <returns>
+        /// The registered alert; <c>BadRequest</c> for invalid input or when the user has too many
+        /// active alerts; the upstream status code if the current price could not be fetched.
+        /// </returns>
+        [HttpPost]
+        public async Task<IActionResult> CreateAlert([FromForm] int cryptoId, [FromForm] string type, [FromForm] decimal threshold,
+            [FromHeader(Name = "X-Api-Key")] string apiKey)
+        {
+            type = type?.Trim().ToLowerInvariant() ?? "";
+            if (!PriceAlert.Types.Contains(type))
+                return BadRequest("Alert type must be above, below or move.");
+            if (threshold <= 0 || (type == "move" && threshold >= 100))
+                return BadRequest("Threshold must be a positive price, or a percentage below 100 for move alerts.");
+            if (!SupportedCurrencies.Ids.Contains(cryptoId))
+                return NotFound("Currency not found.");
+
+            var user = HttpContext.GetApiUser();
+            var active = await _db.PriceAlerts.CountAsync(a => a.WalletId == user.WalletId && a.TriggeredAt == null);
+            if (active >= _options.MaxAlertsPerUser)
+                return BadRequest($"At most {_options.MaxAlertsPerUser} alerts can be active at once.");
+
+            MarketDataEntry ticker;
+            try
+            {
+                ticker = await _marketData.GetTicker(cryptoId);
+            }
+            catch (HttpRequestException ex)
+            {
+                return StatusCode((int?)ex.StatusCode ?? StatusCodes.Status502BadGateway, "Failed to fetch data");
+            }
+
+            var data = JsonSerializer.Deserialize<List<Dictionary<string, object>>>(ticker.Content);
+            if (data == null || data.Count == 0)
+                return NotFound("Currency not found.");
+
+            // Move alerts are measured from this price, so a ticker without one cannot start them
+            var referencePrice = CurrencyQuote.FromTicker(data[0]).PriceUsd;
+            if (referencePrice <= 0)
+                return StatusCode(StatusCodes.Status502BadGateway, "Failed to fetch data");
+
+            var alert = new PriceAlert
+            {
+                WalletId = user.WalletId,
+                CryptoId = cryptoId,
+                Type = type,
+                Threshold = threshold,
+                ReferencePrice = referencePrice
+            };
+            _db.PriceAlerts.Add(alert);
+            await _db.SaveChangesAsync();
+            _alerts.Add(alert);
+
+            return Ok(new { Alert = alert });
+        }
+
+        /// <summary>
+        /// Deletes one of the user's alerts.
+        /// </summary>
+        /// <param name="id">The ID of the alert.</param>
+        /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <returns>A confirmation message, or <c>NotFound</c> if the user has no such alert.</returns>
+        [HttpDelete("{id:guid}")]
+        public async Task<IActionResult> DeleteAlert(Guid id, [FromHeader(Name = "X-Api-Key")] string apiKey)
+        {
+            var user = HttpContext.GetApiUser();
+            var deleted = await _db.PriceAlerts
+                .Where(a => a.Id == id && a.WalletId == user.WalletId)
+                .ExecuteDeleteAsync();
+            if (deleted == 0)
+                return NotFound("Alert not found.");
+
+            _alerts.Remove(id);
+            return Ok(new { Message = "Alert deleted." });
+        }
+
+        /// <summary>
+        /// Streams the user's alerts as Server-Sent Events as they fire, each as
+        /// <c>event: alert</c> with the alert as data, ordered by trigger time and then ID. Alerts that
+        /// fired after the (<paramref name="since"/>, <paramref name="after"/>) cursor are sent first,
+        /// so a client that reconnects misses none. A comment line is sent every 30 seconds while
+        /// nothing fires, so broken connections are noticed.
+        /// </summary>
+        /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <param name="since">Optional Unix time in milliseconds of the newest alert the client has shown.</param>
+        /// <param name="after">
+        /// Optional ID of that alert. Alerts fired in one pass share their trigger time, so the ones
+        /// of that time with a higher ID are still sent; without it none of that time are.
+        /// </param>
+        /// <returns>A <c>text/event-stream</c> response that stays open until the client disconnects.</returns>
+        [HttpGet("Stream")]
+        public async Task<IActionResult> StreamAlerts([FromHeader(Name = "X-Api-Key")] string apiKey, [FromQuery] long since = 0,
+            [FromQuery] Guid? after = null)
+        {
+            var cancellationToken = HttpContext.RequestAborted;
+            var user = HttpContext.GetApiUser();
+
+            // Subscribed before the missed alerts are read, so none fires unseen in between
+            using var subscription = _alerts.Subscribe(user.WalletId);
+
+            Response.ContentType = "text/event-stream";
+            Response.Headers.CacheControl = "no-cache";
+            HttpContext.Features.Get<IHttpResponseBodyFeature>()?.DisableBuffering();
+
+            try
+            {
+                var sent = new HashSet<Guid>();
+                if (since > 0)
+                {
+                    var missedSince = DateTimeOffset.FromUnixTimeMilliseconds(Math.Min(since, DateTimeOffset.MaxValue.ToUnixTimeMilliseconds())).UtcDateTime;
+                    var missed = await _db.PriceAlerts
+                        .AsNoTracking()
+                        .Where(a => a.WalletId == user.WalletId && a.TriggeredAt >= missedSince)
+                        .ToListAsync(cancellationToken);
+                    // The same order as AlertEngine pushes them in
+                    foreach (var alert in missed.OrderBy(a => a.TriggeredAt).ThenBy(a => a.Id))
+                    {
+                        if (alert.TriggeredAt == missedSince && (after == null || alert.Id.CompareTo(after.Value) <= 0))
+                            continue;
+                        sent.Add(alert.Id);
+                        await WriteEvent("alert", alert, cancellationToken);
+                    }
+                }
+                await Response.WriteAsync(": connected\n\n", cancellationToken);
+                await Response.Body.FlushAsync(cancellationToken);
+
+                while (!cancellationToken.IsCancellationRequested)
+                {
+                    using var keepAlive = CancellationTokenSource.CreateLinkedTokenSource(cancellationToken);
+                    keepAlive.CancelAfter(KeepAliveInterval);
+                    try
+                    {
+                        if (!await subscription.Alerts.WaitToReadAsync(keepAlive.Token))
+                            break;
+                    }
+                    catch (OperationCanceledException) when (!cancellationToken.IsCancellationRequested)
+                    {
+                        await Response.WriteAsync(": keep-alive\n\n", cancellationToken);
+                        await Response.Body.FlushAsync(cancellationToken);
+                        continue;
+                    }
+
+                    while (subscription.Alerts.TryRead(out var alert))
+                    {
+                        if (sent.Add(alert.Id))
+                            await WriteEvent("alert", alert, cancellationToken);
+                    }
+                }
+            }
+            catch (OperationCanceledException)
+            {
+                // The client disconnected
+            }
+
+            return new EmptyResult();
+        }
+
+        /// <summary>
+        /// Writes and flushes one Server-Sent Event, with the same camelCase JSON as other responses.
+        /// </summary>
+        private async Task WriteEvent(string name, object data, CancellationToken cancellationToken)
+        {
+            await Response.WriteAsync($"event: {name}\ndata: {JsonSerializer.Serialize(data, EventJsonOptions)}\n\n", cancellationToken);
+            await Response.Body.FlushAsync(cancellationToken);
+        }
+    }
+}
@@ -1,7 +1,11 @@
 ﻿using Microsoft.AspNetCore.Mvc;
+using System.Globalization;
+using System.Text;
 using System.Text.Json;
 using ApiGateway.Models.Entities;
+using ApiGateway.Services;
 using Microsoft.EntityFrameworkCore;
+using Microsoft.EntityFrameworkCore.Storage;
 
 
 namespace ApiGateway.Controllers
@@ -13,106 +17,164 @@ namespace ApiGateway.Controllers
     /// </summary>
     [Route("api/[controller]")]
     [ApiController]
+    [ServiceFilter(typeof(ApiKeyAuthFilter))]
     public class TransactionsController : Controller
     {
+        private const int DefaultPageSize = 50;
+        private const int MaxPageSize = 500;
+
+        /// <summary>
+        /// Rows of the cached first history page. Any unfiltered first page up to this size is a slice of it,
+        /// so the client's pages (<c>TRANSACTIONS_PAGE_SIZE</c>) and the API default both hit the cache.
+        /// </summary>
+        private const int CachedHistoryRows = 100;
+        private const int MaxOrdersPerBatch = 50;
+
         private readonly CryptoDbContext _db;
         private readonly RedisCacheContext _redisCache;
+        private readonly MarketDataService _marketData;
+        private readonly PortfolioService _portfolios;
+        private readonly ILogger<TransactionsController> _logger;
 
         /// <summary>
         /// Initializes a new instance of the <see cref="UsersController"/> class with the specified database context.
         /// </summary>
         /// <param name="db">The database context used to access user data.</param>
         /// <param name="distributedCache">Redis database context used to access logged-in user data.</param>
-        public TransactionsController(CryptoDbContext db, RedisCacheContext distributedCache)
+        /// <param name="marketData">Cached, coalesced access to the Coinlore ticker.</param>
+        /// <param name="portfolios">Values wallets and caches their snapshots.</param>
+        /// <param name="logger">Logger of cache and valuation failures.</param>
+        public TransactionsController(CryptoDbContext db, RedisCacheContext distributedCache, MarketDataService marketData,
+            PortfolioService portfolios, ILogger<TransactionsController> logger)
         {
             _db = db;
             _redisCache = distributedCache;
+            _marketData = marketData;
+            _portfolios = portfolios;
+            _logger = logger;
         }
 
         /// <summary>
-        /// Updates the cryptocurrency balance in the user's account based on symbol and amount.
+        /// Maps a cryptocurrency symbol to the <see cref="Account"/> property holding its balance.
         /// </summary>
-        /// <param name="account">The user's account object to be updated.</param>
         /// <param name="symbol">The symbol of the cryptocurrency (e.g., BTC, ETH).</param>
-        /// <param name="amount">The amount to adjust (positive for buy, negative to sell).</param>
-        private static void UpdateCryptoBalance(Account account, string symbol, decimal amount)
+        /// <returns>
+        /// The property name if the symbol is supported; otherwise null.
+        /// </returns>
+        private static string? GetCryptoBalanceProperty(string symbol)
         {
-            switch (symbol)
+            return symbol switch
             {
-                case "BTC": account.Bitcoin += amount; break;
-                case "ETH": account.Ethereum += amount; break;
-                case "SOL": account.Solana += amount; break;
-                case "XRP": account.Ripple += amount; break;
-                case "LTC": account.Litecoin += amount; break;
-                case "ADA": account.Cardano += amount; break;
-            }
+                "BTC" => nameof(Account.Bitcoin),
+                "SOL" => nameof(Account.Solana),
+                "ETH" => nameof(Account.Ethereum),
+                "XRP" => nameof(Account.Ripple),
+                "LTC" => nameof(Account.Litecoin),
+                "ADA" => nameof(Account.Cardano),
+                _ => null
+            };
         }
 
         /// <summary>
-        /// Checks whether the user has sufficient balance of a specific cryptocurrency.
+        /// Moves funds for one trade with a single conditional UPDATE that checks the balance it spends,
+        /// so concurrent trades on a wallet serialize on its row lock instead of overwriting each other.
         /// </summary>
-        /// <param name="account">The user's account object.</param>
-        /// <param name="symbol">The symbol of the cryptocurrency.</param>
-        /// <param name="required">The amount required for the transaction.</param>
+        /// <param name="walletId">The wallet to trade from.</param>
+        /// <param name="type">Transaction type: "buy" or "sell".</param>
+        /// <param name="balanceProperty">The <see cref="Account"/> property of the traded cryptocurrency.</param>
+        /// <param name="amount">The amount of cryptocurrency to transact.</param>
+        /// <param name="totalCost">The USD value of the amount.</param>
         /// <returns>
-        /// true if the user has enough balance; otherwise false.
+        /// true if the balances were updated; false if the funds are insufficient or the account is missing.
         /// </returns>
-        private static bool HasSufficientCrypto(Account account, string symbol, decimal required)
+        private async Task<bool> ApplyTrade(Guid walletId, string type, string balanceProperty, decimal amount, decimal totalCost)
         {
-            return symbol switch
-            {
-                "BTC" => account.Bitcoin >= required,
-                "SOL" => account.Solana >= required,
-                "ETH" => account.Ethereum >= required,
-                "XRP" => account.Ripple >= required,
-                "LTC" => account.Litecoin >= required,
-                "ADA" => account.Cardano >= required,
-                _ => false
-            };
+            var accounts = _db.Accounts.Where(a => a.WalletId == walletId);
+            var updated = type == "buy"
+                ? await accounts
+                    .Where(a => a.Balance >= totalCost)
+                    .ExecuteUpdateAsync(s => s
+                        .SetProperty(a => a.Balance, a => a.Balance - totalCost)
+                        .SetProperty(a => EF.Property<decimal>(a, balanceProperty), a => EF.Property<decimal>(a, balanceProperty) + amount))
+                : await accounts
+                    .Where(a => EF.Property<decimal>(a, balanceProperty) >= amount)
+                    .ExecuteUpdateAsync(s => s
+                        .SetProperty(a => EF.Property<decimal>(a, balanceProperty), a => EF.Property<decimal>(a, balanceProperty) - amount)
+                        .SetProperty(a => a.Balance, a => a.Balance + totalCost));
+
+            return updated > 0;
         }
-        
-                /// <summary>
-        /// Retrieves a user object by their API key.
-        /// Checks Redis cache first, then falls back to MySQL if not found.
+
+        /// <summary>
+        /// Reads one history page, newest first, fetching one extra row that tells whether a next page exists.
         /// </summary>
-        /// <param name="apiKey">The API key associated with the user.</param>
-        /// <returns>
-        /// A <see cref="User"/> object if found; otherwise null.
-        /// </returns>
-        private async Task<User?> GetUserByApiKey(string apiKey)
+        /// <param name="query">The wallet's transactions, already filtered.</param>
+        /// <param name="limit">The page size.</param>
+        /// <returns>Up to <paramref name="limit"/> + 1 transactions.</returns>
+        private static Task<List<Transaction>> FetchHistoryPage(IQueryable<Transaction> query, int limit)
+        {
+            return query
+                .OrderByDescending(t => t.DateTime)
+                .ThenByDescending(t => t.Id)
+                .Take(limit + 1)
+                .ToListAsync();
+        }
+
+        /// <summary>
+        /// Writes the updated account (and, after a trade, the first history page) through to Redis and
+        /// commits the balance change. The cache is written while the trade's UPDATE still holds the
+        /// account row lock, so concurrent changes to one wallet reach the cache in the same order as
+        /// the database and a cached entry is never older than the one it replaces.
+        /// </summary>
+        /// <param name="dbTransaction">The open transaction holding the account row lock.</param>
+        /// <param name="apiKey">The user's API key, part of the history cache key.</param>
+        /// <param name="walletId">The wallet that changed.</param>
+        /// <param name="historyChanged">Whether a transaction was appended to the history.</param>
+        /// <returns>The updated <see cref="Account"/>.</returns>
+        private async Task<Account> CommitAndWriteThrough(IDbContextTransaction dbTransaction, string apiKey, Guid walletId, bool historyChanged)
         {
-            var cachedUser = await _redisCache.GetUserByApiKey(apiKey);
+            var account = await _db.Accounts.AsNoTracking().FirstAsync(a => a.WalletId == walletId);
+            var firstPage = historyChanged
+                ? await FetchHistoryPage(_db.Transactions.Where(t => t.WalletId == walletId), CachedHistoryRows)
+                : null;
 
-            if (cachedUser != null)
+            try
             {
-                // Parse or return cached data
-                return cachedUser;
+                await _redisCache.SetAccountByWalletId(walletId.ToString(), account);
+                if (firstPage != null)
+                    await _redisCache.SetTransactionHistory(apiKey, walletId.ToString(), firstPage);
             }
-            
-            Console.WriteLine("Fetching user from MySQL");
-            var user = await _db.Users.FirstOrDefaultAsync(u => u.ApiKey == Guid.Parse(apiKey));
-            
-            if(user == null)
-                return null;
-            
-            await _redisCache.SetUserByApiKey(apiKey, user);
-            return user;
+            catch (Exception ex)
+            {
+                // A cache outage must not block trades; the entries expire on their own
+                _logger.LogWarning(ex, "Failed to write account {WalletId} through to Redis", walletId);
+            }
+
+            try
+            {
+                await dbTransaction.CommitAsync();
+            }
+            catch
+            {
+                // Never leave cache entries the database does not have
+                await _redisCache.Remove(walletId.ToString());
+                await _redisCache.Remove($"{apiKey}:{walletId}");
+                throw;
+            }
+
+            return account;
         }
 
         /// <summary>
-        /// Retrieves an account associated with the given API key (via user's wallet ID).
+        /// Retrieves the account of a user (via the user's wallet ID).
         /// Checks Redis cache first, then falls back to MySQL if not found.
         /// </summary>
-        /// <param name="apiKey">The user's API key.</param>
+        /// <param name="user">The authenticated user.</param>
         /// <returns>
         /// An <see cref="Account"/> object if found; otherwise null.
         /// </returns>
-        private async Task<Account?> GetAccountByApiKey(string apiKey)
+        private async Task<Account?> GetAccount(User user)
         {
-            var user = await GetUserByApiKey(apiKey);
-            if (user == null)
-                return null;
-            
             var cachedAccount = await _redisCache
                 .GetAccountByWalletId(user.WalletId.ToString());
 
@@ -122,7 +184,7 @@ namespace ApiGateway.Controllers
                 return cachedAccount;
             }
             
-            Console.WriteLine("Fetching account from MySQL");
+            _logger.LogDebug("Fetching account from MySQL");
             var account = await _db.Accounts
                 .FirstOrDefaultAsync(a => a.WalletId == Guid.Parse(user.WalletId.ToString()));
             
@@ -133,6 +195,25 @@ namespace ApiGateway.Controllers
             return account;
         }
         
+        /// <summary>
+        /// Re-values an account after a balance change. The change itself is already saved, so a
+        /// missing price only leaves the snapshot out of the response.
+        /// </summary>
+        /// <param name="account">The updated account.</param>
+        /// <returns>The new <see cref="Portfolio"/>, or null if no prices are available.</returns>
+        private async Task<Portfolio?> TryRefreshPortfolio(Account account)
+        {
+            try
+            {
+                return await _portfolios.Refresh(account);
+            }
+            catch (HttpRequestException ex)
+            {
+                _logger.LogWarning(ex, "Failed to value portfolio of wallet {WalletId}", account.WalletId);
+                return null;
+            }
+        }
+
         /// <summary>
         /// Handles cryptocurrency buy/sell transactions for a user.
         /// Validates API key, fetches current currency price, and updates balances accordingly.
@@ -142,7 +223,7 @@ namespace ApiGateway.Controllers
         /// <param name="type">Transaction type: "buy" or "sell".</param>
         /// <param name="amount">The amount of cryptocurrency to transact.</param>
         /// <returns>
-        /// 200 OK if the transaction was successful;
+        /// 200 OK with a message and the updated portfolio snapshot if the transaction was successful;
         /// 400 BadRequest if there are insufficient funds or crypto;
         /// 401 Unauthorized if the API key is invalid;
         /// 404 NotFound if currency or account not found;
@@ -150,25 +231,25 @@ namespace ApiGateway.Controllers
         /// </returns>
         private async Task<IActionResult> HandleTransaction(int id, string apiKey, string type, decimal amount)
         {
-            var user = await GetUserByApiKey(apiKey);
-            if (user == null)
-                return Unauthorized("Invalid or missing API key: X-Api-Key=YOUR-API-KEY");
+            var user = HttpContext.GetApiUser();
 
-            // Remove account and transactions list of the user from the cache to stay up to date
-            await _redisCache.Remove(user.WalletId.ToString());
-            await _redisCache.Remove($"{apiKey}:{user.WalletId.ToString()}");
-            
-            var account = _db.Accounts.FirstOrDefault(a => a.WalletId == user.WalletId);
-            
-            if (account == null)
-                return NotFound("Account not found.");
+            if (type != "buy" && type != "sell")
+                return BadRequest("Invalid transaction type.");
+            if (amount <= 0)
+                return BadRequest("Amount must be positive.");
 
-            var response = await new HttpClient().GetAsync($"https://api.coinlore.net/api/ticker/?id={id}");
-            if (!response.IsSuccessStatusCode)
-                return StatusCode((int)response.StatusCode, "Failed to fetch currency info.");
+            // Trades settle at a quote no older than the ticker's freshness window
+            MarketDataEntry ticker;
+            try
+            {
+                ticker = await _marketData.GetTicker(id, allowStale: false);
+            }
+            catch (HttpRequestException ex)
+            {
+                return StatusCode((int?)ex.StatusCode ?? StatusCodes.Status502BadGateway, "Failed to fetch currency info.");
+            }
 
-            var content = await response.Content.ReadAsStringAsync();
-            var data = JsonSerializer.Deserialize<List<Dictionary<string, object>>>(content);
+            var data = JsonSerializer.Deserialize<List<Dictionary<string, object>>>(ticker.Content);
             if (data == null || data.Count == 0)
                 return NotFound("Currency not found.");
 
@@ -176,26 +257,19 @@ namespace ApiGateway.Controllers
             var symbol = coin["symbol"].ToString()!.ToUpper();
             var priceUsd = decimal.Parse(coin["price_usd"].ToString() ?? "0");
 
+            var balanceProperty = GetCryptoBalanceProperty(symbol);
+            if (balanceProperty == null)
+                return NotFound("Currency not found.");
+
             var totalCost = priceUsd * amount;
 
-            switch (type)
+            await using var dbTransaction = await _db.Database.BeginTransactionAsync();
+
+            if (!await ApplyTrade(user.WalletId, type, balanceProperty, amount, totalCost))
             {
-                case "buy":
-                    if (account.Balance < totalCost)
-                        return BadRequest("Insufficient funds.");
-                    account.Balance -= totalCost;
-                    UpdateCryptoBalance(account, symbol, amount);
-                    break;
-
-                case "sell":
-                    if (!HasSufficientCrypto(account, symbol, amount))
-                        return BadRequest("Insufficient crypto balance.");
-                    UpdateCryptoBalance(account, symbol, -amount);
-                    account.Balance += totalCost;
-                    break;
-
-                case "default":
-                    return BadRequest("Invalid transaction type.");
+                if (!await _db.Accounts.AnyAsync(a => a.WalletId == user.WalletId))
+                    return NotFound("Account not found.");
+                return BadRequest(type == "buy" ? "Insufficient funds." : "Insufficient crypto balance.");
             }
 
             _db.Transactions.Add(new Transaction
@@ -209,8 +283,13 @@ namespace ApiGateway.Controllers
             });
 
             await _db.SaveChangesAsync();
-            
-            return Ok($"Successfully {type}ed {amount} {symbol} at ${priceUsd} each.");
+            var account = await CommitAndWriteThrough(dbTransaction, apiKey, user.WalletId, historyChanged: true);
+
+            return Ok(new
+            {
+                Message = $"Successfully {type}ed {amount} {symbol} at ${priceUsd} each.",
+                Portfolio = await TryRefreshPortfolio(account)
+            });
         }
                 
         /// <summary>
@@ -219,27 +298,149 @@ namespace ApiGateway.Controllers
         /// <param name="amount">The amount of money to add. Passed as a form field.</param>
         /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
         /// <returns>
-        /// Returns an HTTP 200 OK response with a success message and updated balance on success.
+        /// Returns an HTTP 200 OK response with a success message, the updated balance and portfolio snapshot on success.
+        /// Returns HTTP 400 Bad Request if the amount is not positive.
         /// Returns HTTP 401 Unauthorized if the API key is invalid.
         /// Returns HTTP 404 Not Found if the user's account cannot be found.
         /// </returns>
         [HttpPost("AddMoney")]
         public async Task<IActionResult> AddMoney([FromForm] decimal amount, [FromHeader(Name = "X-Api-Key")] string apiKey)
         {
-            var user = await GetUserByApiKey(apiKey);
-            if (user == null)
-                return Unauthorized("Invalid or missing API key: X-Api-Key=YOUR-API-KEY");
+            var user = HttpContext.GetApiUser();
 
-            await _redisCache.Remove(user.WalletId.ToString());
-            var account = _db.Accounts.FirstOrDefault(a => a.WalletId == user.WalletId);
-            
-            if (account == null)
+            if (amount <= 0)
+                return BadRequest("Amount must be positive.");
+
+            await using var dbTransaction = await _db.Database.BeginTransactionAsync();
+
+            var updated = await _db.Accounts
+                .Where(a => a.WalletId == user.WalletId)
+                .ExecuteUpdateAsync(s => s.SetProperty(a => a.Balance, a => a.Balance + amount));
+
+            if (updated == 0)
                 return NotFound("Account not found.");
-            
-            account.Balance += amount;
+
+            var account = await CommitAndWriteThrough(dbTransaction, apiKey, user.WalletId, historyChanged: false);
+
+            return Ok(new
+            {
+                message = $"Successfully added {amount:C} to your balance.",
+                newBalance = account.Balance,
+                portfolio = await TryRefreshPortfolio(account)
+            });
+        }
+
+        /// <summary>
+        /// Executes a batch of buy and sell orders in one round trip. All orders are priced from a single
+        /// batched ticker fetch and committed in one database transaction. Sells run before buys, so their
+        /// proceeds can fund the buys of the same batch (e.g. when rebalancing); otherwise orders run in
+        /// the submitted order. An order that cannot be filled is rejected on its own and does not affect
+        /// the others.
+        /// </summary>
+        /// <param name="orders">The orders as a JSON array of <c>{ id, type, amount }</c>, at most 50.</param>
+        /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <returns>
+        /// 200 OK with one <see cref="OrderResult"/> per order, in submitted order, and the updated portfolio snapshot;
+        /// 400 BadRequest if the batch is empty or too large;
+        /// 401 Unauthorized if the API key is invalid;
+        /// 404 NotFound if the account is not found;
+        /// the upstream status code if the prices could not be fetched.
+        /// </returns>
+        [HttpPost("Orders")]
+        public async Task<IActionResult> SubmitOrders([FromBody] List<OrderRequest> orders, [FromHeader(Name = "X-Api-Key")] string apiKey)
+        {
+            var user = HttpContext.GetApiUser();
+
+            if (orders.Count == 0 || orders.Count > MaxOrdersPerBatch)
+                return BadRequest($"Submit between 1 and {MaxOrdersPerBatch} orders.");
+
+            // Only supported currencies are fetched; orders for any other are rejected below as not found
+            var supportedIds = orders.Select(o => o.Id).Where(SupportedCurrencies.Ids.Contains).ToList();
+            List<Dictionary<string, object>> data = [];
+            if (supportedIds.Count > 0)
+            {
+                // Every order settles at a quote no older than the ticker's freshness window
+                MarketDataEntry tickers;
+                try
+                {
+                    tickers = await _marketData.GetTickers(supportedIds, allowStale: false);
+                }
+                catch (HttpRequestException ex)
+                {
+                    return StatusCode((int?)ex.StatusCode ?? StatusCodes.Status502BadGateway, "Failed to fetch currency info.");
+                }
+
+                data = JsonSerializer.Deserialize<List<Dictionary<string, object>>>(tickers.Content) ?? [];
+            }
+            var byId = data.ToDictionary(t => int.Parse(t["id"].ToString()!));
+
+            var results = new OrderResult[orders.Count];
+            var executionOrder = Enumerable.Range(0, orders.Count).OrderBy(i => orders[i].Type == "sell" ? 0 : 1);
+
+            await using var dbTransaction = await _db.Database.BeginTransactionAsync();
+
+            if (!await _db.Accounts.AnyAsync(a => a.WalletId == user.WalletId))
+                return NotFound("Account not found.");
+
+            foreach (var index in executionOrder)
+            {
+                var order = orders[index];
+                OrderResult Reject(string error) =>
+                    new() { Index = index, Id = order.Id, Type = order.Type, Amount = order.Amount, Filled = false, Error = error };
+
+                if (order.Type != "buy" && order.Type != "sell")
+                {
+                    results[index] = Reject("Invalid transaction type.");
+                    continue;
+                }
+                if (order.Amount <= 0)
+                {
+                    results[index] = Reject("Amount must be positive.");
+                    continue;
+                }
+
+                var balanceProperty = byId.TryGetValue(order.Id, out var coin)
+                    ? GetCryptoBalanceProperty(coin["symbol"].ToString()!.ToUpper())
+                    : null;
+                if (coin == null || balanceProperty == null)
+                {
+                    results[index] = Reject("Currency not found.");
+                    continue;
+                }
+
+                if (!decimal.TryParse(coin["price_usd"].ToString(), NumberStyles.Float, CultureInfo.InvariantCulture, out var priceUsd)
+                    || priceUsd <= 0)
+                {
+                    results[index] = Reject("Failed to fetch currency info.");
+                    continue;
+                }
+                if (!await ApplyTrade(user.WalletId, order.Type, balanceProperty, order.Amount, priceUsd * order.Amount))
+                {
+                    results[index] = Reject(order.Type == "buy" ? "Insufficient funds." : "Insufficient crypto balance.");
+                    continue;
+                }
+
+                _db.Transactions.Add(new Transaction
+                {
+                    WalletId = user.WalletId,
+                    CryptoId = order.Id,
+                    PriceAtTransaction = priceUsd,
+                    Amount = order.Amount,
+                    Type = order.Type,
+                    DateTime = DateTime.UtcNow
+                });
+                results[index] = new OrderResult
+                {
+                    Index = index, Id = order.Id, Type = order.Type, Amount = order.Amount, Filled = true, PriceUsd = priceUsd
+                };
+            }
+
+            // All transaction rows go out in one batched SaveChanges
             await _db.SaveChangesAsync();
+            var filled = results.Any(r => r.Filled);
+            var account = await CommitAndWriteThrough(dbTransaction, apiKey, user.WalletId, historyChanged: filled);
 
-            return Ok(new { message = $"Successfully added {amount:C} to your balance.", newBalance = account.Balance });
+            return Ok(new { Orders = results, Portfolio = await TryRefreshPortfolio(account) });
         }
 
         /// <summary>
@@ -280,7 +481,7 @@ namespace ApiGateway.Controllers
         [HttpGet("WalletBalance")]
         public async Task<IActionResult> GetWalletBalance([FromHeader(Name = "X-Api-Key")] string apiKey) 
         {
-            var account = await GetAccountByApiKey(apiKey);
+            var account = await GetAccount(HttpContext.GetApiUser());
             if (account == null)
                 return NotFound("Account not found.");
             
@@ -288,36 +489,167 @@ namespace ApiGateway.Controllers
         }
         
         /// <summary>
-        /// Retrieves the transaction history for the authenticated user's wallet.
-        /// It attempts to fetch the data from Redis cache first, and falls back to the database if not found.
+        /// Retrieves the wallet of the authenticated user valued at current prices: the cash balance,
+        /// every holding with its USD value and the total. Snapshots are cached per wallet for as long
+        /// as the prices stay fresh, and replaced by Buy, Sell and AddMoney.
+        /// </summary>
+        /// <param name="apiKey">The API key identifying the user. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <returns>
+        /// Returns an HTTP 200 OK response containing the <see cref="Portfolio"/>.
+        /// Returns HTTP 404 Not Found if the user's account cannot be found.
+        /// Returns the upstream status code if no prices are available.
+        /// </returns>
+        [HttpGet("Portfolio")]
+        public async Task<IActionResult> GetPortfolio([FromHeader(Name = "X-Api-Key")] string apiKey)
+        {
+            var user = HttpContext.GetApiUser();
+
+            var portfolio = await _portfolios.GetCached(user.WalletId);
+            if (portfolio != null)
+                return Ok(new { Portfolio = portfolio });
+
+            var account = await GetAccount(user);
+            if (account == null)
+                return NotFound("Account not found.");
+
+            try
+            {
+                portfolio = await _portfolios.Refresh(account);
+            }
+            catch (HttpRequestException ex)
+            {
+                return StatusCode((int?)ex.StatusCode ?? StatusCodes.Status502BadGateway, "Failed to fetch currency info.");
+            }
+
+            return Ok(new { Portfolio = portfolio });
+        }
+
+        /// <summary>
+        /// Encodes the position after a transaction as an opaque page cursor.
+        /// </summary>
+        /// <param name="transaction">The last transaction of the current page.</param>
+        /// <returns>A URL-safe cursor string.</returns>
+        private static string EncodeCursor(Transaction transaction)
+        {
+            var bytes = Encoding.UTF8.GetBytes($"{transaction.DateTime.Ticks}:{transaction.Id}");
+            return Convert.ToBase64String(bytes).TrimEnd('=').Replace('+', '-').Replace('/', '_');
+        }
+
+        /// <summary>
+        /// Decodes a cursor produced by <see cref="EncodeCursor"/>.
+        /// </summary>
+        /// <param name="cursor">The cursor received from the client.</param>
+        /// <param name="dateTime">The time of the last transaction already returned.</param>
+        /// <param name="id">The ID of the last transaction already returned.</param>
+        /// <returns>true if the cursor is well-formed; otherwise false.</returns>
+        private static bool TryDecodeCursor(string cursor, out DateTime dateTime, out Guid id)
+        {
+            dateTime = default;
+            id = default;
+            try
+            {
+                var base64 = cursor.Replace('-', '+').Replace('_', '/');
+                base64 = base64.PadRight(base64.Length + (4 - base64.Length % 4) % 4, '=');
+                var parts = Encoding.UTF8.GetString(Convert.FromBase64String(base64)).Split(':');
+                if (parts.Length != 2 || !long.TryParse(parts[0], out var ticks) || !Guid.TryParse(parts[1], out id))
+                    return false;
+
+                dateTime = new DateTime(ticks, DateTimeKind.Utc);
+                return true;
+            }
+            catch (FormatException)
+            {
+                return false;
+            }
+        }
+
+        /// <summary>
+        /// Retrieves one page of the transaction history for the authenticated user's wallet, newest first.
+        /// Pages are keyset-paginated on (DateTime, Id), so every page costs one index range scan
+        /// no matter how deep the user scrolls. Unfiltered first pages of up to 100 rows are
+        /// served from the first page cached in Redis.
         /// </summary>
         /// <param name="apiKey">
         /// The API key provided in the request header (<c>X-Api-Key</c>).
         /// This key is used to authenticate the user and determine the wallet ID.
         /// </param>
+        /// <param name="cryptoId">Optional. Only return transactions of this Coinlore currency ID.</param>
+        /// <param name="type">Optional. Only return "buy" or "sell" transactions.</param>
+        /// <param name="from">Optional. Only return transactions at or after this UTC time.</param>
+        /// <param name="to">Optional. Only return transactions before this UTC time.</param>
+        /// <param name="limit">Page size, between 1 and 500. Defaults to 50.</param>
+        /// <param name="cursor">Optional. The <c>nextCursor</c> of the previous page.</param>
         /// <returns>
-        /// An <see cref="IActionResult"/> containing the transaction history if found;
-        /// otherwise, returns <c>NotFound</c> if the account is missing or <c>Unauthorized</c> if the API key is invalid.
+        /// An <see cref="IActionResult"/> containing the transactions of the page and the cursor of the
+        /// next page (<c>null</c> on the last page); <c>BadRequest</c> if the cursor is invalid,
+        /// <c>NotFound</c> if the account is missing or <c>Unauthorized</c> if the API key is invalid.
         /// </returns>
         [HttpGet("TransactionsHistory")]
-        public async Task<IActionResult> GetTransactionHistory([FromHeader(Name = "X-Api-Key")] string apiKey)
+        public async Task<IActionResult> GetTransactionHistory(
+            [FromHeader(Name = "X-Api-Key")] string apiKey,
+            [FromQuery] int? cryptoId = null,
+            [FromQuery] string? type = null,
+            [FromQuery] DateTime? from = null,
+            [FromQuery] DateTime? to = null,
+            [FromQuery] int limit = DefaultPageSize,
+            [FromQuery] string? cursor = null)
         {
-            var account = await GetAccountByApiKey(apiKey);
+            var account = await GetAccount(HttpContext.GetApiUser());
             if (account == null)
                 return NotFound("Account not found.");
-            
-            var cachedHistory = await _redisCache.GetTransactionHistory(apiKey, account.WalletId.ToString());
-            if (cachedHistory != null)
-                return Ok(new { TransactionsHistory = cachedHistory });
-            
-            Console.WriteLine("Fetching transaction history from MySQL");
-            var userTransactionHistory = await _db.Transactions
-                .Where(t => t.WalletId == account.WalletId)
-                .OrderBy(t => t.DateTime)
-                .ToListAsync();
-            
-            await _redisCache.SetTransactionHistory(apiKey, account.WalletId.ToString(), userTransactionHistory); 
-            return Ok(new { TransactionsHistory = userTransactionHistory });
+
+            limit = Math.Clamp(limit, 1, MaxPageSize);
+
+            DateTime cursorDateTime = default;
+            Guid cursorId = default;
+            if (cursor != null && !TryDecodeCursor(cursor, out cursorDateTime, out cursorId))
+                return BadRequest("Invalid cursor.");
+
+            // Only the default view is cached, at CachedHistoryRows whatever the requested limit;
+            // trades write it through
+            var isDefaultView = cryptoId == null && type == null && from == null && to == null
+                                && cursor == null && limit <= CachedHistoryRows;
+
+            List<Transaction>? rows = null;
+            if (isDefaultView)
+                rows = await _redisCache.GetTransactionHistory(apiKey, account.WalletId.ToString());
+
+            if (rows == null)
+            {
+                _logger.LogDebug("Fetching transaction history from MySQL");
+                var query = _db.Transactions.Where(t => t.WalletId == account.WalletId);
+
+                if (cryptoId != null)
+                    query = query.Where(t => t.CryptoId == cryptoId);
+                if (type != null)
+                {
+                    var normalizedType = type.ToLower();
+                    query = query.Where(t => t.Type == normalizedType);
+                }
+                if (from != null)
+                {
+                    var fromUtc = from.Value.ToUniversalTime();
+                    query = query.Where(t => t.DateTime >= fromUtc);
+                }
+                if (to != null)
+                {
+                    var toUtc = to.Value.ToUniversalTime();
+                    query = query.Where(t => t.DateTime < toUtc);
+                }
+                if (cursor != null)
+                    query = query.Where(t => t.DateTime < cursorDateTime
+                                             || (t.DateTime == cursorDateTime && t.Id.CompareTo(cursorId) < 0));
+
+                rows = await FetchHistoryPage(query, isDefaultView ? CachedHistoryRows : limit);
+
+                if (isDefaultView)
+                    await _redisCache.SetTransactionHistory(apiKey, account.WalletId.ToString(), rows);
+            }
+
+            var page = rows.Take(limit).ToList();
+            var nextCursor = rows.Count > limit ? EncodeCursor(page[^1]) : null;
+
+            return Ok(new { TransactionsHistory = page, NextCursor = nextCursor });
         }
     }
 }
\ No newline at end of file
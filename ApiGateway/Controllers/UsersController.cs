@@ -1,4 +1,5 @@
 ﻿using ApiGateway.Models.Entities;
+using ApiGateway.Services;
 using Microsoft.AspNetCore.Mvc;
 using Microsoft.EntityFrameworkCore;
 using Microsoft.Extensions.Caching.Distributed;
@@ -20,16 +21,19 @@ namespace ApiGateway.Controllers
     {
         private readonly CryptoDbContext _db;
         private readonly IDistributedCache _redisCache;
+        private readonly ApiKeyAuthenticator _authenticator;
         
         /// <summary>
         /// Initializes a new instance of the <see cref="UsersController"/> class with the specified database context and Redis cache.
         /// </summary>
         /// <param name="db">The database context used for user and account data.</param>
         /// <param name="distributedCache">The Redis distributed cache used for session management and user caching.</param>
-        public UsersController(CryptoDbContext db, IDistributedCache distributedCache)
+        /// <param name="authenticator">Validates API keys; told to forget them on logout and deletion.</param>
+        public UsersController(CryptoDbContext db, IDistributedCache distributedCache, ApiKeyAuthenticator authenticator)
         {
             _db = db;
             _redisCache = distributedCache;
+            _authenticator = authenticator;
         }
 
         /// <summary>
@@ -163,6 +167,33 @@ namespace ApiGateway.Controllers
             return Ok(new { message = "Login successful", apiKey = user.ApiKey });
         }
 
+        /// <summary>
+        /// Ends the session of an API key. The user's key is replaced, so the old key stops working
+        /// everywhere (cached copies included) and the next login returns the new one.
+        /// </summary>
+        /// <param name="apiKey">The API key to revoke. Must be passed in the request header as 'X-Api-Key'.</param>
+        /// <returns>
+        /// HTTP 200 OK if the key was revoked;
+        /// HTTP 401 Unauthorized if the API key is invalid.
+        /// </returns>
+        [HttpPost("logout")]
+        public async Task<IActionResult> Logout([FromHeader(Name = "X-Api-Key")] string apiKey)
+        {
+            if (!Guid.TryParse(apiKey, out var key))
+                return Unauthorized("Invalid or missing API key: X-Api-Key=YOUR-API-KEY");
+
+            var newKey = Guid.NewGuid();
+            var updated = await _db.Users
+                .Where(u => u.ApiKey == key)
+                .ExecuteUpdateAsync(s => s.SetProperty(u => u.ApiKey, newKey));
+
+            await _authenticator.Invalidate(key);
+            if (updated == 0)
+                return Unauthorized("Invalid or missing API key: X-Api-Key=YOUR-API-KEY");
+
+            return Ok("Logged out successfully");
+        }
+
         /// <summary>
         /// Deletes a user and their associated session and wallet data.
         /// </summary>
@@ -184,7 +215,7 @@ namespace ApiGateway.Controllers
             if (user == null || !VerifyPassword(password, user.Password))
                 return Unauthorized("Invalid email or password.");
             
-            await _redisCache.RemoveAsync(key: user.ApiKey.ToString());
+            await _authenticator.Invalidate(user.ApiKey);
             await _db.Users
                     .Where(u => u.WalletId == user.WalletId)
                     .ExecuteDeleteAsync();
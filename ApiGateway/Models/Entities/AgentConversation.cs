@@ -0,0 +1,30 @@
+﻿namespace ApiGateway.Models.Entities
+{
+    /// <summary>
+    /// A user's recent exchange with the AI agent, kept in Redis so follow-up prompts are answered
+    /// in context. Only the window of messages sent to the model is stored.
+    /// </summary>
+    public class AgentConversation
+    {
+        /// <summary>
+        /// The messages, oldest first.
+        /// </summary>
+        public List<AgentMessage> Messages { get; set; } = [];
+    }
+
+    /// <summary>
+    /// One prompt or answer of an <see cref="AgentConversation"/>.
+    /// </summary>
+    public class AgentMessage
+    {
+        /// <summary>
+        /// Who wrote the message. Valid values are "user" or "assistant".
+        /// </summary>
+        public required string Role { get; init; }
+
+        /// <summary>
+        /// The message text.
+        /// </summary>
+        public required string Content { get; init; }
+    }
+}
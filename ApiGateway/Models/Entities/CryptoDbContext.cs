@@ -18,4 +18,8 @@ public class CryptoDbContext : DbContext
     public DbSet<Transaction> Transactions { get; set; }
 
     public DbSet<PriceHistory> PriceHistories { get; set; }
+
+    public DbSet<PriceCandle> PriceCandles { get; set; }
+
+    public DbSet<PriceAlert> PriceAlerts { get; set; }
 }
@@ -0,0 +1,142 @@
+﻿using System.Globalization;
+
+namespace ApiGateway.Models.Entities
+{
+    /// <summary>
+    /// Response of the CurrencyInfo endpoint: the current quote of a cryptocurrency and its price history,
+    /// both typed so clients decode the body once.
+    /// </summary>
+    public class CurrencyInfo
+    {
+        /// <summary>
+        /// The current Coinlore quote.
+        /// </summary>
+        public required CurrencyQuote Quote { get; init; }
+
+        /// <summary>
+        /// The price history of the requested range, oldest point first.
+        /// </summary>
+        public required PriceColumns History { get; init; }
+
+        /// <summary>
+        /// Whether the history comes from the locally collected points because CoinGecko was unavailable.
+        /// It then may start well after the requested range does.
+        /// </summary>
+        public bool Partial { get; init; }
+    }
+
+    /// <summary>
+    /// The fields of a Coinlore ticker that clients display or trade with.
+    /// </summary>
+    public class CurrencyQuote
+    {
+        /// <summary>
+        /// The Coinlore ID of the cryptocurrency.
+        /// </summary>
+        public int Id { get; init; }
+
+        /// <summary>
+        /// The name of the cryptocurrency (e.g., Bitcoin).
+        /// </summary>
+        public required string Name { get; init; }
+
+        /// <summary>
+        /// The symbol of the cryptocurrency (e.g., BTC, ETH).
+        /// </summary>
+        public required string Symbol { get; init; }
+
+        /// <summary>
+        /// The CoinGecko ID of the cryptocurrency, used to look up its price history.
+        /// </summary>
+        public required string NameId { get; init; }
+
+        /// <summary>
+        /// The market capitalization rank.
+        /// </summary>
+        public int Rank { get; init; }
+
+        /// <summary>
+        /// The current price in USD.
+        /// </summary>
+        public decimal PriceUsd { get; init; }
+
+        /// <summary>
+        /// The price change over the last 24 hours, in percent.
+        /// </summary>
+        public decimal PercentChange24h { get; init; }
+
+        /// <summary>
+        /// The market capitalization in USD.
+        /// </summary>
+        public decimal MarketCapUsd { get; init; }
+
+        /// <summary>
+        /// Converts one entry of a Coinlore ticker list, whose numbers are partly sent as strings.
+        /// </summary>
+        /// <param name="ticker">The ticker entry as deserialized from the Coinlore response.</param>
+        public static CurrencyQuote FromTicker(Dictionary<string, object> ticker)
+        {
+            string Field(string name) => ticker.TryGetValue(name, out var value) ? value?.ToString() ?? "" : "";
+
+            decimal Number(string name) =>
+                decimal.TryParse(Field(name), NumberStyles.Float, CultureInfo.InvariantCulture, out var value) ? value : 0;
+
+            return new CurrencyQuote
+            {
+                Id = int.TryParse(Field("id"), out var id) ? id : 0,
+                Name = Field("name"),
+                Symbol = Field("symbol"),
+                NameId = Field("nameid"),
+                Rank = int.TryParse(Field("rank"), out var rank) ? rank : 0,
+                PriceUsd = Number("price_usd"),
+                PercentChange24h = Number("percent_change_24h"),
+                MarketCapUsd = Number("market_cap_usd")
+            };
+        }
+    }
+
+    /// <summary>
+    /// A price series as two parallel arrays instead of one object per point, which keeps
+    /// a 24h chart a few kilobytes and lets clients load it straight into numeric arrays.
+    /// </summary>
+    public class PriceColumns
+    {
+        /// <summary>
+        /// Unix times in milliseconds, ascending. When <see cref="Delta"/> is set, the first value is
+        /// absolute and every following one is the difference to its predecessor.
+        /// </summary>
+        public long[] Timestamps { get; init; } = [];
+
+        /// <summary>
+        /// The price in USD at each timestamp.
+        /// </summary>
+        public decimal[] Prices { get; init; } = [];
+
+        /// <summary>
+        /// Whether <see cref="Timestamps"/> are delta encoded.
+        /// </summary>
+        public bool Delta { get; init; }
+
+        /// <summary>
+        /// Builds the columns from points ordered by time.
+        /// </summary>
+        /// <param name="points">(Unix time in milliseconds, price) pairs, oldest first.</param>
+        /// <param name="delta">Whether to delta encode the timestamps.</param>
+        public static PriceColumns Create(IReadOnlyList<(long Timestamp, decimal Price)> points, bool delta)
+        {
+            var timestamps = new long[points.Count];
+            var prices = new decimal[points.Count];
+            var previous = 0L;
+
+            for (var i = 0; i < points.Count; i++)
+            {
+                var timestamp = points[i].Timestamp;
+                timestamps[i] = delta && i > 0 ? timestamp - previous : timestamp;
+                prices[i] = points[i].Price;
+                previous = timestamp;
+            }
+
+            return new PriceColumns { Timestamps = timestamps, Prices = prices, Delta = delta };
+        }
+    }
+}
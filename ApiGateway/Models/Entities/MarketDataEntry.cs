@@ -0,0 +1,20 @@
+﻿namespace ApiGateway.Models.Entities
+{
+    /// <summary>
+    /// A cached upstream market data payload (Coinlore ticker or CoinGecko chart) together with
+    /// the time it was fetched, so readers can tell a fresh entry from a stale one.
+    /// </summary>
+    public class MarketDataEntry
+    {
+        /// <summary>
+        /// Gets or sets the raw JSON content returned by the upstream API.
+        /// </summary>
+        public required string Content { get; init; }
+
+        /// <summary>
+        /// Gets or sets the date and time when the content was fetched from the upstream API.
+        /// Stored in UTC.
+        /// </summary>
+        public DateTime FetchedAt { get; init; }
+    }
+}
@@ -0,0 +1,64 @@
+﻿namespace ApiGateway.Models.Entities
+{
+    /// <summary>
+    /// One buy or sell order of a batch submitted to the Orders endpoint.
+    /// </summary>
+    public class OrderRequest
+    {
+        /// <summary>
+        /// The Coinlore ID of the cryptocurrency.
+        /// </summary>
+        public int Id { get; init; }
+
+        /// <summary>
+        /// The order type. Valid values are "buy" or "sell".
+        /// </summary>
+        public string Type { get; init; } = "buy";
+
+        /// <summary>
+        /// The amount of the cryptocurrency to buy or sell.
+        /// </summary>
+        public decimal Amount { get; init; }
+    }
+
+    /// <summary>
+    /// The outcome of one <see cref="OrderRequest"/>.
+    /// </summary>
+    public class OrderResult
+    {
+        /// <summary>
+        /// The position of the order in the submitted batch.
+        /// </summary>
+        public int Index { get; init; }
+
+        /// <summary>
+        /// The Coinlore ID of the cryptocurrency.
+        /// </summary>
+        public int Id { get; init; }
+
+        /// <summary>
+        /// The order type, "buy" or "sell".
+        /// </summary>
+        public required string Type { get; init; }
+
+        /// <summary>
+        /// The requested amount.
+        /// </summary>
+        public decimal Amount { get; init; }
+
+        /// <summary>
+        /// Whether the order was executed.
+        /// </summary>
+        public bool Filled { get; init; }
+
+        /// <summary>
+        /// The unit price the order was executed at, if filled.
+        /// </summary>
+        public decimal? PriceUsd { get; init; }
+
+        /// <summary>
+        /// Why the order was rejected, if not filled.
+        /// </summary>
+        public string? Error { get; init; }
+    }
+}
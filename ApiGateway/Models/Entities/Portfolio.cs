@@ -0,0 +1,75 @@
+﻿namespace ApiGateway.Models.Entities
+{
+    /// <summary>
+    /// Snapshot of a wallet: cash, the holding of every supported cryptocurrency and their USD value
+    /// at the prices of one ticker batch.
+    /// </summary>
+    public class Portfolio
+    {
+        /// <summary>
+        /// The wallet the snapshot belongs to.
+        /// </summary>
+        public Guid WalletId { get; init; }
+
+        /// <summary>
+        /// The USD cash balance of the wallet.
+        /// </summary>
+        public decimal CashUsd { get; init; }
+
+        /// <summary>
+        /// One entry per supported cryptocurrency, including those with a zero balance.
+        /// </summary>
+        public List<PortfolioHolding> Holdings { get; init; } = [];
+
+        /// <summary>
+        /// The summed USD value of all holdings.
+        /// </summary>
+        public decimal HoldingsValueUsd { get; init; }
+
+        /// <summary>
+        /// Cash plus the value of all holdings.
+        /// </summary>
+        public decimal TotalValueUsd { get; init; }
+
+        /// <summary>
+        /// The time the prices used for the valuation were fetched (UTC).
+        /// </summary>
+        public DateTime PricedAt { get; init; }
+    }
+
+    /// <summary>
+    /// The balance of one cryptocurrency in a <see cref="Portfolio"/> and its USD value.
+    /// </summary>
+    public class PortfolioHolding
+    {
+        /// <summary>
+        /// The Coinlore ID of the cryptocurrency.
+        /// </summary>
+        public int CryptoId { get; init; }
+
+        /// <summary>
+        /// The display name of the cryptocurrency, as listed by SupportedCurrencies.
+        /// </summary>
+        public required string Name { get; init; }
+
+        /// <summary>
+        /// The symbol of the cryptocurrency (e.g., BTC, ETH).
+        /// </summary>
+        public required string Symbol { get; init; }
+
+        /// <summary>
+        /// The amount held.
+        /// </summary>
+        public decimal Amount { get; init; }
+
+        /// <summary>
+        /// The price of one unit in USD.
+        /// </summary>
+        public decimal PriceUsd { get; init; }
+
+        /// <summary>
+        /// <see cref="Amount"/> times <see cref="PriceUsd"/>.
+        /// </summary>
+        public decimal ValueUsd { get; init; }
+    }
+}
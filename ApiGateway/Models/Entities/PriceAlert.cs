@@ -0,0 +1,95 @@
+﻿using System.ComponentModel.DataAnnotations;
+using System.ComponentModel.DataAnnotations.Schema;
+using Microsoft.EntityFrameworkCore;
+
+namespace ApiGateway.Models.Entities
+{
+    /// <summary>
+    /// A price alert a user registered for one cryptocurrency. It fires once, when the price rises to
+    /// (<c>above</c>) or falls to (<c>below</c>) a threshold, or moves by a percentage in either direction
+    /// from the price at creation (<c>move</c>). Active alerts are those without <see cref="TriggeredAt"/>;
+    /// a user's alerts are listed newest first through the (WalletId, CreatedAt) index.
+    /// </summary>
+    [Table("PriceAlerts")]
+    [Index(nameof(WalletId), nameof(CreatedAt))]
+    [Index(nameof(TriggeredAt))]
+    public class PriceAlert
+    {
+        /// <summary>
+        /// The alert types: a price ceiling, a price floor and a percent move.
+        /// </summary>
+        public static readonly string[] Types = ["above", "below", "move"];
+
+        /// <summary>
+        /// Gets or sets the unique identifier of the alert.
+        /// </summary>
+        [Key]
+        public Guid Id { get; init; } = Guid.NewGuid();
+
+        /// <summary>
+        /// Gets or sets the wallet ID of the user who registered the alert.
+        /// </summary>
+        public Guid WalletId { get; init; }
+
+        /// <summary>
+        /// Gets or sets the ID of the watched cryptocurrency.
+        /// </summary>
+        public int CryptoId { get; init; }
+
+        /// <summary>
+        /// Gets or sets the type of the alert. Valid values are "above", "below" or "move".
+        /// </summary>
+        [Required]
+        public string Type { get; init; } = "above";
+
+        /// <summary>
+        /// Gets or sets the price in USD for <c>above</c> and <c>below</c> alerts, or the
+        /// percentage for <c>move</c> alerts.
+        /// </summary>
+        public decimal Threshold { get; init; }
+
+        /// <summary>
+        /// Gets or sets the price when the alert was registered, which <c>move</c> alerts are measured from.
+        /// </summary>
+        public decimal ReferencePrice { get; init; }
+
+        /// <summary>
+        /// Gets or sets the date and time when the alert was registered.
+        /// Stored in UTC.
+        /// </summary>
+        public DateTime CreatedAt { get; init; } = DateTime.UtcNow;
+
+        /// <summary>
+        /// Gets or sets the date and time when the alert fired, or null while it is active.
+        /// Stored in UTC.
+        /// </summary>
+        public DateTime? TriggeredAt { get; set; }
+
+        /// <summary>
+        /// Gets or sets the price that fired the alert.
+        /// </summary>
+        public decimal? TriggeredPrice { get; set; }
+
+        /// <summary>
+        /// The price at or above which the alert fires, if any.
+        /// </summary>
+        [NotMapped]
+        public decimal? RisingLevel => Type switch
+        {
+            "above" => Threshold,
+            "move" => ReferencePrice * (1 + Threshold / 100),
+            _ => null
+        };
+
+        /// <summary>
+        /// The price at or below which the alert fires, if any.
+        /// </summary>
+        [NotMapped]
+        public decimal? FallingLevel => Type switch
+        {
+            "below" => Threshold,
+            "move" => ReferencePrice * (1 - Threshold / 100),
+            _ => null
+        };
+    }
+}
@@ -0,0 +1,127 @@
+﻿using System.ComponentModel.DataAnnotations.Schema;
+using Microsoft.EntityFrameworkCore;
+
+namespace ApiGateway.Models.Entities
+{
+    /// <summary>
+    /// The width of a <see cref="PriceCandle"/>; the value is the length in seconds.
+    /// </summary>
+    public enum CandleResolution
+    {
+        /// <summary>One minute.</summary>
+        OneMinute = 60,
+
+        /// <summary>Five minutes.</summary>
+        FiveMinutes = 300,
+
+        /// <summary>One hour.</summary>
+        OneHour = 3600,
+
+        /// <summary>One day (UTC).</summary>
+        OneDay = 86400
+    }
+
+    /// <summary>
+    /// The open, high, low and close price of a cryptocurrency within one time bucket, rolled up from
+    /// <see cref="PriceHistory"/> as points are collected. The composite key (CryptoId, Resolution, OpenTime)
+    /// is also the clustered index, so a chart range is one contiguous index scan.
+    /// </summary>
+    [Table("PriceCandles")]
+    [PrimaryKey(nameof(CryptoId), nameof(Resolution), nameof(OpenTime))]
+    public class PriceCandle
+    {
+        /// <summary>
+        /// The unique identifier of the cryptocurrency (e.g., Coinlore ID).
+        /// </summary>
+        public int CryptoId { get; init; }
+
+        /// <summary>
+        /// The width of the bucket.
+        /// </summary>
+        public CandleResolution Resolution { get; init; }
+
+        /// <summary>
+        /// The start of the bucket in UTC, a multiple of <see cref="Resolution"/> since the Unix epoch.
+        /// </summary>
+        public DateTime OpenTime { get; init; }
+
+        /// <summary>
+        /// The first price in the bucket.
+        /// </summary>
+        public decimal Open { get; init; }
+
+        /// <summary>
+        /// The highest price in the bucket.
+        /// </summary>
+        public decimal High { get; set; }
+
+        /// <summary>
+        /// The lowest price in the bucket.
+        /// </summary>
+        public decimal Low { get; set; }
+
+        /// <summary>
+        /// The last price in the bucket.
+        /// </summary>
+        public decimal Close { get; set; }
+
+        /// <summary>
+        /// The number of price points rolled up into the candle.
+        /// </summary>
+        public int Points { get; set; }
+    }
+
+    /// <summary>
+    /// Candles as parallel arrays, in the same columnar layout as <see cref="PriceColumns"/>.
+    /// </summary>
+    public class CandleColumns
+    {
+        /// <summary>
+        /// The candle width in seconds.
+        /// </summary>
+        public int Resolution { get; init; }
+
+        /// <summary>
+        /// The Unix time in milliseconds at which each candle opens, ascending.
+        /// </summary>
+        public long[] Timestamps { get; init; } = [];
+
+        /// <summary>
+        /// The open price of each candle.
+        /// </summary>
+        public decimal[] Open { get; init; } = [];
+
+        /// <summary>
+        /// The high price of each candle.
+        /// </summary>
+        public decimal[] High { get; init; } = [];
+
+        /// <summary>
+        /// The low price of each candle.
+        /// </summary>
+        public decimal[] Low { get; init; } = [];
+
+        /// <summary>
+        /// The close price of each candle.
+        /// </summary>
+        public decimal[] Close { get; init; } = [];
+
+        /// <summary>
+        /// Builds the columns from candles ordered by <see cref="PriceCandle.OpenTime"/>.
+        /// </summary>
+        /// <param name="resolution">The width of the candles.</param>
+        /// <param name="candles">The candles, oldest first.</param>
+        public static CandleColumns Create(CandleResolution resolution, IReadOnlyList<PriceCandle> candles)
+        {
+            return new CandleColumns
+            {
+                Resolution = (int)resolution,
+                Timestamps = candles.Select(c => new DateTimeOffset(c.OpenTime, TimeSpan.Zero).ToUnixTimeMilliseconds()).ToArray(),
+                Open = candles.Select(c => c.Open).ToArray(),
+                High = candles.Select(c => c.High).ToArray(),
+                Low = candles.Select(c => c.Low).ToArray(),
+                Close = candles.Select(c => c.Close).ToArray()
+            };
+        }
+    }
+}
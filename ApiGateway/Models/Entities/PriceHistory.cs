@@ -1,13 +1,16 @@
 ﻿using System;
 using System.ComponentModel.DataAnnotations;
 using System.ComponentModel.DataAnnotations.Schema;
+using Microsoft.EntityFrameworkCore;
 
 namespace ApiGateway.Models.Entities
 {
     /// <summary>
     /// Represents the historical price of a specific cryptocurrency at a given point in time.
+    /// A cryptocurrency has at most one price per timestamp, so re-ingesting a series is a no-op.
     /// </summary>
     [Table("PriceHistories")]
+    [Index(nameof(CryptoId), nameof(Timestamp), IsUnique = true)]
     public class PriceHistory
     {
         /// <summary>
@@ -1,27 +1,65 @@
 ﻿using System.Text.Json;
+using ApiGateway.Services;
 using Microsoft.Extensions.Caching.Distributed;
 
 
 namespace  ApiGateway.Models.Entities
 {
     /// <summary>
-    /// Provides methods for interacting with Redis cache for storing and retrieving User and Account data.
+    /// Provides methods for interacting with Redis cache for storing and retrieving User, Account,
+    /// Portfolio and upstream market data. Every call is timed as the cache stage of the current
+    /// request, and every read counted as a hit or miss of its entry family.
     /// </summary>
     public class RedisCacheContext
     {
         private readonly IDistributedCache _cache;
+        private readonly GatewayMetrics _metrics;
+        private readonly ILogger<RedisCacheContext> _logger;
 
         /// <summary>
         /// Initializes a new instance of the <see cref="RedisCacheContext"/> class with the specified cache provider.
         /// </summary>
         /// <param name="cache">An instance of <see cref="IDistributedCache"/>.</param>
-        public RedisCacheContext(IDistributedCache cache)
+        /// <param name="metrics">Records cache timings and hit rates.</param>
+        /// <param name="logger">Logger of cache reads and writes.</param>
+        public RedisCacheContext(IDistributedCache cache, GatewayMetrics metrics, ILogger<RedisCacheContext> logger)
         {
             _cache = cache;
+            _metrics = metrics;
+            _logger = logger;
         }
 
         /// <summary>
-        /// Retrieves a list of transaction history entries for a specific user from Redis cache.
+        /// Reads and deserializes an entry, counting the lookup under <paramref name="family"/>.
+        /// </summary>
+        private async Task<T?> Get<T>(string key, string family) where T : class
+        {
+            using var stage = _metrics.Stage(GatewayStage.Cache);
+            var cachedData = await _cache.GetStringAsync(key);
+
+            var hit = !string.IsNullOrEmpty(cachedData);
+            _metrics.CacheLookup(family, hit);
+            _logger.LogDebug("Redis {Result} for {Family} entry", hit ? "hit" : "miss", family);
+            return hit ? JsonSerializer.Deserialize<T>(cachedData!) : null;
+        }
+
+        /// <summary>
+        /// Serializes and stores an entry.
+        /// </summary>
+        private async Task Set<T>(string key, T value, TimeSpan expiration)
+        {
+            using var stage = _metrics.Stage(GatewayStage.Cache);
+            var json = JsonSerializer.Serialize(value);
+            var options = new DistributedCacheEntryOptions
+            {
+                AbsoluteExpirationRelativeToNow = expiration
+            };
+
+            await _cache.SetStringAsync(key, json, options);
+        }
+
+        /// <summary>
+        /// Retrieves the cached first page of a user's transaction history (newest first) from Redis cache.
         /// </summary>
         /// <param name="apiKey">The API key used to uniquely identify the user.</param>
         /// <param name="walletId">The wallet ID associated with the user's account.</param>
@@ -30,21 +68,11 @@ namespace  ApiGateway.Models.Entities
         /// </returns>
         public async Task<List<Transaction>?> GetTransactionHistory(string apiKey, string walletId)
         {
-            var cacheKey = $"{apiKey}:{walletId}";  // Create a unique cache key
-
-            Console.WriteLine($"Fetching list of transaction history from Redis.");
-
-            var cachedData = await _cache.GetStringAsync(cacheKey);
-
-            if (string.IsNullOrEmpty(cachedData))
-                return null;
-
-            var transactionList = JsonSerializer.Deserialize<List<Transaction>>(cachedData);
-            return transactionList;
+            return await Get<List<Transaction>>($"{apiKey}:{walletId}", "history");
         }
         
         /// <summary>
-        /// Stores a list of transaction history entries for a specific user in Redis cache.
+        /// Stores the first page of a user's transaction history (newest first) in Redis cache.
         /// </summary>
         /// <param name="apiKey">The API key used to uniquely identify the user.</param>
         /// <param name="walletId">The wallet ID associated with the user's account.</param>
@@ -55,16 +83,7 @@ namespace  ApiGateway.Models.Entities
         /// <returns>A task representing the asynchronous cache operation.</returns>
         public async Task SetTransactionHistory(string apiKey, string walletId, List<Transaction> transactionList, TimeSpan? expiration = null)
         {
-            var cacheKey = $"{apiKey}:{walletId}";  // Unique cache key
-            var json = JsonSerializer.Serialize(transactionList);
-
-            var options = new DistributedCacheEntryOptions
-            {
-                AbsoluteExpirationRelativeToNow = expiration ?? TimeSpan.FromHours(1)
-            };
-
-            Console.WriteLine($"Storing list of transaction history in Redis.");
-            await _cache.SetStringAsync(cacheKey, json, options);
+            await Set($"{apiKey}:{walletId}", transactionList, expiration ?? TimeSpan.FromHours(1));
         }
 
         /// <summary>
@@ -74,15 +93,7 @@ namespace  ApiGateway.Models.Entities
         /// <returns>A <see cref="User"/> object if found; otherwise, null.</returns>
         public async Task<User?> GetUserByApiKey(string apiKey)
         {
-            var cachedData = await _cache.GetStringAsync(apiKey);
-
-            if (string.IsNullOrEmpty(cachedData))
-                return null;
-            
-            // Parse or return cached data
-            Console.WriteLine("Fetching user from Redis");
-            var userFromCache = JsonSerializer.Deserialize<User>(cachedData);
-            return userFromCache;
+            return await Get<User>(apiKey, "user");
         }
 
         /// <summary>
@@ -92,15 +103,7 @@ namespace  ApiGateway.Models.Entities
         /// <returns>An <see cref="Account"/> object if found; otherwise, null.</returns>
         public async Task<Account?> GetAccountByWalletId(string walletId)
         {
-            var cachedData = await _cache.GetStringAsync(walletId);
-
-            if (string.IsNullOrEmpty(cachedData))
-                return null;
-            
-            // Parse or return cached data
-            Console.WriteLine("Fetching account from Redis");
-            var accountFromCache = JsonSerializer.Deserialize<Account>(cachedData);
-            return accountFromCache;
+            return await Get<Account>(walletId, "account");
         }
         
         /// <summary>
@@ -111,14 +114,7 @@ namespace  ApiGateway.Models.Entities
         /// <param name="expiration">Optional expiration time for the cached item. Defaults to 1 hour.</param>
         public async Task SetUserByApiKey(string apiKey, User user, TimeSpan? expiration = null)
         {
-            Console.WriteLine("Storing new user into Redis");
-            var json = JsonSerializer.Serialize(user);
-            var options = new DistributedCacheEntryOptions
-            {
-                AbsoluteExpirationRelativeToNow = expiration ?? TimeSpan.FromHours(1)
-            };
-
-            await _cache.SetStringAsync(apiKey, json, options);
+            await Set(apiKey, user, expiration ?? TimeSpan.FromHours(1));
         }
 
         /// <summary>
@@ -129,22 +125,113 @@ namespace  ApiGateway.Models.Entities
         /// <param name="expiration">Optional expiration time for the cached item. Defaults to 1 hour.</param>
         public async Task SetAccountByWalletId(string walletId, Account account, TimeSpan? expiration = null)
         {
-            Console.WriteLine("Storing new account into Redis");
-            var json = JsonSerializer.Serialize(account);
-            var options = new DistributedCacheEntryOptions
-            {
-                AbsoluteExpirationRelativeToNow = expiration ?? TimeSpan.FromHours(1)
-            };
-
-            await _cache.SetStringAsync(walletId, json, options);
+            await Set(walletId, account, expiration ?? TimeSpan.FromHours(1));
         }
         
+        /// <summary>
+        /// Retrieves a cached <see cref="Portfolio"/> snapshot by wallet ID from Redis.
+        /// </summary>
+        /// <param name="walletId">The wallet ID of the account.</param>
+        /// <returns>A <see cref="Portfolio"/> object if found; otherwise, null.</returns>
+        public async Task<Portfolio?> GetPortfolio(string walletId)
+        {
+            return await Get<Portfolio>($"portfolio:{walletId}", "portfolio");
+        }
+
+        /// <summary>
+        /// Stores a <see cref="Portfolio"/> snapshot in Redis cache under its wallet ID.
+        /// </summary>
+        /// <param name="walletId">The wallet ID of the account.</param>
+        /// <param name="portfolio">The <see cref="Portfolio"/> to cache.</param>
+        /// <param name="expiration">Optional expiration time for the cached item. Defaults to 10 seconds.</param>
+        public async Task SetPortfolio(string walletId, Portfolio portfolio, TimeSpan? expiration = null)
+        {
+            await Set($"portfolio:{walletId}", portfolio, expiration ?? TimeSpan.FromSeconds(10));
+        }
+
+        /// <summary>
+        /// Retrieves a cached upstream market data entry (ticker or chart) from Redis.
+        /// </summary>
+        /// <param name="key">The market data key, e.g. <c>ticker:90</c> or <c>chart:bitcoin:1</c>.</param>
+        /// <returns>A <see cref="MarketDataEntry"/> if found; otherwise, null.</returns>
+        public async Task<MarketDataEntry?> GetMarketData(string key)
+        {
+            // The family is the key prefix: ticker, tickers or chart
+            return await Get<MarketDataEntry>(key, key.Split(':')[0]);
+        }
+
+        /// <summary>
+        /// Stores an upstream market data entry in Redis cache.
+        /// </summary>
+        /// <param name="key">The market data key used as the Redis key.</param>
+        /// <param name="entry">The <see cref="MarketDataEntry"/> to cache.</param>
+        /// <param name="expiration">
+        /// Optional expiration time for the cached item. Defaults to 10 minutes; this bounds how
+        /// stale an entry may get, freshness itself is decided by the reader from <see cref="MarketDataEntry.FetchedAt"/>.
+        /// </param>
+        public async Task SetMarketData(string key, MarketDataEntry entry, TimeSpan? expiration = null)
+        {
+            await Set(key, entry, expiration ?? TimeSpan.FromMinutes(10));
+        }
+
+        /// <summary>
+        /// Retrieves a user's conversation with the AI agent from Redis.
+        /// </summary>
+        /// <param name="walletId">The wallet ID of the user.</param>
+        /// <returns>An <see cref="AgentConversation"/> if found; otherwise, null.</returns>
+        public async Task<AgentConversation?> GetAgentConversation(string walletId)
+        {
+            return await Get<AgentConversation>($"agent:{walletId}", "agent-session");
+        }
+
+        /// <summary>
+        /// Stores a user's conversation with the AI agent in Redis cache.
+        /// </summary>
+        /// <param name="walletId">The wallet ID of the user.</param>
+        /// <param name="conversation">The <see cref="AgentConversation"/> to cache.</param>
+        /// <param name="expiration">Time of inactivity after which the conversation is dropped.</param>
+        public async Task SetAgentConversation(string walletId, AgentConversation conversation, TimeSpan expiration)
+        {
+            await Set($"agent:{walletId}", conversation, expiration);
+        }
+
+        /// <summary>
+        /// Removes a user's conversation with the AI agent from Redis cache.
+        /// </summary>
+        /// <param name="walletId">The wallet ID of the user.</param>
+        public async Task RemoveAgentConversation(string walletId)
+        {
+            await Remove($"agent:{walletId}");
+        }
+
+        /// <summary>
+        /// Retrieves a cached AI agent answer from Redis.
+        /// </summary>
+        /// <param name="promptKey">The model and hash of the normalized prompt.</param>
+        /// <returns>The answer if found; otherwise, null.</returns>
+        public async Task<string?> GetAgentAnswer(string promptKey)
+        {
+            return await Get<string>($"agent-answer:{promptKey}", "agent-answer");
+        }
+
+        /// <summary>
+        /// Stores an AI agent answer in Redis cache.
+        /// </summary>
+        /// <param name="promptKey">The model and hash of the normalized prompt.</param>
+        /// <param name="answer">The complete answer.</param>
+        /// <param name="expiration">The time after which the answer is generated again.</param>
+        public async Task SetAgentAnswer(string promptKey, string answer, TimeSpan expiration)
+        {
+            await Set($"agent-answer:{promptKey}", answer, expiration);
+        }
+
         /// <summary>
         /// Removes a key and its associated value from Redis cache.
         /// </summary>
         /// <param name="key">The Redis key to remove.</param>
         public async Task Remove(string key)
         {
+            using var stage = _metrics.Stage(GatewayStage.Cache);
             await _cache.RemoveAsync(key);
         }
     }
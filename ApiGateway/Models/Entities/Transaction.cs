@@ -1,14 +1,17 @@
 ﻿using System;
 using System.ComponentModel.DataAnnotations;
 using System.ComponentModel.DataAnnotations.Schema;
+using Microsoft.EntityFrameworkCore;
 
 namespace ApiGateway.Models.Entities
 {
     /// <summary>
     /// Represents a cryptocurrency transaction (buy or sell) performed by a user.
     /// Stores transaction details including type, price at time of transaction, and timestamp.
+    /// History pages are read newest first per wallet, which the (WalletId, DateTime, Id) index serves directly.
     /// </summary>
     [Table("Transactions")]
+    [Index(nameof(WalletId), nameof(DateTime), nameof(Id))]
     public class Transaction
     {
         /// <summary>
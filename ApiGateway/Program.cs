@@ -1,33 +1,86 @@
 using ApiGateway.Models.Entities;
+using ApiGateway.Services;
 using Microsoft.EntityFrameworkCore;
 using Microsoft.Extensions.Caching.Distributed;
+using Microsoft.Extensions.Logging.Console;
+using System.IO.Compression;
+using Microsoft.AspNetCore.ResponseCompression;
 
 
 var builder = WebApplication.CreateBuilder(args);
 builder.Services.AddRazorPages().AddRazorRuntimeCompilation();
 
+// Console logging is queued and written on a background thread; when it falls behind,
+// messages are dropped instead of blocking requests
+builder.Logging.AddSimpleConsole(options => options.SingleLine = true);
+builder.Services.Configure<ConsoleLoggerOptions>(options =>
+{
+    options.QueueFullMode = ConsoleLoggerQueueFullMode.DropWrite;
+    options.MaxQueueLength = 10_000;
+});
+
 
 // Add services to the container.
-builder.Services.AddControllersWithViews();
+builder.Services.AddControllersWithViews(options => options.Filters.Add<SerializationTimingFilter>());
 builder.Services.AddEndpointsApiExplorer();        // 👈 Required for minimal APIs and Swagger
 builder.Services.AddSwaggerGen();                  // 👈 Add Swagger generator
 
+// JSON responses (price histories above all) are compressed for clients that accept it; Brotli is
+// preferred over gzip. Event streams are not in the MIME list, so agent tokens are never buffered.
+builder.Services.AddResponseCompression(options =>
+{
+    options.Providers.Add<BrotliCompressionProvider>();
+    options.Providers.Add<GzipCompressionProvider>();
+});
+builder.Services.Configure<BrotliCompressionProviderOptions>(options => options.Level = CompressionLevel.Fastest);
+builder.Services.Configure<GzipCompressionProviderOptions>(options => options.Level = CompressionLevel.Fastest);
+
+builder.Services.AddSingleton<GatewayMetrics>();
+builder.Services.AddSingleton<DbTimingInterceptor>();
+var upstreamsSection = builder.Configuration.GetSection("Upstreams");
+builder.Services.Configure<UpstreamOptions>(upstreamsSection);
+builder.Services.AddUpstreamClients(upstreamsSection.Get<UpstreamOptions>() ?? new UpstreamOptions());
+builder.Services.Configure<AgentOptions>(builder.Configuration.GetSection("Agent"));
+builder.Services.Configure<AlertOptions>(builder.Configuration.GetSection("Alerts"));
 builder.Services.AddScoped<CryptoDbContext>();
-builder.Services.AddScoped<RedisCacheContext>();
+builder.Services.AddSingleton<RedisCacheContext>();
+builder.Services.AddSingleton<ApiKeyAuthenticator>();
+builder.Services.AddScoped<ApiKeyAuthFilter>();
+builder.Services.AddSingleton<MarketDataService>();
+builder.Services.AddSingleton<PortfolioService>();
+builder.Services.AddSingleton<AgentQueue>();
+builder.Services.AddSingleton<AgentService>();
+builder.Services.AddHostedService<PriceHistoryCollector>();
+// One instance evaluates the alerts in the background and serves the Alerts endpoints' streams
+builder.Services.AddSingleton<AlertEngine>();
+builder.Services.AddHostedService(serviceProvider => serviceProvider.GetRequiredService<AlertEngine>());
 
 // MySQL Connection string
 string? connectionString = builder.Configuration.GetConnectionString("APIServer");
-builder.Services.AddDbContextPool<CryptoDbContext>(options => options
+builder.Services.AddDbContextPool<CryptoDbContext>((serviceProvider, options) => options
     .UseMySql(connectionString, ServerVersion.AutoDetect(connectionString))
+    .AddInterceptors(serviceProvider.GetRequiredService<DbTimingInterceptor>())
 );
 
-// Redis Connection string
-builder.Services.AddStackExchangeRedisCache(redisOptions => {
-    redisOptions.Configuration = builder.Configuration.GetConnectionString("Redis");
-});
+// Redis Connection string; without one the cache is kept in process memory (single instance, e.g. for benchmarks)
+string? redisConnectionString = builder.Configuration.GetConnectionString("Redis");
+if (string.IsNullOrEmpty(redisConnectionString))
+{
+    builder.Services.AddDistributedMemoryCache();
+}
+else
+{
+    builder.Services.AddStackExchangeRedisCache(redisOptions => {
+        redisOptions.Configuration = redisConnectionString;
+    });
+}
 
 var app = builder.Build();
 
+// First in the pipeline, so the measured time covers everything the gateway does
+app.UseMiddleware<RequestMetricsMiddleware>();
+app.UseResponseCompression();
+
 // Configure the HTTP request pipeline.
 if (app.Environment.IsDevelopment())
 {
@@ -47,11 +100,11 @@ using (var scope = app.Services.CreateScope())
     {
         if (!db.Database.CanConnect())
             throw new Exception("❌ Failed to connect to MySQL database.");
-        Console.WriteLine("✅ MySQL connection successful.");
+        app.Logger.LogInformation("✅ MySQL connection successful.");
     }
     catch
     {
-        Console.WriteLine("❌ Failed to connect to MySQL database.");
+        app.Logger.LogCritical("❌ Failed to connect to MySQL database.");
         throw; // Stop the app
     }
 
@@ -69,11 +122,11 @@ using (var scope = app.Services.CreateScope())
         if (value != "ok")
             throw new Exception("❌ Failed to connect to Redis database.");
 
-        Console.WriteLine("✅ Redis connection successful.");
+        app.Logger.LogInformation("✅ Redis connection successful.");
     }
     catch
     {
-        Console.WriteLine("❌ Failed to connect to Redis database.");
+        app.Logger.LogCritical("❌ Failed to connect to Redis database.");
         throw; // Stop the app
     }
 }
@@ -83,6 +136,9 @@ app.UseStaticFiles();
 app.UseRouting();
 app.UseAuthorization();
 
+// Prometheus scrape target
+app.MapGet("/metrics", (GatewayMetrics metrics) => Results.Text(metrics.Export(), "text/plain; version=0.0.4"));
+
 app.MapControllerRoute(
     name: "default",
     pattern: "{controller=Home}/{action=index}/{id?}");
@@ -0,0 +1,40 @@
+﻿namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Conversation, queueing and caching limits of the AI agent, bound from the "Agent" section
+    /// of appsettings.json. How many prompts Ollama answers at once is
+    /// <see cref="UpstreamOptions.OllamaMaxConcurrentRequests"/>.
+    /// </summary>
+    public class AgentOptions
+    {
+        /// <summary>
+        /// Most recent messages (prompts and answers) sent to the model as context and kept per user.
+        /// </summary>
+        public int HistoryMessages { get; set; } = 10;
+
+        /// <summary>
+        /// Characters of context sent to the model; older messages are dropped beyond it.
+        /// </summary>
+        public int HistoryCharacters { get; set; } = 4000;
+
+        /// <summary>
+        /// Minutes of inactivity after which a user's conversation is forgotten.
+        /// </summary>
+        public int SessionMinutes { get; set; } = 30;
+
+        /// <summary>
+        /// Prompts that may wait for the model in total; further prompts are rejected with 503.
+        /// </summary>
+        public int MaxQueuedPrompts { get; set; } = 32;
+
+        /// <summary>
+        /// Prompts one user may have running or waiting at the same time.
+        /// </summary>
+        public int MaxPromptsPerUser { get; set; } = 2;
+
+        /// <summary>
+        /// Minutes an answer to an opening prompt is reused for the same normalized prompt.
+        /// </summary>
+        public int AnswerCacheMinutes { get; set; } = 60;
+    }
+}
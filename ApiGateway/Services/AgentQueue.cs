@@ -0,0 +1,247 @@
+﻿using System.Diagnostics;
+using Microsoft.Extensions.Options;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Bounded admission queue in front of the Ollama model. At most
+    /// <see cref="UpstreamOptions.OllamaMaxConcurrentRequests"/> prompts are generated at once and
+    /// waiting prompts are admitted round-robin across users, so a user with several prompts in
+    /// flight cannot hold everyone else back. Once <see cref="AgentOptions.MaxQueuedPrompts"/> are
+    /// waiting, new prompts are rejected at once instead of piling up behind minutes of generation.
+    /// Registered as a singleton.
+    /// </summary>
+    public class AgentQueue
+    {
+        private readonly object _lock = new();
+        private readonly int _concurrency;
+        private readonly int _maxQueued;
+        private readonly int _maxPerUser;
+        private readonly GatewayMetrics _metrics;
+
+        // Users with waiting prompts in the order they are served next, and their prompts oldest first
+        private readonly LinkedList<Guid> _rotation = new();
+        private readonly Dictionary<Guid, List<AgentTicket>> _waiting = new();
+        private readonly Dictionary<Guid, int> _perUser = new();
+        private int _running;
+        private int _queued;
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="AgentQueue"/> class.
+        /// </summary>
+        /// <param name="upstreams">Provides the number of prompts Ollama answers at once.</param>
+        /// <param name="options">Queue limits.</param>
+        /// <param name="metrics">Records queue waiting times.</param>
+        public AgentQueue(IOptions<UpstreamOptions> upstreams, IOptions<AgentOptions> options, GatewayMetrics metrics)
+        {
+            _concurrency = Math.Max(1, upstreams.Value.OllamaMaxConcurrentRequests);
+            _maxQueued = options.Value.MaxQueuedPrompts;
+            _maxPerUser = Math.Max(1, options.Value.MaxPromptsPerUser);
+            _metrics = metrics;
+        }
+
+        /// <summary>
+        /// Queues a prompt of a user. The returned ticket must be disposed once generation ends,
+        /// which frees its slot for the next waiting prompt.
+        /// </summary>
+        /// <param name="userId">The wallet ID of the user sending the prompt.</param>
+        /// <param name="cancellationToken">Removes the prompt from the queue when cancelled.</param>
+        /// <returns>The ticket, or <c>null</c> if the user or the queue is at its limit.</returns>
+        public AgentTicket? TryEnter(Guid userId, CancellationToken cancellationToken)
+        {
+            AgentTicket ticket;
+            lock (_lock)
+            {
+                var userPrompts = _perUser.GetValueOrDefault(userId);
+                var mustWait = _running >= _concurrency;
+                if (userPrompts >= _maxPerUser || (mustWait && _queued >= _maxQueued))
+                {
+                    _metrics.AgentQueueWait("rejected", TimeSpan.Zero);
+                    return null;
+                }
+
+                _perUser[userId] = userPrompts + 1;
+                ticket = new AgentTicket(this, userId);
+                if (mustWait)
+                {
+                    if (!_waiting.TryGetValue(userId, out var prompts))
+                    {
+                        _waiting[userId] = prompts = [];
+                        _rotation.AddLast(userId);
+                    }
+                    prompts.Add(ticket);
+                    _queued++;
+                }
+                else
+                {
+                    _running++;
+                    Admit(ticket);
+                }
+            }
+
+            ticket.CancelWith(cancellationToken);
+            return ticket;
+        }
+
+        /// <summary>
+        /// The 1-based number of the ticket's turn among the waiting prompts, or 0 once it is admitted.
+        /// </summary>
+        internal int PositionOf(AgentTicket ticket)
+        {
+            lock (_lock)
+            {
+                if (ticket.State != AgentTicket.TicketState.Waiting)
+                    return 0;
+
+                // Replays the round-robin: the n-th prompt of every user in rotation order, then the next one
+                var position = 1;
+                for (var round = 0; round < _maxPerUser; round++)
+                {
+                    foreach (var userId in _rotation)
+                    {
+                        var prompts = _waiting[userId];
+                        if (round >= prompts.Count)
+                            continue;
+                        if (prompts[round] == ticket)
+                            return position;
+                        position++;
+                    }
+                }
+                return position;
+            }
+        }
+
+        /// <summary>
+        /// Frees the slot of a running ticket, or removes a waiting one from the queue.
+        /// Releasing a ticket twice has no effect.
+        /// </summary>
+        /// <param name="ticket">The ticket to release.</param>
+        /// <param name="onlyIfWaiting">
+        /// Leave an admitted ticket alone; its slot is freed when generation has actually stopped.
+        /// </param>
+        internal void Release(AgentTicket ticket, bool onlyIfWaiting = false)
+        {
+            lock (_lock)
+            {
+                switch (ticket.State)
+                {
+                    case AgentTicket.TicketState.Running when !onlyIfWaiting:
+                        _running--;
+                        break;
+                    case AgentTicket.TicketState.Waiting:
+                        var prompts = _waiting[ticket.UserId];
+                        prompts.Remove(ticket);
+                        if (prompts.Count == 0)
+                        {
+                            _waiting.Remove(ticket.UserId);
+                            _rotation.Remove(ticket.UserId);
+                        }
+                        _queued--;
+                        _metrics.AgentQueueWait("cancelled", ticket.Waited);
+                        ticket.Cancel();
+                        break;
+                    default:
+                        return;
+                }
+
+                ticket.State = AgentTicket.TicketState.Released;
+                if (--_perUser[ticket.UserId] == 0)
+                    _perUser.Remove(ticket.UserId);
+
+                Dispatch();
+            }
+        }
+
+        /// <summary>
+        /// Admits waiting prompts while slots are free, taking one prompt per user in turn.
+        /// </summary>
+        private void Dispatch()
+        {
+            while (_running < _concurrency && _rotation.First is { } next)
+            {
+                var userId = next.Value;
+                _rotation.RemoveFirst();
+
+                var prompts = _waiting[userId];
+                var ticket = prompts[0];
+                prompts.RemoveAt(0);
+                if (prompts.Count > 0)
+                    _rotation.AddLast(userId);
+                else
+                    _waiting.Remove(userId);
+
+                _queued--;
+                _running++;
+                Admit(ticket);
+            }
+        }
+
+        private void Admit(AgentTicket ticket)
+        {
+            _metrics.AgentQueueWait("admitted", ticket.Waited);
+            ticket.State = AgentTicket.TicketState.Running;
+            ticket.Start();
+        }
+    }
+
+    /// <summary>
+    /// A prompt's place in the <see cref="AgentQueue"/>. <see cref="Ready"/> completes when the prompt
+    /// may be sent to the model; disposing the ticket gives up its place or frees its slot.
+    /// </summary>
+    public sealed class AgentTicket : IDisposable
+    {
+        /// <summary>
+        /// Lifecycle of a ticket.
+        /// </summary>
+        internal enum TicketState { Waiting, Running, Released }
+
+        private readonly AgentQueue _queue;
+        private readonly TaskCompletionSource _ready = new(TaskCreationOptions.RunContinuationsAsynchronously);
+        private readonly long _enqueuedAt = Stopwatch.GetTimestamp();
+        private CancellationTokenRegistration _registration;
+
+        internal AgentTicket(AgentQueue queue, Guid userId)
+        {
+            _queue = queue;
+            UserId = userId;
+        }
+
+        /// <summary>
+        /// The wallet ID of the user who sent the prompt.
+        /// </summary>
+        public Guid UserId { get; }
+
+        /// <summary>
+        /// Completes when the prompt is admitted; cancelled if it leaves the queue before that.
+        /// </summary>
+        public Task Ready => _ready.Task;
+
+        /// <summary>
+        /// The 1-based number of the prompt's turn while it waits, or 0 once it is admitted.
+        /// </summary>
+        public int Position => _queue.PositionOf(this);
+
+        internal TicketState State { get; set; } = TicketState.Waiting;
+
+        internal TimeSpan Waited => Stopwatch.GetElapsedTime(_enqueuedAt);
+
+        internal void Start() => _ready.TrySetResult();
+
+        internal void Cancel() => _ready.TrySetCanceled();
+
+        internal void CancelWith(CancellationToken cancellationToken)
+        {
+            if (cancellationToken.CanBeCanceled && !Ready.IsCompleted)
+                _registration = cancellationToken.Register(() => _queue.Release(this, onlyIfWaiting: true));
+        }
+
+        /// <summary>
+        /// Leaves the queue, or frees the slot once generation is over.
+        /// </summary>
+        public void Dispose()
+        {
+            _registration.Dispose();
+            _queue.Release(this);
+        }
+    }
+}
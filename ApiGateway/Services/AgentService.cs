@@ -0,0 +1,161 @@
+﻿using System.Runtime.CompilerServices;
+using System.Security.Cryptography;
+using System.Text;
+using ApiGateway.Models.Entities;
+using Microsoft.Extensions.AI;
+using Microsoft.Extensions.Options;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Answers AI agent prompts in the context of the user's conversation. Conversations live in
+    /// Redis, windowed to the most recent messages; opening prompts that normalize to the same text
+    /// share one cached answer; and generation is admitted through the <see cref="AgentQueue"/>.
+    /// Registered as a singleton.
+    /// </summary>
+    public class AgentService
+    {
+        private readonly RedisCacheContext _redisCache;
+        private readonly AgentQueue _queue;
+        private readonly IHttpClientFactory _httpClientFactory;
+        private readonly UpstreamOptions _upstreams;
+        private readonly AgentOptions _options;
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="AgentService"/> class.
+        /// </summary>
+        /// <param name="redisCache">Redis database context holding conversations and cached answers.</param>
+        /// <param name="queue">Admission queue of the Ollama model.</param>
+        /// <param name="httpClientFactory">Factory of the pooled Ollama client.</param>
+        /// <param name="upstreams">Configured endpoint and model of the Ollama server.</param>
+        /// <param name="options">Conversation window and cache lifetimes.</param>
+        public AgentService(RedisCacheContext redisCache, AgentQueue queue, IHttpClientFactory httpClientFactory,
+            IOptions<UpstreamOptions> upstreams, IOptions<AgentOptions> options)
+        {
+            _redisCache = redisCache;
+            _queue = queue;
+            _httpClientFactory = httpClientFactory;
+            _upstreams = upstreams.Value;
+            _options = options.Value;
+        }
+
+        /// <summary>
+        /// Loads the user's conversation and, for an opening prompt, looks up a cached answer.
+        /// </summary>
+        /// <param name="user">The user sending the prompt.</param>
+        /// <param name="prompt">The prompt text.</param>
+        /// <returns>The prompt with its context; <see cref="AgentPrompt.CachedAnswer"/> is set on a cache hit.</returns>
+        public async Task<AgentPrompt> Prepare(User user, string prompt)
+        {
+            var conversation = await _redisCache.GetAgentConversation(user.WalletId.ToString()) ?? new AgentConversation();
+
+            // Follow-ups depend on what was said before, so only opening prompts share answers
+            var cacheKey = conversation.Messages.Count == 0 ? PromptKey(prompt) : null;
+            var cachedAnswer = cacheKey != null ? await _redisCache.GetAgentAnswer(cacheKey) : null;
+            return new AgentPrompt(user.WalletId, prompt, conversation, cacheKey, cachedAnswer);
+        }
+
+        /// <summary>
+        /// Queues a prompt for the model.
+        /// </summary>
+        /// <param name="prompt">A prompt returned by <see cref="Prepare"/>.</param>
+        /// <param name="cancellationToken">Removes the prompt from the queue when cancelled.</param>
+        /// <returns>The ticket to wait on and dispose, or <c>null</c> if the queue is full.</returns>
+        public AgentTicket? Enqueue(AgentPrompt prompt, CancellationToken cancellationToken)
+        {
+            return _queue.TryEnter(prompt.WalletId, cancellationToken);
+        }
+
+        /// <summary>
+        /// Streams the model's answer to a prompt, with the conversation window as context.
+        /// Call only once the prompt's <see cref="AgentTicket"/> is ready.
+        /// </summary>
+        /// <param name="prompt">A prompt returned by <see cref="Prepare"/>.</param>
+        /// <param name="cancellationToken">Stops generation.</param>
+        /// <returns>The answer's tokens as Ollama produces them.</returns>
+        public async IAsyncEnumerable<string> Generate(AgentPrompt prompt, [EnumeratorCancellation] CancellationToken cancellationToken)
+        {
+            var chatClient = new OllamaChatClient(endpoint: new Uri(_upstreams.Ollama), modelId: _upstreams.OllamaModel,
+                httpClient: _httpClientFactory.CreateClient(UpstreamClients.Ollama));
+
+            var messages = Window(prompt.Conversation.Messages.Append(new AgentMessage { Role = "user", Content = prompt.Text }))
+                .Select(m => new ChatMessage(m.Role == "assistant" ? ChatRole.Assistant : ChatRole.User, m.Content))
+                .ToList();
+
+            await foreach (var item in chatClient.GetStreamingResponseAsync(messages, cancellationToken: cancellationToken))
+            {
+                if (!string.IsNullOrEmpty(item.Text))
+                    yield return item.Text;
+            }
+        }
+
+        /// <summary>
+        /// Adds a prompt and its answer to the user's conversation and caches the answer of an opening prompt.
+        /// </summary>
+        /// <param name="prompt">A prompt returned by <see cref="Prepare"/>.</param>
+        /// <param name="answer">The complete answer.</param>
+        public async Task Complete(AgentPrompt prompt, string answer)
+        {
+            var conversation = prompt.Conversation;
+            conversation.Messages = Window(conversation.Messages.Concat([
+                new AgentMessage { Role = "user", Content = prompt.Text },
+                new AgentMessage { Role = "assistant", Content = answer }
+            ]));
+            await _redisCache.SetAgentConversation(prompt.WalletId.ToString(), conversation,
+                TimeSpan.FromMinutes(_options.SessionMinutes));
+
+            if (prompt.CacheKey != null && prompt.CachedAnswer == null && answer.Length > 0)
+                await _redisCache.SetAgentAnswer(prompt.CacheKey, answer, TimeSpan.FromMinutes(_options.AnswerCacheMinutes));
+        }
+
+        /// <summary>
+        /// Forgets the user's conversation, so the next prompt starts a new one.
+        /// </summary>
+        /// <param name="user">The user whose conversation is cleared.</param>
+        public Task Reset(User user)
+        {
+            return _redisCache.RemoveAgentConversation(user.WalletId.ToString());
+        }
+
+        /// <summary>
+        /// The most recent messages within the message and character limits; the newest message is always kept.
+        /// </summary>
+        private List<AgentMessage> Window(IEnumerable<AgentMessage> messages)
+        {
+            var window = messages.TakeLast(Math.Max(1, _options.HistoryMessages)).ToList();
+            var characters = window.Sum(m => m.Content.Length);
+            while (window.Count > 1 && characters > _options.HistoryCharacters)
+            {
+                characters -= window[0].Content.Length;
+                window.RemoveAt(0);
+            }
+            return window;
+        }
+
+        /// <summary>
+        /// Lower-cases the prompt, collapses whitespace and drops trailing punctuation, so
+        /// "What is Bitcoin?" and "what is  bitcoin" are the same question.
+        /// </summary>
+        internal static string NormalizePrompt(string prompt)
+        {
+            var words = prompt.ToLowerInvariant().Split((char[]?)null, StringSplitOptions.RemoveEmptyEntries);
+            return string.Join(' ', words).TrimEnd('?', '!', '.', ' ');
+        }
+
+        private string PromptKey(string prompt)
+        {
+            var hash = SHA256.HashData(Encoding.UTF8.GetBytes(NormalizePrompt(prompt)));
+            return $"{_upstreams.OllamaModel}:{Convert.ToHexString(hash)[..32]}";
+        }
+    }
+
+    /// <summary>
+    /// A prompt together with the conversation it continues.
+    /// </summary>
+    /// <param name="WalletId">The wallet ID of the user who sent the prompt.</param>
+    /// <param name="Text">The prompt text.</param>
+    /// <param name="Conversation">The user's conversation before this prompt.</param>
+    /// <param name="CacheKey">The answer cache key, set for opening prompts only.</param>
+    /// <param name="CachedAnswer">The cached answer, if there was one.</param>
+    public record AgentPrompt(Guid WalletId, string Text, AgentConversation Conversation, string? CacheKey, string? CachedAnswer);
+}
@@ -0,0 +1,157 @@
+﻿using ApiGateway.Models.Entities;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// In-memory index of the active price alerts. Per currency, the price levels of the alerts are kept
+    /// in two sorted lists, one for levels that fire when the price rises to them and one for levels that
+    /// fire when it falls to them. Matching a price is then a binary search per list, and the fired alerts
+    /// are a contiguous range of each, so a pass touches only the alerts that fire however many are registered.
+    /// Not thread-safe; <see cref="AlertEngine"/> serializes access.
+    /// </summary>
+    public class AlertBook
+    {
+        /// <summary>
+        /// A price level of an alert; ties are ordered by the alert ID so every level has one position.
+        /// </summary>
+        private readonly record struct Level(decimal Price, Guid AlertId) : IComparable<Level>
+        {
+            public int CompareTo(Level other)
+            {
+                var byPrice = Price.CompareTo(other.Price);
+                return byPrice != 0 ? byPrice : AlertId.CompareTo(other.AlertId);
+            }
+        }
+
+        private sealed class CurrencyLevels
+        {
+            public readonly List<Level> Rising = [];
+            public readonly List<Level> Falling = [];
+        }
+
+        private readonly Dictionary<Guid, PriceAlert> _alerts = new();
+        private readonly Dictionary<int, CurrencyLevels> _byCurrency = new();
+
+        /// <summary>
+        /// The number of active alerts.
+        /// </summary>
+        public int Count => _alerts.Count;
+
+        /// <summary>
+        /// The currencies with active alerts.
+        /// </summary>
+        public IEnumerable<int> Currencies => _byCurrency.Keys;
+
+        /// <summary>
+        /// Adds an active alert; an alert that is already indexed is ignored.
+        /// </summary>
+        /// <param name="alert">The alert to index.</param>
+        public void Add(PriceAlert alert)
+        {
+            if (!_alerts.TryAdd(alert.Id, alert))
+                return;
+
+            if (!_byCurrency.TryGetValue(alert.CryptoId, out var levels))
+                _byCurrency[alert.CryptoId] = levels = new CurrencyLevels();
+
+            if (alert.RisingLevel is { } rising)
+                Insert(levels.Rising, new Level(rising, alert.Id));
+            if (alert.FallingLevel is { } falling)
+                Insert(levels.Falling, new Level(falling, alert.Id));
+        }
+
+        /// <summary>
+        /// Removes an alert from the index.
+        /// </summary>
+        /// <param name="alertId">The ID of the alert.</param>
+        /// <returns>Whether the alert was indexed.</returns>
+        public bool Remove(Guid alertId)
+        {
+            if (!_alerts.Remove(alertId, out var alert))
+                return false;
+
+            var levels = _byCurrency[alert.CryptoId];
+            if (alert.RisingLevel is { } rising)
+                Delete(levels.Rising, new Level(rising, alert.Id));
+            if (alert.FallingLevel is { } falling)
+                Delete(levels.Falling, new Level(falling, alert.Id));
+
+            if (levels.Rising.Count == 0 && levels.Falling.Count == 0)
+                _byCurrency.Remove(alert.CryptoId);
+            return true;
+        }
+
+        /// <summary>
+        /// Removes and returns the alerts of a currency that the given price fires: rising levels at or
+        /// below it and falling levels at or above it.
+        /// </summary>
+        /// <param name="cryptoId">The Coinlore ID of the cryptocurrency.</param>
+        /// <param name="price">The current price in USD.</param>
+        /// <returns>The fired alerts, in no particular order.</returns>
+        public List<PriceAlert> Match(int cryptoId, decimal price)
+        {
+            var fired = new List<PriceAlert>();
+            if (!_byCurrency.TryGetValue(cryptoId, out var levels))
+                return fired;
+
+            // Rising levels up to the price form a prefix, falling levels from the price a suffix
+            var risingEnd = FirstAbove(levels.Rising, price, inclusive: false);
+            var fallingStart = FirstAbove(levels.Falling, price, inclusive: true);
+            var firedIds = levels.Rising.Take(risingEnd)
+                .Concat(levels.Falling.Skip(fallingStart))
+                .Select(l => l.AlertId)
+                .ToList();
+            levels.Rising.RemoveRange(0, risingEnd);
+            levels.Falling.RemoveRange(fallingStart, levels.Falling.Count - fallingStart);
+
+            foreach (var alertId in firedIds)
+            {
+                if (!_alerts.Remove(alertId, out var alert))
+                    continue;
+                fired.Add(alert);
+
+                // Move alerts also have a level on the side that did not fire
+                if (alert.RisingLevel is { } rising)
+                    Delete(levels.Rising, new Level(rising, alert.Id));
+                if (alert.FallingLevel is { } falling)
+                    Delete(levels.Falling, new Level(falling, alert.Id));
+            }
+
+            if (levels.Rising.Count == 0 && levels.Falling.Count == 0)
+                _byCurrency.Remove(cryptoId);
+            return fired;
+        }
+
+        private static void Insert(List<Level> levels, Level level)
+        {
+            var index = levels.BinarySearch(level);
+            levels.Insert(index < 0 ? ~index : index, level);
+        }
+
+        private static void Delete(List<Level> levels, Level level)
+        {
+            var index = levels.BinarySearch(level);
+            if (index >= 0)
+                levels.RemoveAt(index);
+        }
+
+        /// <summary>
+        /// Returns the index of the first level above <paramref name="price"/>, or at it when
+        /// <paramref name="inclusive"/> is set; the count of levels if there is none.
+        /// </summary>
+        private static int FirstAbove(List<Level> levels, decimal price, bool inclusive)
+        {
+            int low = 0, high = levels.Count;
+            while (low < high)
+            {
+                var middle = (low + high) / 2;
+                var isAbove = inclusive ? levels[middle].Price >= price : levels[middle].Price > price;
+                if (isAbove)
+                    high = middle;
+                else
+                    low = middle + 1;
+            }
+            return low;
+        }
+    }
+}
@@ -0,0 +1,299 @@
+﻿using System.Diagnostics;
+using System.Text.Json;
+using System.Threading.Channels;
+using ApiGateway.Models.Entities;
+using Microsoft.EntityFrameworkCore;
+using Microsoft.Extensions.Options;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Evaluates every active <see cref="PriceAlert"/> in one pass per tick against the shared ticker list,
+    /// marks the fired alerts in the database and pushes them to the streams their owners have open
+    /// (see <see cref="Subscribe"/>). The active alerts are indexed in an <see cref="AlertBook"/>, loaded
+    /// from the database on start and kept in sync by the Alerts endpoints.
+    /// Registered as a singleton and as a hosted service.
+    /// </summary>
+    public class AlertEngine : BackgroundService
+    {
+        /// <summary>
+        /// Fired alerts buffered per stream for a slow reader; older ones are dropped beyond it.
+        /// </summary>
+        private const int StreamCapacity = 64;
+
+        private readonly object _lock = new();
+        private readonly AlertBook _book = new();
+        private readonly Dictionary<Guid, List<Channel<PriceAlert>>> _streams = new();
+        private readonly IServiceScopeFactory _scopeFactory;
+        private readonly MarketDataService _marketData;
+        private readonly GatewayMetrics _metrics;
+        private readonly ILogger<AlertEngine> _logger;
+        private readonly TimeSpan _interval;
+        private bool _loaded;
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="AlertEngine"/> class.
+        /// </summary>
+        /// <param name="scopeFactory">Creates the scope of the <see cref="CryptoDbContext"/> used by each pass.</param>
+        /// <param name="marketData">Shared, cached source of tickers.</param>
+        /// <param name="options">Provides the evaluation interval.</param>
+        /// <param name="metrics">Records evaluation passes.</param>
+        /// <param name="logger">Logger of loading and evaluation failures.</param>
+        public AlertEngine(IServiceScopeFactory scopeFactory, MarketDataService marketData, IOptions<AlertOptions> options,
+            GatewayMetrics metrics, ILogger<AlertEngine> logger)
+        {
+            _scopeFactory = scopeFactory;
+            _marketData = marketData;
+            _metrics = metrics;
+            _logger = logger;
+            _interval = TimeSpan.FromSeconds(Math.Max(1, options.Value.IntervalSeconds));
+        }
+
+        /// <summary>
+        /// Starts evaluating a newly registered alert.
+        /// </summary>
+        /// <param name="alert">The saved, active alert.</param>
+        public void Add(PriceAlert alert)
+        {
+            lock (_lock)
+                _book.Add(alert);
+        }
+
+        /// <summary>
+        /// Stops evaluating a deleted alert.
+        /// </summary>
+        /// <param name="alertId">The ID of the alert.</param>
+        public void Remove(Guid alertId)
+        {
+            lock (_lock)
+                _book.Remove(alertId);
+        }
+
+        /// <summary>
+        /// Opens a stream of the alerts of a user that fire from now on. The subscription must be
+        /// disposed when the client disconnects.
+        /// </summary>
+        /// <param name="walletId">The wallet ID of the user.</param>
+        public AlertSubscription Subscribe(Guid walletId)
+        {
+            var channel = Channel.CreateBounded<PriceAlert>(new BoundedChannelOptions(StreamCapacity)
+            {
+                FullMode = BoundedChannelFullMode.DropOldest,
+                SingleReader = true
+            });
+
+            lock (_lock)
+            {
+                if (!_streams.TryGetValue(walletId, out var channels))
+                    _streams[walletId] = channels = [];
+                channels.Add(channel);
+            }
+            return new AlertSubscription(this, walletId, channel);
+        }
+
+        /// <summary>
+        /// Closes a stream opened by <see cref="Subscribe"/>.
+        /// </summary>
+        internal void Unsubscribe(Guid walletId, Channel<PriceAlert> channel)
+        {
+            lock (_lock)
+            {
+                if (!_streams.TryGetValue(walletId, out var channels))
+                    return;
+                channels.Remove(channel);
+                if (channels.Count == 0)
+                    _streams.Remove(walletId);
+            }
+            channel.Writer.TryComplete();
+        }
+
+        /// <inheritdoc />
+        protected override async Task ExecuteAsync(CancellationToken stoppingToken)
+        {
+            using var timer = new PeriodicTimer(_interval);
+            do
+            {
+                try
+                {
+                    if (!_loaded)
+                        await Load(stoppingToken);
+                    await Evaluate(stoppingToken);
+                }
+                catch (Exception ex) when (ex is not OperationCanceledException)
+                {
+                    // An upstream or database outage skips the pass; the alerts stay active for the next one
+                    _logger.LogWarning(ex, "Failed to evaluate price alerts");
+                }
+            } while (await timer.WaitForNextTickAsync(stoppingToken));
+        }
+
+        /// <summary>
+        /// Indexes the active alerts stored in the database.
+        /// </summary>
+        private async Task Load(CancellationToken cancellationToken)
+        {
+            using var scope = _scopeFactory.CreateScope();
+            var db = scope.ServiceProvider.GetRequiredService<CryptoDbContext>();
+
+            var active = await db.PriceAlerts
+                .AsNoTracking()
+                .Where(a => a.TriggeredAt == null)
+                .ToListAsync(cancellationToken);
+
+            lock (_lock)
+            {
+                foreach (var alert in active)
+                    _book.Add(alert);
+            }
+            _loaded = true;
+            _logger.LogInformation("Loaded {Count} active price alerts", active.Count);
+        }
+
+        /// <summary>
+        /// Matches the current price of every currency with alerts, then stores and pushes the fired ones.
+        /// </summary>
+        private async Task Evaluate(CancellationToken cancellationToken)
+        {
+            lock (_lock)
+            {
+                // Without alerts there is nothing to fetch prices for
+                if (_book.Count == 0)
+                    return;
+            }
+
+            // The same cached entry as the Quotes endpoint, so passes add no upstream calls while clients poll
+            var tickers = await _marketData.GetTickers(SupportedCurrencies.Ids);
+            var quotes = JsonSerializer.Deserialize<List<Dictionary<string, object>>>(tickers.Content) ?? [];
+
+            var started = Stopwatch.GetTimestamp();
+            var fired = new List<PriceAlert>();
+            // Whole milliseconds, the precision clients resume the stream from (see AlertsController.StreamAlerts)
+            var now = DateTime.UtcNow;
+            now = now.AddTicks(-(now.Ticks % TimeSpan.TicksPerMillisecond));
+            lock (_lock)
+            {
+                foreach (var quote in quotes.Select(CurrencyQuote.FromTicker))
+                {
+                    // FromTicker reads a missing or malformed price as 0, which would fire every falling level
+                    if (quote.PriceUsd <= 0)
+                    {
+                        _logger.LogWarning("Skipped alerts of {CryptoId}: the ticker has no valid price", quote.Id);
+                        continue;
+                    }
+
+                    foreach (var alert in _book.Match(quote.Id, quote.PriceUsd))
+                    {
+                        alert.TriggeredAt = now;
+                        alert.TriggeredPrice = quote.PriceUsd;
+                        fired.Add(alert);
+                    }
+                }
+            }
+            _metrics.AlertPass(fired.Count > 0, Stopwatch.GetElapsedTime(started));
+
+            if (fired.Count == 0)
+                return;
+
+            HashSet<Guid> stored;
+            try
+            {
+                stored = await Store(fired, now, cancellationToken);
+            }
+            catch
+            {
+                // Not stored means not fired: the next pass tries again
+                lock (_lock)
+                {
+                    foreach (var alert in fired)
+                    {
+                        alert.TriggeredAt = null;
+                        alert.TriggeredPrice = null;
+                        _book.Add(alert);
+                    }
+                }
+                throw;
+            }
+
+            // Alerts deleted since they were matched are gone, not fired
+            fired.RemoveAll(a => !stored.Contains(a.Id));
+            // The alerts of one pass share TriggeredAt, so streams send them in ID order and
+            // a client resumes after the last one it received (see AlertsController.StreamAlerts)
+            fired.Sort((x, y) => x.Id.CompareTo(y.Id));
+
+            _metrics.AlertsFired(fired.Count);
+            lock (_lock)
+            {
+                foreach (var alert in fired)
+                {
+                    if (!_streams.TryGetValue(alert.WalletId, out var channels))
+                        continue;
+                    foreach (var channel in channels)
+                        channel.Writer.TryWrite(alert);
+                }
+            }
+        }
+
+        /// <summary>
+        /// Marks fired alerts as triggered in one transaction, with one update per currency and price.
+        /// </summary>
+        /// <param name="fired">The fired alerts.</param>
+        /// <param name="triggeredAt">The time of the pass, which every fired alert carries.</param>
+        /// <param name="cancellationToken">Cancels the updates.</param>
+        /// <returns>The IDs of the alerts that were stored; deleted alerts are missing.</returns>
+        private async Task<HashSet<Guid>> Store(List<PriceAlert> fired, DateTime triggeredAt, CancellationToken cancellationToken)
+        {
+            using var scope = _scopeFactory.CreateScope();
+            var db = scope.ServiceProvider.GetRequiredService<CryptoDbContext>();
+            await using var dbTransaction = await db.Database.BeginTransactionAsync(cancellationToken);
+
+            var updated = 0;
+            foreach (var group in fired.GroupBy(a => (a.TriggeredPrice, a.TriggeredAt)))
+            {
+                var groupIds = group.Select(a => a.Id).ToList();
+                updated += await db.PriceAlerts
+                    .Where(a => groupIds.Contains(a.Id) && a.TriggeredAt == null)
+                    .ExecuteUpdateAsync(s => s
+                        .SetProperty(a => a.TriggeredAt, group.Key.TriggeredAt)
+                        .SetProperty(a => a.TriggeredPrice, group.Key.TriggeredPrice), cancellationToken);
+            }
+
+            var ids = fired.Select(a => a.Id).ToList();
+            // Every alert updates at most one row, so only a shortfall needs to find out which are missing
+            var stored = updated == fired.Count
+                ? ids.ToHashSet()
+                : (await db.PriceAlerts
+                    .Where(a => ids.Contains(a.Id) && a.TriggeredAt == triggeredAt)
+                    .Select(a => a.Id)
+                    .ToListAsync(cancellationToken)).ToHashSet();
+
+            await dbTransaction.CommitAsync(cancellationToken);
+            return stored;
+        }
+    }
+
+    /// <summary>
+    /// A stream of the fired alerts of one user, opened by <see cref="AlertEngine.Subscribe"/>.
+    /// Disposing it closes the stream.
+    /// </summary>
+    public sealed class AlertSubscription : IDisposable
+    {
+        private readonly AlertEngine _engine;
+        private readonly Guid _walletId;
+        private readonly Channel<PriceAlert> _channel;
+
+        internal AlertSubscription(AlertEngine engine, Guid walletId, Channel<PriceAlert> channel)
+        {
+            _engine = engine;
+            _walletId = walletId;
+            _channel = channel;
+        }
+
+        /// <summary>
+        /// The alerts as they fire.
+        /// </summary>
+        public ChannelReader<PriceAlert> Alerts => _channel.Reader;
+
+        /// <inheritdoc />
+        public void Dispose() => _engine.Unsubscribe(_walletId, _channel);
+    }
+}
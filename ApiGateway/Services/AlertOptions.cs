@@ -0,0 +1,19 @@
+﻿namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Evaluation and per-user limits of price alerts, bound from the "Alerts" section of appsettings.json.
+    /// </summary>
+    public class AlertOptions
+    {
+        /// <summary>
+        /// Seconds between evaluation passes. Passes read the shared, cached ticker list, so a pass
+        /// reaches Coinlore at most once however many alerts are registered.
+        /// </summary>
+        public int IntervalSeconds { get; set; } = 15;
+
+        /// <summary>
+        /// Active alerts one user may have at the same time.
+        /// </summary>
+        public int MaxAlertsPerUser { get; set; } = 50;
+    }
+}
@@ -0,0 +1,64 @@
+﻿using ApiGateway.Models.Entities;
+using Microsoft.AspNetCore.Mvc;
+using Microsoft.AspNetCore.Mvc.Filters;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Action filter that authenticates the X-Api-Key header with <see cref="ApiKeyAuthenticator"/>
+    /// before any action of the controller runs, and makes the user available through
+    /// <see cref="ApiKeyAuthFilterExtensions.GetApiUser"/>. Apply it with
+    /// <c>[ServiceFilter(typeof(ApiKeyAuthFilter))]</c>.
+    /// </summary>
+    public class ApiKeyAuthFilter : IAsyncActionFilter
+    {
+        internal const string UserItemKey = "ApiUser";
+
+        private readonly ApiKeyAuthenticator _authenticator;
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="ApiKeyAuthFilter"/> class.
+        /// </summary>
+        /// <param name="authenticator">Resolves API keys to users.</param>
+        public ApiKeyAuthFilter(ApiKeyAuthenticator authenticator)
+        {
+            _authenticator = authenticator;
+        }
+
+        /// <summary>
+        /// Short-circuits with 401 Unauthorized unless the request carries a valid API key.
+        /// </summary>
+        /// <param name="context">The action context.</param>
+        /// <param name="next">Runs the action.</param>
+        public async Task OnActionExecutionAsync(ActionExecutingContext context, ActionExecutionDelegate next)
+        {
+            var user = await _authenticator.Authenticate(context.HttpContext.Request.Headers["X-Api-Key"]);
+            if (user == null)
+            {
+                context.Result = new UnauthorizedObjectResult("Invalid or missing API key: X-Api-Key=YOUR-API-KEY");
+                return;
+            }
+
+            context.HttpContext.Items[UserItemKey] = user;
+            await next();
+        }
+    }
+
+    /// <summary>
+    /// Access to the user authenticated by <see cref="ApiKeyAuthFilter"/>.
+    /// </summary>
+    public static class ApiKeyAuthFilterExtensions
+    {
+        /// <summary>
+        /// Gets the user whose API key authenticated the current request.
+        /// </summary>
+        /// <param name="httpContext">The current request.</param>
+        /// <returns>The authenticated <see cref="User"/>.</returns>
+        /// <exception cref="InvalidOperationException">Thrown when the action is not protected by <see cref="ApiKeyAuthFilter"/>.</exception>
+        public static User GetApiUser(this HttpContext httpContext)
+        {
+            return httpContext.Items[ApiKeyAuthFilter.UserItemKey] as User
+                ?? throw new InvalidOperationException("The action is not protected by ApiKeyAuthFilter.");
+        }
+    }
+}
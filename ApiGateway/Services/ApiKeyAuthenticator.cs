@@ -0,0 +1,89 @@
+﻿using ApiGateway.Models.Entities;
+using Microsoft.EntityFrameworkCore;
+using Microsoft.Extensions.Caching.Memory;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Resolves API keys to users for every authenticated endpoint. Malformed keys are rejected
+    /// without any I/O; validated keys are kept in a bounded in-process cache for a few seconds in
+    /// front of Redis, which in turn is in front of MySQL, so most requests authenticate with a
+    /// dictionary lookup. Registered as a singleton.
+    /// </summary>
+    public class ApiKeyAuthenticator
+    {
+        private const int MaxCachedKeys = 10_000;
+        private static readonly TimeSpan LocalCacheFor = TimeSpan.FromSeconds(30);
+
+        private readonly RedisCacheContext _redisCache;
+        private readonly IServiceScopeFactory _scopeFactory;
+        private readonly GatewayMetrics _metrics;
+        private readonly ILogger<ApiKeyAuthenticator> _logger;
+        private readonly MemoryCache _validatedKeys = new(new MemoryCacheOptions { SizeLimit = MaxCachedKeys });
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="ApiKeyAuthenticator"/> class.
+        /// </summary>
+        /// <param name="redisCache">Redis database context holding logged-in users.</param>
+        /// <param name="scopeFactory">Creates the scopes that <see cref="CryptoDbContext"/> is resolved from on a Redis miss.</param>
+        /// <param name="metrics">Records the auth stage and in-process cache hits.</param>
+        /// <param name="logger">Logger of the DB fallback.</param>
+        public ApiKeyAuthenticator(RedisCacheContext redisCache, IServiceScopeFactory scopeFactory, GatewayMetrics metrics,
+            ILogger<ApiKeyAuthenticator> logger)
+        {
+            _redisCache = redisCache;
+            _scopeFactory = scopeFactory;
+            _metrics = metrics;
+            _logger = logger;
+        }
+
+        /// <summary>
+        /// Looks up the user an API key belongs to.
+        /// </summary>
+        /// <param name="apiKey">The value of the X-Api-Key header.</param>
+        /// <returns>The <see cref="User"/> if the key is valid; otherwise null.</returns>
+        public async Task<User?> Authenticate(string? apiKey)
+        {
+            using var stage = _metrics.Stage(GatewayStage.Auth);
+            if (!Guid.TryParse(apiKey, out var key))
+                return null;
+
+            var cached = _validatedKeys.TryGetValue(key, out User? user);
+            _metrics.CacheLookup("auth", cached);
+            if (cached)
+                return user;
+
+            user = await _redisCache.GetUserByApiKey(key.ToString());
+            if (user == null)
+            {
+                using var scope = _scopeFactory.CreateScope();
+                var db = scope.ServiceProvider.GetRequiredService<CryptoDbContext>();
+
+                _logger.LogDebug("Fetching user from MySQL");
+                user = await db.Users.AsNoTracking().FirstOrDefaultAsync(u => u.ApiKey == key);
+                if (user == null)
+                    return null;
+
+                await _redisCache.SetUserByApiKey(key.ToString(), user);
+            }
+
+            _validatedKeys.Set(key, user, new MemoryCacheEntryOptions
+            {
+                AbsoluteExpirationRelativeToNow = LocalCacheFor,
+                Size = 1
+            });
+            return user;
+        }
+
+        /// <summary>
+        /// Forgets an API key in this process and in Redis, e.g. on logout or account deletion.
+        /// Other gateway instances may keep accepting it until their local entry expires.
+        /// </summary>
+        /// <param name="apiKey">The API key to forget.</param>
+        public async Task Invalidate(Guid apiKey)
+        {
+            _validatedKeys.Remove(apiKey);
+            await _redisCache.Remove(apiKey.ToString());
+        }
+    }
+}
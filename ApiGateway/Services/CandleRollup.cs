@@ -0,0 +1,104 @@
+﻿using ApiGateway.Models.Entities;
+using Microsoft.EntityFrameworkCore;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Maintains the <see cref="PriceCandle"/> rollups of <c>PriceHistories</c>. Points are folded into the
+    /// candles of every resolution as they are collected, so charts read one row per bucket instead of
+    /// aggregating raw points per request.
+    /// </summary>
+    public static class CandleRollup
+    {
+        /// <summary>
+        /// The maintained resolutions by the code clients pass to the Candles endpoint.
+        /// </summary>
+        public static readonly IReadOnlyDictionary<string, CandleResolution> Resolutions =
+            new Dictionary<string, CandleResolution>
+            {
+                ["1m"] = CandleResolution.OneMinute,
+                ["5m"] = CandleResolution.FiveMinutes,
+                ["1h"] = CandleResolution.OneHour,
+                ["1d"] = CandleResolution.OneDay
+            };
+
+        /// <summary>
+        /// Picks the resolution that draws a range with a few hundred candles at most. Collected points are
+        /// five minutes apart, so finer candles would hold a single point each.
+        /// </summary>
+        /// <param name="range">The length of the charted range.</param>
+        public static CandleResolution ForRange(TimeSpan range) =>
+            range <= TimeSpan.FromDays(30) ? CandleResolution.OneHour : CandleResolution.OneDay;
+
+        /// <summary>
+        /// Returns the start of the bucket of the given resolution that contains <paramref name="timestamp"/>.
+        /// </summary>
+        /// <param name="timestamp">A UTC time.</param>
+        /// <param name="resolution">The width of the buckets.</param>
+        public static DateTime BucketStart(DateTime timestamp, CandleResolution resolution)
+        {
+            var seconds = new DateTimeOffset(timestamp, TimeSpan.Zero).ToUnixTimeSeconds();
+            return DateTimeOffset.FromUnixTimeSeconds(seconds - seconds % (int)resolution).UtcDateTime;
+        }
+
+        /// <summary>
+        /// Folds new price points into the candles of every resolution: existing candles have their high,
+        /// low, close and point count updated and missing ones are added. Nothing is saved, so the candles
+        /// are committed by the same <c>SaveChangesAsync</c> as the points themselves.
+        /// </summary>
+        /// <param name="db">The context tracking the inserted points.</param>
+        /// <param name="cryptoId">The Coinlore ID of the cryptocurrency.</param>
+        /// <param name="points">
+        /// The points, oldest first and all newer than the points already rolled up, which is what
+        /// makes the first point of a new candle its open and the last one its close.
+        /// </param>
+        /// <param name="cancellationToken">Cancels the lookup of the existing candles.</param>
+        public static async Task Apply(CryptoDbContext db, int cryptoId,
+            IReadOnlyList<(DateTime Timestamp, decimal Price)> points, CancellationToken cancellationToken)
+        {
+            if (points.Count == 0)
+                return;
+
+            foreach (var resolution in Resolutions.Values)
+            {
+                var buckets = points.GroupBy(p => BucketStart(p.Timestamp, resolution)).ToList();
+                var first = buckets[0].Key;
+                var last = buckets[^1].Key;
+
+                // Only the bucket of the oldest point can already exist, but the range costs one seek either way
+                var existing = await db.PriceCandles
+                    .Where(c => c.CryptoId == cryptoId && c.Resolution == resolution
+                                && c.OpenTime >= first && c.OpenTime <= last)
+                    .ToDictionaryAsync(c => c.OpenTime, cancellationToken);
+
+                foreach (var bucket in buckets)
+                {
+                    var high = bucket.Max(p => p.Price);
+                    var low = bucket.Min(p => p.Price);
+                    var close = bucket.Last().Price;
+
+                    if (existing.TryGetValue(bucket.Key, out var candle))
+                    {
+                        candle.High = Math.Max(candle.High, high);
+                        candle.Low = Math.Min(candle.Low, low);
+                        candle.Close = close;
+                        candle.Points += bucket.Count();
+                        continue;
+                    }
+
+                    db.PriceCandles.Add(new PriceCandle
+                    {
+                        CryptoId = cryptoId,
+                        Resolution = resolution,
+                        OpenTime = bucket.Key,
+                        Open = bucket.First().Price,
+                        High = high,
+                        Low = low,
+                        Close = close,
+                        Points = bucket.Count()
+                    });
+                }
+            }
+        }
+    }
+}
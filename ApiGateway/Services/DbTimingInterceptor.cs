@@ -0,0 +1,82 @@
+﻿using System.Data.Common;
+using Microsoft.EntityFrameworkCore.Diagnostics;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Adds the execution time of every SQL command to the <see cref="GatewayStage.Db"/> stage
+    /// of the current request.
+    /// </summary>
+    public class DbTimingInterceptor : DbCommandInterceptor
+    {
+        private readonly GatewayMetrics _metrics;
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="DbTimingInterceptor"/> class.
+        /// </summary>
+        /// <param name="metrics">The metrics the command times are recorded in.</param>
+        public DbTimingInterceptor(GatewayMetrics metrics)
+        {
+            _metrics = metrics;
+        }
+
+        /// <inheritdoc />
+        public override DbDataReader ReaderExecuted(DbCommand command, CommandExecutedEventData eventData, DbDataReader result)
+        {
+            _metrics.RecordStage(GatewayStage.Db, eventData.Duration);
+            return result;
+        }
+
+        /// <inheritdoc />
+        public override ValueTask<DbDataReader> ReaderExecutedAsync(DbCommand command, CommandExecutedEventData eventData,
+            DbDataReader result, CancellationToken cancellationToken = default)
+        {
+            _metrics.RecordStage(GatewayStage.Db, eventData.Duration);
+            return ValueTask.FromResult(result);
+        }
+
+        /// <inheritdoc />
+        public override int NonQueryExecuted(DbCommand command, CommandExecutedEventData eventData, int result)
+        {
+            _metrics.RecordStage(GatewayStage.Db, eventData.Duration);
+            return result;
+        }
+
+        /// <inheritdoc />
+        public override ValueTask<int> NonQueryExecutedAsync(DbCommand command, CommandExecutedEventData eventData,
+            int result, CancellationToken cancellationToken = default)
+        {
+            _metrics.RecordStage(GatewayStage.Db, eventData.Duration);
+            return ValueTask.FromResult(result);
+        }
+
+        /// <inheritdoc />
+        public override object? ScalarExecuted(DbCommand command, CommandExecutedEventData eventData, object? result)
+        {
+            _metrics.RecordStage(GatewayStage.Db, eventData.Duration);
+            return result;
+        }
+
+        /// <inheritdoc />
+        public override ValueTask<object?> ScalarExecutedAsync(DbCommand command, CommandExecutedEventData eventData,
+            object? result, CancellationToken cancellationToken = default)
+        {
+            _metrics.RecordStage(GatewayStage.Db, eventData.Duration);
+            return ValueTask.FromResult(result);
+        }
+
+        /// <inheritdoc />
+        public override void CommandFailed(DbCommand command, CommandErrorEventData eventData)
+        {
+            _metrics.RecordStage(GatewayStage.Db, eventData.Duration);
+        }
+
+        /// <inheritdoc />
+        public override Task CommandFailedAsync(DbCommand command, CommandErrorEventData eventData,
+            CancellationToken cancellationToken = default)
+        {
+            _metrics.RecordStage(GatewayStage.Db, eventData.Duration);
+            return Task.CompletedTask;
+        }
+    }
+}
@@ -0,0 +1,324 @@
+﻿using System.Collections.Concurrent;
+using System.Diagnostics;
+using System.Globalization;
+using System.Text;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Parts of a request whose time is measured separately.
+    /// </summary>
+    public enum GatewayStage
+    {
+        /// <summary>API-key validation, excluding the cache and DB lookups it makes.</summary>
+        Auth,
+        /// <summary>Redis reads and writes, including (de)serializing the entries.</summary>
+        Cache,
+        /// <summary>SQL commands.</summary>
+        Db,
+        /// <summary>Coinlore, CoinGecko and Ollama calls, up to the response headers.</summary>
+        Upstream,
+        /// <summary>Writing the action result, i.e. serializing the response body.</summary>
+        Serialization
+    }
+
+    /// <summary>
+    /// In-process request, stage, cache and upstream metrics, exported in the Prometheus text
+    /// format on <c>/metrics</c>. Recording is lock-free apart from one short lock per histogram
+    /// observation, so it can sit on every hot path. Registered as a singleton.
+    /// </summary>
+    public class GatewayMetrics
+    {
+        /// <summary>
+        /// Histogram bucket upper bounds in seconds, from half a millisecond to half a minute.
+        /// </summary>
+        private static readonly double[] Buckets = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30];
+
+        private static readonly AsyncLocal<RequestStages?> CurrentRequest = new();
+        private static readonly AsyncLocal<StageFrame?> CurrentStage = new();
+
+        private readonly ConcurrentDictionary<(string Route, string Method, string Status), Histogram> _requests = new();
+        private readonly ConcurrentDictionary<(string Route, string Stage), Histogram> _stages = new();
+        private readonly ConcurrentDictionary<(string Upstream, string Outcome), Histogram> _upstreams = new();
+        private readonly ConcurrentDictionary<(string Family, string Result), Counter> _cacheLookups = new();
+        private readonly ConcurrentDictionary<string, Histogram> _agentQueue = new();
+        private readonly ConcurrentDictionary<string, Histogram> _alertPasses = new();
+        private readonly Counter _alertsFired = new();
+
+        /// <summary>
+        /// Starts collecting the stage times of the request running on the current async flow.
+        /// </summary>
+        /// <returns>The per-request stage totals.</returns>
+        public RequestStages BeginRequest()
+        {
+            var stages = new RequestStages();
+            CurrentRequest.Value = stages;
+            return stages;
+        }
+
+        /// <summary>
+        /// Records a finished request: its duration, and how much of it each stage took.
+        /// Time not spent in any stage is recorded as the stage "other".
+        /// </summary>
+        /// <param name="stages">The totals returned by <see cref="BeginRequest"/>.</param>
+        /// <param name="route">The route template, e.g. <c>api/Transactions/Buy</c>.</param>
+        /// <param name="method">The HTTP method.</param>
+        /// <param name="status">The response status code.</param>
+        /// <param name="elapsed">The request duration.</param>
+        public void EndRequest(RequestStages stages, string route, string method, int status, TimeSpan elapsed)
+        {
+            _requests.GetOrAdd((route, method, status.ToString(CultureInfo.InvariantCulture)), _ => new Histogram())
+                .Observe(elapsed.TotalSeconds);
+
+            var accounted = TimeSpan.Zero;
+            foreach (var stage in Enum.GetValues<GatewayStage>())
+            {
+                var time = stages.Get(stage);
+                if (time <= TimeSpan.Zero)
+                    continue;
+                accounted += time;
+                _stages.GetOrAdd((route, StageLabel(stage)), _ => new Histogram()).Observe(time.TotalSeconds);
+            }
+            _stages.GetOrAdd((route, "other"), _ => new Histogram())
+                .Observe(Math.Max(0, (elapsed - accounted).TotalSeconds));
+        }
+
+        /// <summary>
+        /// Measures the enclosed code as <paramref name="stage"/> of the current request. Nested stages
+        /// are exclusive: time spent in an inner stage is not also counted for the outer one.
+        /// </summary>
+        /// <param name="stage">The stage being entered.</param>
+        /// <returns>A scope that records the time when disposed.</returns>
+        public StageScope Stage(GatewayStage stage)
+        {
+            var frame = new StageFrame(stage, CurrentStage.Value);
+            CurrentStage.Value = frame;
+            return new StageScope(this, frame, Stopwatch.GetTimestamp());
+        }
+
+        /// <summary>
+        /// Adds time measured elsewhere (e.g. by EF Core) to a stage of the current request.
+        /// </summary>
+        /// <param name="stage">The stage the time belongs to.</param>
+        /// <param name="elapsed">The measured time.</param>
+        public void RecordStage(GatewayStage stage, TimeSpan elapsed)
+        {
+            var request = CurrentRequest.Value;
+            if (request == null)
+                return;
+
+            request.Add(stage, elapsed);
+            if (CurrentStage.Value is { } parent)
+                request.Add(parent.Stage, -elapsed);
+        }
+
+        /// <summary>
+        /// Counts a cache lookup.
+        /// </summary>
+        /// <param name="family">The kind of entry, e.g. <c>user</c>, <c>account</c> or <c>ticker</c>.</param>
+        /// <param name="hit">Whether the entry was found.</param>
+        public void CacheLookup(string family, bool hit)
+        {
+            _cacheLookups.GetOrAdd((family, hit ? "hit" : "miss"), _ => new Counter()).Increment();
+        }
+
+        /// <summary>
+        /// Records one upstream HTTP call.
+        /// </summary>
+        /// <param name="upstream">The upstream name, e.g. <c>Coinlore</c>.</param>
+        /// <param name="outcome">The status code, or <c>error</c> if no response arrived.</param>
+        /// <param name="elapsed">Time until the response headers arrived.</param>
+        public void UpstreamRequest(string upstream, string outcome, TimeSpan elapsed)
+        {
+            _upstreams.GetOrAdd((upstream, outcome), _ => new Histogram()).Observe(elapsed.TotalSeconds);
+        }
+
+        /// <summary>
+        /// Records how long an AI agent prompt waited for the model.
+        /// </summary>
+        /// <param name="outcome"><c>admitted</c>, <c>cancelled</c> while waiting, or <c>rejected</c> by a full queue.</param>
+        /// <param name="waited">Time spent in the queue.</param>
+        public void AgentQueueWait(string outcome, TimeSpan waited)
+        {
+            _agentQueue.GetOrAdd(outcome, _ => new Histogram()).Observe(waited.TotalSeconds);
+        }
+
+        /// <summary>
+        /// Records how long matching the current prices against every active price alert took.
+        /// </summary>
+        /// <param name="fired">Whether any alert fired.</param>
+        /// <param name="elapsed">Time spent matching, without fetching the prices.</param>
+        public void AlertPass(bool fired, TimeSpan elapsed)
+        {
+            _alertPasses.GetOrAdd(fired ? "fired" : "quiet", _ => new Histogram()).Observe(elapsed.TotalSeconds);
+        }
+
+        /// <summary>
+        /// Counts fired price alerts.
+        /// </summary>
+        /// <param name="count">The number of alerts fired by one pass.</param>
+        public void AlertsFired(int count)
+        {
+            _alertsFired.Add(count);
+        }
+
+        /// <summary>
+        /// Renders every metric in the Prometheus text exposition format.
+        /// </summary>
+        /// <returns>The metrics document.</returns>
+        public string Export()
+        {
+            var text = new StringBuilder();
+
+            WriteHistograms(text, "gateway_request_duration_seconds", "Time to handle a request.",
+                _requests.Select(r => ($"route=\"{Escape(r.Key.Route)}\",method=\"{r.Key.Method}\",status=\"{r.Key.Status}\"", r.Value)));
+            WriteHistograms(text, "gateway_request_stage_seconds", "Time a request spent in each stage.",
+                _stages.Select(s => ($"route=\"{Escape(s.Key.Route)}\",stage=\"{s.Key.Stage}\"", s.Value)));
+            WriteHistograms(text, "gateway_upstream_request_duration_seconds", "Time until an upstream answered.",
+                _upstreams.Select(u => ($"upstream=\"{Escape(u.Key.Upstream)}\",outcome=\"{u.Key.Outcome}\"", u.Value)));
+            WriteHistograms(text, "gateway_agent_queue_wait_seconds", "Time AI agent prompts waited for the model.",
+                _agentQueue.Select(a => ($"outcome=\"{a.Key}\"", a.Value)));
+            WriteHistograms(text, "gateway_alert_evaluation_seconds", "Time to match prices against the active price alerts.",
+                _alertPasses.Select(a => ($"result=\"{a.Key}\"", a.Value)));
+
+            text.Append("# HELP gateway_cache_lookups_total Cache lookups by entry family and result.\n");
+            text.Append("# TYPE gateway_cache_lookups_total counter\n");
+            foreach (var (key, counter) in _cacheLookups.OrderBy(c => c.Key))
+                text.Append($"gateway_cache_lookups_total{{family=\"{Escape(key.Family)}\",result=\"{key.Result}\"}} {counter.Value}\n");
+
+            text.Append("# HELP gateway_alerts_fired_total Price alerts fired.\n");
+            text.Append("# TYPE gateway_alerts_fired_total counter\n");
+            text.Append($"gateway_alerts_fired_total {_alertsFired.Value}\n");
+
+            return text.ToString();
+        }
+
+        private static void WriteHistograms(StringBuilder text, string name, string help, IEnumerable<(string Labels, Histogram Histogram)> series)
+        {
+            text.Append($"# HELP {name} {help}\n# TYPE {name} histogram\n");
+            foreach (var (labels, histogram) in series.OrderBy(s => s.Labels, StringComparer.Ordinal))
+            {
+                var (counts, sum, count) = histogram.Snapshot();
+                long cumulative = 0;
+                for (var i = 0; i < Buckets.Length; i++)
+                {
+                    cumulative += counts[i];
+                    text.Append($"{name}_bucket{{{labels},le=\"{Format(Buckets[i])}\"}} {cumulative}\n");
+                }
+                text.Append($"{name}_bucket{{{labels},le=\"+Inf\"}} {count}\n");
+                text.Append($"{name}_sum{{{labels}}} {Format(sum)}\n");
+                text.Append($"{name}_count{{{labels}}} {count}\n");
+            }
+        }
+
+        private static string StageLabel(GatewayStage stage) => stage.ToString().ToLowerInvariant();
+
+        private static string Format(double value) => value.ToString("G17", CultureInfo.InvariantCulture);
+
+        private static string Escape(string value) =>
+            value.Replace("\\", "\\\\").Replace("\"", "\\\"").Replace("\n", "\\n");
+
+        /// <summary>
+        /// Time spent per stage by one request; updated from any thread the request continues on.
+        /// </summary>
+        public class RequestStages
+        {
+            private readonly long[] _ticks = new long[Enum.GetValues<GatewayStage>().Length];
+
+            /// <summary>
+            /// Adds time to a stage.
+            /// </summary>
+            /// <param name="stage">The stage.</param>
+            /// <param name="elapsed">The time to add; negative to move time to a nested stage.</param>
+            public void Add(GatewayStage stage, TimeSpan elapsed) => Interlocked.Add(ref _ticks[(int)stage], elapsed.Ticks);
+
+            /// <summary>
+            /// Gets the total time of a stage so far.
+            /// </summary>
+            /// <param name="stage">The stage.</param>
+            /// <returns>The total time.</returns>
+            public TimeSpan Get(GatewayStage stage) => TimeSpan.FromTicks(Interlocked.Read(ref _ticks[(int)stage]));
+
+            /// <summary>
+            /// Renders the stage times as a <c>Server-Timing</c> header value, in milliseconds.
+            /// </summary>
+            /// <returns>The header value, e.g. <c>auth;dur=0.1, db;dur=3.2</c>.</returns>
+            public string ToServerTiming() => string.Join(", ", Enum.GetValues<GatewayStage>()
+                .Where(s => Get(s) > TimeSpan.Zero)
+                .Select(s => $"{StageLabel(s)};dur={Get(s).TotalMilliseconds.ToString("0.###", CultureInfo.InvariantCulture)}"));
+        }
+
+        /// <summary>
+        /// A stage entered on the current async flow, linked to the stage it was entered from.
+        /// </summary>
+        public record StageFrame(GatewayStage Stage, StageFrame? Parent);
+
+        /// <summary>
+        /// Measures a stage until disposed; see <see cref="Stage"/>.
+        /// </summary>
+        public readonly struct StageScope : IDisposable
+        {
+            private readonly GatewayMetrics _metrics;
+            private readonly StageFrame _frame;
+            private readonly long _started;
+
+            internal StageScope(GatewayMetrics metrics, StageFrame frame, long started)
+            {
+                _metrics = metrics;
+                _frame = frame;
+                _started = started;
+            }
+
+            /// <summary>
+            /// Records the time since the stage was entered and returns to the enclosing stage.
+            /// </summary>
+            public void Dispose()
+            {
+                CurrentStage.Value = _frame.Parent;
+                _metrics.RecordStage(_frame.Stage, Stopwatch.GetElapsedTime(_started));
+            }
+        }
+
+        private sealed class Counter
+        {
+            private long _value;
+
+            public long Value => Interlocked.Read(ref _value);
+
+            public void Increment() => Interlocked.Increment(ref _value);
+
+            public void Add(long amount) => Interlocked.Add(ref _value, amount);
+        }
+
+        private sealed class Histogram
+        {
+            private readonly object _lock = new();
+            private readonly long[] _counts = new long[Buckets.Length];
+            private double _sum;
+            private long _count;
+
+            public void Observe(double value)
+            {
+                var bucket = Array.BinarySearch(Buckets, value);
+                if (bucket < 0)
+                    bucket = ~bucket;
+
+                lock (_lock)
+                {
+                    if (bucket < Buckets.Length)
+                        _counts[bucket]++;
+                    _sum += value;
+                    _count++;
+                }
+            }
+
+            public (long[] Counts, double Sum, long Count) Snapshot()
+            {
+                lock (_lock)
+                {
+                    return ((long[])_counts.Clone(), _sum, _count);
+                }
+            }
+        }
+    }
+}
@@ -0,0 +1,155 @@
+﻿using System.Collections.Concurrent;
+using System.Text.Json;
+using ApiGateway.Models.Entities;
+using Polly;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Serves Coinlore tickers and CoinGecko charts through short-lived Redis entries.
+    /// Concurrent misses for the same key share a single upstream call, and stale entries are
+    /// returned immediately while one background refresh brings them up to date
+    /// (stale-while-revalidate), so upstream traffic does not grow with client concurrency.
+    /// Upstream calls go through the pooled, resilient clients of <see cref="UpstreamClients"/>.
+    /// Registered as a singleton.
+    /// </summary>
+    public class MarketDataService
+    {
+        private static readonly TimeSpan TickerFreshFor = TimeSpan.FromSeconds(10);
+        private static readonly TimeSpan ChartFreshFor = TimeSpan.FromSeconds(60);
+        private static readonly TimeSpan KeepFor = TimeSpan.FromMinutes(10);
+
+        private readonly RedisCacheContext _redisCache;
+        private readonly IHttpClientFactory _httpClientFactory;
+        private readonly ILogger<MarketDataService> _logger;
+        private readonly ConcurrentDictionary<string, Lazy<Task<MarketDataEntry>>> _inFlight = new();
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="MarketDataService"/> class.
+        /// </summary>
+        /// <param name="redisCache">Redis database context used to store market data entries.</param>
+        /// <param name="httpClientFactory">Factory of the named Coinlore and CoinGecko clients.</param>
+        /// <param name="logger">Logger of background refresh failures.</param>
+        public MarketDataService(RedisCacheContext redisCache, IHttpClientFactory httpClientFactory, ILogger<MarketDataService> logger)
+        {
+            _redisCache = redisCache;
+            _httpClientFactory = httpClientFactory;
+            _logger = logger;
+        }
+
+        /// <summary>
+        /// Gets the Coinlore ticker of a cryptocurrency.
+        /// </summary>
+        /// <param name="id">The Coinlore ID of the cryptocurrency.</param>
+        /// <param name="allowStale">
+        /// Whether an expired entry may be returned while it is refreshed in the background.
+        /// Pass <c>false</c> when the price is used to settle a trade.
+        /// </param>
+        /// <returns>The raw ticker JSON and the time it was fetched.</returns>
+        /// <exception cref="HttpRequestException">Thrown when the upstream call fails and nothing is cached.</exception>
+        public Task<MarketDataEntry> GetTicker(int id, bool allowStale = true)
+        {
+            return GetOrFetch($"ticker:{id}", TickerFreshFor, allowStale,
+                () => Fetch(UpstreamClients.Coinlore, $"ticker/?id={id}"));
+        }
+
+        /// <summary>
+        /// Gets the Coinlore tickers of several cryptocurrencies with a single upstream call.
+        /// The answer also refreshes the single-currency entries read by <see cref="GetTicker"/>.
+        /// </summary>
+        /// <param name="ids">The Coinlore IDs of the cryptocurrencies.</param>
+        /// <param name="allowStale">
+        /// Whether an expired entry may be returned while it is refreshed in the background.
+        /// Pass <c>false</c> when the prices are used to settle trades.
+        /// </param>
+        /// <returns>The raw ticker list JSON and the time it was fetched.</returns>
+        /// <exception cref="HttpRequestException">Thrown when the upstream call fails and nothing is cached.</exception>
+        public Task<MarketDataEntry> GetTickers(IEnumerable<int> ids, bool allowStale = true)
+        {
+            var idList = string.Join(",", ids.Distinct().Order());
+            return GetOrFetch($"tickers:{idList}", TickerFreshFor, allowStale, async () =>
+            {
+                var content = await Fetch(UpstreamClients.Coinlore, $"ticker/?id={idList}");
+                await StoreSingleTickers(content);
+                return content;
+            });
+        }
+
+        /// <summary>
+        /// Gets the CoinGecko USD market chart of a cryptocurrency.
+        /// </summary>
+        /// <param name="nameId">The CoinGecko coin ID (Coinlore's <c>nameid</c>).</param>
+        /// <param name="days">History range in days.</param>
+        /// <returns>The raw market_chart JSON and the time it was fetched.</returns>
+        /// <exception cref="HttpRequestException">Thrown when the upstream call fails and nothing is cached.</exception>
+        public Task<MarketDataEntry> GetChart(string nameId, int days)
+        {
+            return GetOrFetch($"chart:{nameId}:{days}", ChartFreshFor, true,
+                () => Fetch(UpstreamClients.CoinGecko, $"coins/{nameId}/market_chart?vs_currency=usd&days={days}"));
+        }
+
+        private async Task<MarketDataEntry> GetOrFetch(string key, TimeSpan freshFor, bool allowStale, Func<Task<string>> fetch)
+        {
+            var cached = await _redisCache.GetMarketData(key);
+            if (cached != null)
+            {
+                if (DateTime.UtcNow - cached.FetchedAt < freshFor)
+                    return cached;
+
+                if (allowStale)
+                {
+                    _ = Refresh(key, fetch).ContinueWith(
+                        t => _logger.LogWarning(t.Exception?.GetBaseException(), "Background refresh of {Key} failed", key),
+                        TaskContinuationOptions.OnlyOnFaulted);
+                    return cached;
+                }
+            }
+
+            return await Refresh(key, fetch);
+        }
+
+        private Task<MarketDataEntry> Refresh(string key, Func<Task<string>> fetch)
+        {
+            var refresh = _inFlight.GetOrAdd(key, k => new Lazy<Task<MarketDataEntry>>(async () =>
+            {
+                try
+                {
+                    var entry = new MarketDataEntry { Content = await fetch(), FetchedAt = DateTime.UtcNow };
+                    await _redisCache.SetMarketData(key, entry, KeepFor);
+                    return entry;
+                }
+                finally
+                {
+                    _inFlight.TryRemove(k, out _);
+                }
+            }));
+
+            return refresh.Value;
+        }
+
+        private async Task StoreSingleTickers(string content)
+        {
+            using var tickers = JsonDocument.Parse(content);
+            var fetchedAt = DateTime.UtcNow;
+            foreach (var ticker in tickers.RootElement.EnumerateArray())
+            {
+                var entry = new MarketDataEntry { Content = $"[{ticker.GetRawText()}]", FetchedAt = fetchedAt };
+                await _redisCache.SetMarketData($"ticker:{ticker.GetProperty("id").GetString()}", entry, KeepFor);
+            }
+        }
+
+        private async Task<string> Fetch(string upstream, string path)
+        {
+            try
+            {
+                using var response = await _httpClientFactory.CreateClient(upstream).GetAsync(path);
+                response.EnsureSuccessStatusCode();
+                return await response.Content.ReadAsStringAsync();
+            }
+            catch (ExecutionRejectedException ex)
+            {
+                throw UpstreamClients.Unavailable(upstream, ex);
+            }
+        }
+    }
+}
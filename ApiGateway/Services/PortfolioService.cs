@@ -0,0 +1,111 @@
+﻿using System.Globalization;
+using System.Text.Json;
+using ApiGateway.Models.Entities;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Values wallets at the cached batch ticker prices and keeps one <see cref="Portfolio"/> snapshot
+    /// per wallet in Redis. Registered as a singleton.
+    /// </summary>
+    public class PortfolioService
+    {
+        /// <summary>
+        /// Snapshots live as long as the ticker prices they were valued at stay fresh.
+        /// </summary>
+        private static readonly TimeSpan SnapshotTtl = TimeSpan.FromSeconds(10);
+
+        private readonly RedisCacheContext _redisCache;
+        private readonly MarketDataService _marketData;
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="PortfolioService"/> class.
+        /// </summary>
+        /// <param name="redisCache">Redis database context used to store portfolio snapshots.</param>
+        /// <param name="marketData">Cached, batched access to the Coinlore tickers.</param>
+        public PortfolioService(RedisCacheContext redisCache, MarketDataService marketData)
+        {
+            _redisCache = redisCache;
+            _marketData = marketData;
+        }
+
+        /// <summary>
+        /// Returns the cached snapshot of a wallet, if it is still fresh.
+        /// </summary>
+        /// <param name="walletId">The wallet ID of the account.</param>
+        /// <returns>The cached <see cref="Portfolio"/>; otherwise null.</returns>
+        public Task<Portfolio?> GetCached(Guid walletId)
+        {
+            return _redisCache.GetPortfolio(walletId.ToString());
+        }
+
+        /// <summary>
+        /// Values an account at the current prices and caches the result, replacing any older snapshot.
+        /// Call it with the updated account after every balance change.
+        /// </summary>
+        /// <param name="account">The account to value.</param>
+        /// <returns>The new <see cref="Portfolio"/> snapshot.</returns>
+        /// <exception cref="HttpRequestException">Thrown when no prices are cached and Coinlore cannot be reached.</exception>
+        public async Task<Portfolio> Refresh(Account account)
+        {
+            var tickers = await _marketData.GetTickers(SupportedCurrencies.Ids);
+            var data = JsonSerializer.Deserialize<List<Dictionary<string, object>>>(tickers.Content) ?? [];
+            var byId = data.ToDictionary(t => int.Parse(t["id"].ToString()!));
+
+            var holdings = new List<PortfolioHolding>();
+            foreach (var (name, id) in SupportedCurrencies.ByName)
+            {
+                if (!byId.TryGetValue(id, out var ticker))
+                    continue;
+
+                var symbol = ticker["symbol"].ToString()!.ToUpper();
+                var price = decimal.Parse(ticker["price_usd"].ToString() ?? "0", NumberStyles.Float, CultureInfo.InvariantCulture);
+                var amount = GetCryptoBalance(account, symbol);
+
+                holdings.Add(new PortfolioHolding
+                {
+                    CryptoId = id,
+                    Name = name,
+                    Symbol = symbol,
+                    Amount = amount,
+                    PriceUsd = price,
+                    ValueUsd = amount * price
+                });
+            }
+
+            var holdingsValue = holdings.Sum(h => h.ValueUsd);
+            var portfolio = new Portfolio
+            {
+                WalletId = account.WalletId,
+                CashUsd = account.Balance,
+                Holdings = holdings,
+                HoldingsValueUsd = holdingsValue,
+                TotalValueUsd = account.Balance + holdingsValue,
+                PricedAt = tickers.FetchedAt
+            };
+
+            await _redisCache.SetPortfolio(account.WalletId.ToString(), portfolio, SnapshotTtl);
+            return portfolio;
+        }
+
+        /// <summary>
+        /// Gets the balance of a specific cryptocurrency from an account.
+        /// </summary>
+        /// <param name="account">The user's account object.</param>
+        /// <param name="symbol">The symbol of the cryptocurrency.</param>
+        /// <returns>The balance, or 0 for an unknown symbol.</returns>
+        private static decimal GetCryptoBalance(Account account, string symbol)
+        {
+            return symbol switch
+            {
+                "BTC" => account.Bitcoin,
+                "ETH" => account.Ethereum,
+                "SOL" => account.Solana,
+                "XRP" => account.Ripple,
+                "LTC" => account.Litecoin,
+                "ADA" => account.Cardano,
+                _ => 0
+            };
+        }
+    }
+}
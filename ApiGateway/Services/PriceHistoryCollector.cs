@@ -0,0 +1,134 @@
+﻿using System.Text.Json;
+using ApiGateway.Models.Entities;
+using Microsoft.EntityFrameworkCore;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Keeps <c>PriceHistories</c> up to date for every supported currency in the background.
+    /// Each pass reads the newest stored timestamp per currency and inserts only the chart points
+    /// after it, so the table grows by the new points instead of the full 24h series per request.
+    /// The new points are rolled up into <c>PriceCandles</c> in the same transaction (see <see cref="CandleRollup"/>).
+    /// </summary>
+    public class PriceHistoryCollector : BackgroundService
+    {
+        /// <summary>
+        /// CoinGecko's 1-day chart has 5-minute granularity, so polling faster adds no points.
+        /// </summary>
+        private static readonly TimeSpan Interval = TimeSpan.FromMinutes(5);
+
+        private readonly IServiceScopeFactory _scopeFactory;
+        private readonly MarketDataService _marketData;
+        private readonly ILogger<PriceHistoryCollector> _logger;
+
+        /// <summary>
+        /// Currencies whose candles are known to cover the stored points, checked once per process.
+        /// </summary>
+        private readonly HashSet<int> _rolledUp = [];
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="PriceHistoryCollector"/> class.
+        /// </summary>
+        /// <param name="scopeFactory">Creates the scope of the <see cref="CryptoDbContext"/> used by each pass.</param>
+        /// <param name="marketData">Shared, cached source of tickers and charts.</param>
+        /// <param name="logger">Logger of collection passes.</param>
+        public PriceHistoryCollector(IServiceScopeFactory scopeFactory, MarketDataService marketData,
+            ILogger<PriceHistoryCollector> logger)
+        {
+            _scopeFactory = scopeFactory;
+            _marketData = marketData;
+            _logger = logger;
+        }
+
+        /// <inheritdoc />
+        protected override async Task ExecuteAsync(CancellationToken stoppingToken)
+        {
+            using var timer = new PeriodicTimer(Interval);
+            do
+            {
+                foreach (var id in SupportedCurrencies.Ids)
+                {
+                    try
+                    {
+                        var added = await Collect(id, stoppingToken);
+                        if (added > 0)
+                            _logger.LogInformation("Stored {Added} new price points for {CryptoId}", added, id);
+                    }
+                    catch (Exception ex) when (ex is not OperationCanceledException)
+                    {
+                        // One failing currency (or upstream outage) must not stop the others
+                        _logger.LogWarning(ex, "Failed to collect price history for {CryptoId}", id);
+                    }
+                }
+            } while (await timer.WaitForNextTickAsync(stoppingToken));
+        }
+
+        /// <summary>
+        /// Stores the chart points of a cryptocurrency that are newer than its latest stored price
+        /// and folds them into its candles. Points stored before candles existed are rolled up on the
+        /// first pass, so upgraded databases get candles for their whole history.
+        /// </summary>
+        /// <param name="id">The Coinlore ID of the cryptocurrency.</param>
+        /// <param name="cancellationToken">Stops the pass on shutdown.</param>
+        /// <returns>The number of inserted points.</returns>
+        private async Task<int> Collect(int id, CancellationToken cancellationToken)
+        {
+            var ticker = await _marketData.GetTicker(id);
+            var data = JsonSerializer.Deserialize<List<Dictionary<string, object>>>(ticker.Content);
+            if (data == null || data.Count == 0)
+                return 0;
+
+            var nameId = data[0]["nameid"].ToString()?.ToLower();
+            var symbol = data[0]["symbol"].ToString();
+            var chart = await _marketData.GetChart(nameId!, 1);
+
+            using var scope = _scopeFactory.CreateScope();
+            var db = scope.ServiceProvider.GetRequiredService<CryptoDbContext>();
+
+            var latest = await db.PriceHistories
+                .Where(p => p.CryptoId == id)
+                .MaxAsync(p => (DateTime?)p.Timestamp, cancellationToken) ?? DateTime.MinValue;
+
+            var points = new List<(DateTime Timestamp, decimal Price)>();
+            var backfill = !_rolledUp.Contains(id) && !await db.PriceCandles.AnyAsync(c => c.CryptoId == id, cancellationToken);
+            if (backfill)
+            {
+                var stored = await db.PriceHistories
+                    .AsNoTracking()
+                    .Where(p => p.CryptoId == id)
+                    .OrderBy(p => p.Timestamp)
+                    .Select(p => new { p.Timestamp, p.Price })
+                    .ToListAsync(cancellationToken);
+                points.AddRange(stored.Select(p => (p.Timestamp, p.Price)));
+            }
+
+            using var chartJson = JsonDocument.Parse(chart.Content);
+            var added = 0;
+            foreach (var pricePoint in chartJson.RootElement.GetProperty("prices").EnumerateArray())
+            {
+                var timestamp = DateTimeOffset.FromUnixTimeMilliseconds((long)pricePoint[0].GetDouble()).UtcDateTime;
+                if (timestamp <= latest)
+                    continue;
+
+                var price = pricePoint[1].GetDecimal();
+                db.PriceHistories.Add(new PriceHistory
+                {
+                    CryptoId = id,
+                    Symbol = symbol ?? "UNKNOWN",
+                    Timestamp = timestamp,
+                    Price = price
+                });
+                points.Add((timestamp, price));
+                added++;
+            }
+
+            await CandleRollup.Apply(db, id, points, cancellationToken);
+            await db.SaveChangesAsync(cancellationToken);
+            _rolledUp.Add(id);
+            if (backfill && points.Count > added)
+                _logger.LogInformation("Rolled up {Points} stored price points of {CryptoId} into candles", points.Count - added, id);
+
+            return added;
+        }
+    }
+}
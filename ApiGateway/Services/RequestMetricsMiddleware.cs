@@ -0,0 +1,52 @@
+﻿using System.Diagnostics;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Times every request and its stages with <see cref="GatewayMetrics"/>, labelled by route
+    /// template, and reports the stage breakdown to the caller in a <c>Server-Timing</c> header.
+    /// </summary>
+    public class RequestMetricsMiddleware
+    {
+        private readonly RequestDelegate _next;
+        private readonly GatewayMetrics _metrics;
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="RequestMetricsMiddleware"/> class.
+        /// </summary>
+        /// <param name="next">The rest of the pipeline.</param>
+        /// <param name="metrics">The metrics the requests are recorded in.</param>
+        public RequestMetricsMiddleware(RequestDelegate next, GatewayMetrics metrics)
+        {
+            _next = next;
+            _metrics = metrics;
+        }
+
+        /// <summary>
+        /// Runs the request and records its duration and stage times.
+        /// </summary>
+        /// <param name="context">The current request.</param>
+        public async Task InvokeAsync(HttpContext context)
+        {
+            var started = Stopwatch.GetTimestamp();
+            var stages = _metrics.BeginRequest();
+            context.Response.OnStarting(() =>
+            {
+                context.Response.Headers["Server-Timing"] = stages.ToServerTiming();
+                return Task.CompletedTask;
+            });
+
+            try
+            {
+                await _next(context);
+            }
+            finally
+            {
+                // Unmatched paths share one label so scanners cannot grow the series without bound
+                var route = (context.GetEndpoint() as RouteEndpoint)?.RoutePattern.RawText ?? "unmatched";
+                _metrics.EndRequest(stages, route, context.Request.Method, context.Response.StatusCode,
+                    Stopwatch.GetElapsedTime(started));
+            }
+        }
+    }
+}
@@ -0,0 +1,33 @@
+﻿using Microsoft.AspNetCore.Mvc.Filters;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Global result filter that measures writing the action result (serializing the response body)
+    /// as the <see cref="GatewayStage.Serialization"/> stage.
+    /// </summary>
+    public class SerializationTimingFilter : IAsyncResultFilter
+    {
+        private readonly GatewayMetrics _metrics;
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="SerializationTimingFilter"/> class.
+        /// </summary>
+        /// <param name="metrics">The metrics the stage is recorded in.</param>
+        public SerializationTimingFilter(GatewayMetrics metrics)
+        {
+            _metrics = metrics;
+        }
+
+        /// <summary>
+        /// Writes the result inside the serialization stage.
+        /// </summary>
+        /// <param name="context">The result context.</param>
+        /// <param name="next">Writes the result.</param>
+        public async Task OnResultExecutionAsync(ResultExecutingContext context, ResultExecutionDelegate next)
+        {
+            using (_metrics.Stage(GatewayStage.Serialization))
+                await next();
+        }
+    }
+}
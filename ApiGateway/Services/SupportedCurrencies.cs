@@ -0,0 +1,22 @@
+﻿namespace ApiGateway.Services
+{
+    /// <summary>
+    /// The cryptocurrencies the gateway trades and tracks, keyed by display name with their Coinlore IDs.
+    /// </summary>
+    public static class SupportedCurrencies
+    {
+        /// <summary>
+        /// Display name to Coinlore ID.
+        /// </summary>
+        public static readonly IReadOnlyDictionary<string, int> ByName = new Dictionary<string, int>
+        {
+            {"Bitcoin (BTC)", 90}, {"Ethereum (ETH)", 80}, {"Solana (SOL)", 48543},
+            {"Ripple (XRP)", 58}, {"Litecoin (LTC)", 1}, {"Cardano (ADA)", 257}
+        };
+
+        /// <summary>
+        /// The Coinlore IDs of all supported currencies.
+        /// </summary>
+        public static IEnumerable<int> Ids => ByName.Values;
+    }
+}
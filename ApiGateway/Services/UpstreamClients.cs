@@ -0,0 +1,95 @@
+﻿using System.Net;
+using System.Threading.RateLimiting;
+using Microsoft.Extensions.Http.Resilience;
+using Polly;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Named, pooled <see cref="HttpClient"/>s for the gateway's upstreams. Each client gets a bounded
+    /// number of concurrent requests, per-attempt and total timeouts, retries with jittered backoff for
+    /// idempotent calls and a circuit breaker, so a slow or failing upstream makes requests fail fast
+    /// instead of piling up sockets and threads.
+    /// </summary>
+    public static class UpstreamClients
+    {
+        /// <summary>
+        /// Name of the Coinlore client.
+        /// </summary>
+        public const string Coinlore = "Coinlore";
+
+        /// <summary>
+        /// Name of the CoinGecko client.
+        /// </summary>
+        public const string CoinGecko = "CoinGecko";
+
+        /// <summary>
+        /// Name of the Ollama client.
+        /// </summary>
+        public const string Ollama = "Ollama";
+
+        /// <summary>
+        /// Registers the Coinlore, CoinGecko and Ollama clients with <see cref="IHttpClientFactory"/>.
+        /// </summary>
+        /// <param name="services">The service collection.</param>
+        /// <param name="upstreams">The configured upstream URLs and limits.</param>
+        /// <returns>The service collection.</returns>
+        public static IServiceCollection AddUpstreamClients(this IServiceCollection services, UpstreamOptions upstreams)
+        {
+            AddUpstream(services, Coinlore, upstreams.Coinlore,
+                TimeSpan.FromSeconds(upstreams.CoinloreTimeoutSeconds), upstreams.MaxConcurrentRequests);
+            AddUpstream(services, CoinGecko, upstreams.CoinGecko,
+                TimeSpan.FromSeconds(upstreams.CoinGeckoTimeoutSeconds), upstreams.MaxConcurrentRequests);
+            AddUpstream(services, Ollama, upstreams.Ollama,
+                TimeSpan.FromSeconds(upstreams.OllamaTimeoutSeconds), upstreams.OllamaMaxConcurrentRequests);
+            return services;
+        }
+
+        /// <summary>
+        /// Translates a request the resilience handler refused (open circuit, full queue or timeout)
+        /// into the <see cref="HttpRequestException"/> callers already handle, with status 503.
+        /// </summary>
+        /// <param name="name">The upstream name, for the message.</param>
+        /// <param name="ex">The rejection.</param>
+        /// <returns>The exception to throw.</returns>
+        public static HttpRequestException Unavailable(string name, ExecutionRejectedException ex)
+        {
+            return new HttpRequestException($"{name} is unavailable: {ex.Message}", ex, HttpStatusCode.ServiceUnavailable);
+        }
+
+        private static void AddUpstream(IServiceCollection services, string name, string baseUrl, TimeSpan attemptTimeout, int maxConcurrency)
+        {
+            // HttpClient's own 100-second timeout is disabled: it would cut Ollama's longer attempts short with a
+            // TaskCanceledException, while the resilience handler's timeouts surface as ExecutionRejectedException
+            var client = services.AddHttpClient(name, c =>
+            {
+                c.BaseAddress = new Uri(baseUrl.TrimEnd('/') + "/");
+                c.Timeout = Timeout.InfiniteTimeSpan;
+            });
+            client.AddStandardResilienceHandler(options =>
+            {
+                options.RateLimiter.DefaultRateLimiterOptions = new ConcurrencyLimiterOptions
+                {
+                    PermitLimit = maxConcurrency,
+                    QueueLimit = maxConcurrency
+                };
+
+                // Only GETs are retried, so an Ollama prompt is never generated twice
+                options.Retry.DisableForUnsafeHttpMethods();
+                options.Retry.MaxRetryAttempts = 2;
+                options.Retry.Delay = TimeSpan.FromMilliseconds(200);
+                options.AttemptTimeout.Timeout = attemptTimeout;
+                options.TotalRequestTimeout.Timeout = attemptTimeout * 3 + TimeSpan.FromSeconds(1);
+
+                // Open after half of at least 5 calls in the window fail, then probe again after 15 seconds
+                options.CircuitBreaker.FailureRatio = 0.5;
+                options.CircuitBreaker.MinimumThroughput = 5;
+                options.CircuitBreaker.SamplingDuration = TimeSpan.FromTicks(Math.Max(attemptTimeout.Ticks * 2, TimeSpan.FromSeconds(30).Ticks));
+                options.CircuitBreaker.BreakDuration = TimeSpan.FromSeconds(15);
+            });
+
+            // Inside the resilience handler, so every attempt is measured on its own
+            client.AddHttpMessageHandler(sp => new UpstreamMetricsHandler(sp.GetRequiredService<GatewayMetrics>(), name));
+        }
+    }
+}
@@ -0,0 +1,45 @@
+﻿using System.Diagnostics;
+using System.Globalization;
+
+namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Records the latency of every attempt an upstream client makes, by status code, and adds it
+    /// to the <see cref="GatewayStage.Upstream"/> stage of the current request.
+    /// </summary>
+    public class UpstreamMetricsHandler : DelegatingHandler
+    {
+        private readonly GatewayMetrics _metrics;
+        private readonly string _upstream;
+
+        /// <summary>
+        /// Initializes a new instance of the <see cref="UpstreamMetricsHandler"/> class.
+        /// </summary>
+        /// <param name="metrics">The metrics the calls are recorded in.</param>
+        /// <param name="upstream">The upstream name used as label.</param>
+        public UpstreamMetricsHandler(GatewayMetrics metrics, string upstream)
+        {
+            _metrics = metrics;
+            _upstream = upstream;
+        }
+
+        /// <inheritdoc />
+        protected override async Task<HttpResponseMessage> SendAsync(HttpRequestMessage request, CancellationToken cancellationToken)
+        {
+            var started = Stopwatch.GetTimestamp();
+            var outcome = "error";
+            try
+            {
+                var response = await base.SendAsync(request, cancellationToken);
+                outcome = ((int)response.StatusCode).ToString(CultureInfo.InvariantCulture);
+                return response;
+            }
+            finally
+            {
+                var elapsed = Stopwatch.GetElapsedTime(started);
+                _metrics.UpstreamRequest(_upstream, outcome, elapsed);
+                _metrics.RecordStage(GatewayStage.Upstream, elapsed);
+            }
+        }
+    }
+}
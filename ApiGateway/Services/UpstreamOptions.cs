@@ -0,0 +1,55 @@
+﻿namespace ApiGateway.Services
+{
+    /// <summary>
+    /// Base URLs and client limits of the external services the gateway depends on, bound from the
+    /// "Upstreams" section of appsettings.json. Pointing them at local stand-ins lets the gateway run,
+    /// and be benchmarked, without internet access.
+    /// </summary>
+    public class UpstreamOptions
+    {
+        /// <summary>
+        /// Base URL of the Coinlore API used for tickers.
+        /// </summary>
+        public string Coinlore { get; set; } = "https://api.coinlore.net/api/";
+
+        /// <summary>
+        /// Base URL of the CoinGecko API used for market charts.
+        /// </summary>
+        public string CoinGecko { get; set; } = "https://api.coingecko.com/api/v3/";
+
+        /// <summary>
+        /// Endpoint of the Ollama server that hosts the AI agent model.
+        /// </summary>
+        public string Ollama { get; set; } = "http://192.168.33.51:11434";
+
+        /// <summary>
+        /// Ollama model answering AI agent prompts.
+        /// </summary>
+        public string OllamaModel { get; set; } = "tinyllama:latest";
+
+        /// <summary>
+        /// Seconds a single Coinlore request may take before it is abandoned (and retried).
+        /// </summary>
+        public int CoinloreTimeoutSeconds { get; set; } = 5;
+
+        /// <summary>
+        /// Seconds a single CoinGecko request may take before it is abandoned (and retried).
+        /// </summary>
+        public int CoinGeckoTimeoutSeconds { get; set; } = 10;
+
+        /// <summary>
+        /// Seconds Ollama may take to start answering a prompt. The streamed answer itself is not limited.
+        /// </summary>
+        public int OllamaTimeoutSeconds { get; set; } = 120;
+
+        /// <summary>
+        /// Concurrent requests allowed to Coinlore and to CoinGecko each; as many more may wait for a slot.
+        /// </summary>
+        public int MaxConcurrentRequests { get; set; } = 16;
+
+        /// <summary>
+        /// Concurrent prompts allowed to Ollama; as many more may wait for a slot.
+        /// </summary>
+        public int OllamaMaxConcurrentRequests { get; set; } = 4;
+    }
+}
@@ -0,0 +1,58 @@
+"""
+Measures the GUI client's time to interactive: the client is started repeatedly with
+GUI_STARTUP_PROBE=1, reports how long it took until its first window was usable and
+exits. Fails (exit code 1) when the median is over the budget.
+
+    python ClientStartup.py --runs 5 --budget 1000
+    python ClientStartup.py --offscreen     # no display needed, e.g. on CI
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+CLIENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "GUI-Client")
+PROBE_LINE = re.compile(r"^time-to-interactive (?P<ms>[\d.]+) ms (?P<window>\w+)$", re.MULTILINE)
+
+
+def measure(python, offscreen, timeout):
+    """
+    Starts the client once and returns (milliseconds, first window).
+    """
+    env = dict(os.environ, GUI_STARTUP_PROBE="1")
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    result = subprocess.run([python, "LoginWindow.py"], cwd=CLIENT_DIR, env=env,
+                            capture_output=True, text=True, timeout=timeout)
+    match = PROBE_LINE.search(result.stdout)
+    if not match:
+        raise RuntimeError(f"client exited with {result.returncode} without reporting:\n{result.stderr}")
+    return float(match.group("ms")), match.group("window")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the GUI client's time to interactive.")
+    parser.add_argument("--runs", type=int, default=5, help="client starts to measure")
+    parser.add_argument("--budget", type=float, default=1000, help="tolerated median in milliseconds")
+    parser.add_argument("--python", default=sys.executable, help="interpreter of the client's environment")
+    parser.add_argument("--offscreen", action="store_true", help="run without a display")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds before a start counts as hung")
+    args = parser.parse_args()
+
+    timings = []
+    for run in range(1, args.runs + 1):
+        ms, window = measure(args.python, args.offscreen, args.timeout)
+        timings.append(ms)
+        print(f"run {run}: {ms:8.1f} ms until {window}")
+
+    median = statistics.median(timings)
+    print(f"min {min(timings):.1f} ms, median {median:.1f} ms, max {max(timings):.1f} ms, budget {args.budget:.0f} ms")
+    if median > args.budget:
+        print("Over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Load test for the API gateway. Virtual users replay GUI-client sessions against a
+running gateway at a fixed concurrency and the run is summarized per route
+(p50/p95/p99 latency, throughput, error rate), optionally compared with a baseline.
+With --metrics the gateway's /metrics endpoint is scraped around the measured window
+to add cache hit ratios, upstream calls and per-stage request times.
+
+    python GatewayBenchmark.py --users 20 --duration 60 --output run.json
+    python GatewayBenchmark.py --users 20 --duration 60 --baseline baseline.json
+"""
+import argparse
+import itertools
+import sys
+import threading
+import time
+
+import requests
+
+import Metrics
+from Sessions import generate_sessions, load_sessions, save_sessions
+from Stats import compare, format_report, load_results, save_results, summarize
+
+TIMEOUT = (3.05, 120)
+STARTING_BALANCE = 10_000_000
+
+
+class VirtualUser:
+    """
+    One simulated client with its own keep-alive session, like one running GUI client.
+    """
+
+    def __init__(self, base_url, email, password):
+        self.base_url = base_url
+        self.email = email
+        self.password = password
+        self.session = requests.Session()
+
+    def call(self, method, path, data=None, params=None):
+        return self.session.request(method, self.base_url + path, data=data, params=params, timeout=TIMEOUT)
+
+    def set_api_key(self, api_key):
+        self.session.headers["X-Api-Key"] = api_key
+
+    def setup(self):
+        """
+        Registers the user if needed, logs in and funds the wallet so trades succeed.
+        Not measured.
+        """
+        self.call("PUT", "Users/register", data={"email": self.email, "username": self.email, "password": self.password})
+        response = self.call("POST", "Users/login", data={"email": self.email, "password": self.password})
+        response.raise_for_status()
+        self.set_api_key(response.json()["apiKey"])
+        self.call("POST", "Transactions/AddMoney", data={"amount": STARTING_BALANCE}).raise_for_status()
+
+    def run_step(self, step):
+        data = step.get("data")
+        if data:
+            data = {key: self.email if value == "$email" else self.password if value == "$password" else value
+                    for key, value in data.items()}
+
+        start = time.perf_counter()
+        try:
+            response = self.call(step["method"], step["path"], data=data, params=step.get("params"))
+            response.content  # include the body download in the latency
+            ok = response.ok
+        except requests.RequestException:
+            response, ok = None, False
+        latency = time.perf_counter() - start
+
+        if ok and step["route"] == "login":
+            self.set_api_key(response.json()["apiKey"])
+        return latency, ok
+
+
+def run(args, sessions):
+    users = [VirtualUser(args.url, f"{args.user_prefix}{i}@bench.local", args.password) for i in range(args.users)]
+    print(f"Setting up {len(users)} users...")
+    for user in users:
+        user.setup()
+
+    next_session = itertools.cycle(sessions).__next__
+    lock = threading.Lock()
+    samples = []
+
+    started = time.perf_counter()
+    measure_from = started + args.warmup
+    stop_at = measure_from + args.duration
+
+    scrapes = {}
+    if args.metrics:
+        scraper = threading.Timer(args.warmup, lambda: scrapes.setdefault("before", Metrics.scrape(args.url)))
+        scraper.start()
+
+    def worker(user):
+        local = []
+        while time.perf_counter() < stop_at:
+            with lock:
+                session = next_session()
+            for step in session["steps"]:
+                if time.perf_counter() >= stop_at:
+                    break
+                step_started = time.perf_counter()
+                latency, ok = user.run_step(step)
+                if step_started >= measure_from:
+                    local.append((step["route"], latency, ok))
+                if args.think_time:
+                    time.sleep(args.think_time)
+        with lock:
+            samples.extend(local)
+
+    print(f"Running {args.warmup}s warmup + {args.duration}s at concurrency {args.users}...")
+    threads = [threading.Thread(target=worker, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    gateway = None
+    if args.metrics:
+        scraper.join()
+        gateway = Metrics.summarize(Metrics.delta(scrapes.get("before", {}), Metrics.scrape(args.url)))
+    return summarize(samples, args.duration), gateway
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API gateway with GUI-client sessions.")
+    parser.add_argument("--url", default="http://localhost:5182/api/", help="gateway base URL")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the measurement")
+    parser.add_argument("--think-time", type=float, default=0, help="pause in seconds between a user's calls")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic sessions")
+    parser.add_argument("--agent-ratio", type=float, default=0, help="share of sessions that ask the AI agent")
+    parser.add_argument("--sessions", help="replay the sessions of this JSON Lines file instead of synthetic ones")
+    parser.add_argument("--record", help="write the sessions used to this JSON Lines file")
+    parser.add_argument("--user-prefix", default="bench", help="email prefix of the benchmark users")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--metrics", action="store_true", help="scrape the gateway's /metrics around the measured window")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="tolerated relative regression vs. the baseline")
+    args = parser.parse_args()
+
+    sessions = load_sessions(args.sessions) if args.sessions else generate_sessions(1000, args.seed, args.agent_ratio)
+    if args.record:
+        save_sessions(args.record, sessions)
+
+    summary, gateway = run(args, sessions)
+    print(format_report(summary))
+    if gateway:
+        print()
+        print(Metrics.format_summary(gateway))
+
+    if args.output:
+        save_results(args.output, {
+            "meta": {key: value for key, value in vars(args).items() if key not in ("password", "output", "baseline")},
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "routes": summary,
+            "gateway": gateway,
+        })
+
+    if args.baseline:
+        lines, regressions = compare(summary, load_results(args.baseline)["routes"], args.threshold)
+        print()
+        print("\n".join(lines))
+        if regressions:
+            print(f"\nRegressed: {', '.join(sorted(regressions))}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import re
+from urllib.parse import urljoin
+
+import requests
+
+SAMPLE = re.compile(r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(?P<labels>.*)\})?\s+(?P<value>\S+)$')
+LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def metrics_url(base_url):
+    """
+    The gateway serves /metrics at the root, next to the api/ routes.
+    """
+    return urljoin(base_url, "/metrics")
+
+
+def parse(text):
+    """
+    Parses the Prometheus text format into {(name, ((label, value), ...)): float}.
+    """
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = SAMPLE.match(line)
+        if not match:
+            continue
+        labels = tuple(sorted(LABEL.findall(match.group("labels") or "")))
+        samples[(match.group("name"), labels)] = float(match.group("value"))
+    return samples
+
+
+def scrape(base_url):
+    response = requests.get(metrics_url(base_url), timeout=(3.05, 10))
+    response.raise_for_status()
+    return parse(response.text)
+
+
+def delta(before, after):
+    """
+    Counter increases between two scrapes; series that only exist in `after` count from zero.
+    """
+    return {key: value - before.get(key, 0.0) for key, value in after.items()}
+
+
+def summarize(samples):
+    """
+    Condenses a (delta of a) scrape into what a benchmark report needs:
+    cache hit ratio per entry family, calls and mean latency per upstream,
+    and the mean time per stage of each route in milliseconds.
+    """
+    caches, upstreams, stages = {}, {}, {}
+    for (name, labels), value in samples.items():
+        labels = dict(labels)
+        if name == "gateway_cache_lookups_total":
+            caches.setdefault(labels["family"], {"hit": 0.0, "miss": 0.0})[labels["result"]] += value
+        elif name in ("gateway_upstream_request_duration_seconds_sum", "gateway_upstream_request_duration_seconds_count"):
+            entry = upstreams.setdefault(labels["upstream"], {"sum": 0.0, "count": 0.0, "errors": 0.0})
+            field = "sum" if name.endswith("_sum") else "count"
+            entry[field] += value
+            if field == "count" and not labels["outcome"].startswith("2"):
+                entry["errors"] += value
+        elif name in ("gateway_request_stage_seconds_sum", "gateway_request_stage_seconds_count"):
+            entry = stages.setdefault(labels["route"], {}).setdefault(labels["stage"], {"sum": 0.0, "count": 0.0})
+            entry["sum" if name.endswith("_sum") else "count"] += value
+
+    return {
+        "cache_hit_ratio": {family: c["hit"] / (c["hit"] + c["miss"])
+                            for family, c in caches.items() if c["hit"] + c["miss"]},
+        "upstreams": {upstream: {"calls": u["count"], "errors": u["errors"],
+                                 "mean_ms": u["sum"] / u["count"] * 1000 if u["count"] else 0.0}
+                      for upstream, u in upstreams.items()},
+        "stage_mean_ms": {route: {stage: s["sum"] / s["count"] * 1000 for stage, s in route_stages.items() if s["count"]}
+                          for route, route_stages in stages.items()},
+    }
+
+
+def format_summary(summary):
+    lines = ["cache hit ratio:"]
+    lines += [f"  {family:<14}{ratio * 100:>7.1f}%" for family, ratio in sorted(summary["cache_hit_ratio"].items())]
+    lines.append("upstream calls:")
+    lines += [f"  {upstream:<14}{u['calls']:>7.0f} calls {u['errors']:>5.0f} errors {u['mean_ms']:>9.1f} ms mean"
+              for upstream, u in sorted(summary["upstreams"].items())]
+    lines.append("mean stage time per request (ms):")
+    for route, route_stages in sorted(summary["stage_mean_ms"].items()):
+        stages = "  ".join(f"{stage}={ms:.2f}" for stage, ms in sorted(route_stages.items()))
+        lines.append(f"  {route:<40}{stages}")
+    return "\n".join(lines)
@@ -0,0 +1,285 @@
+"""
+Local stand-in for the gateway's upstreams, serving the payload shapes the gateway parses:
+
+    GET  /coinlore/ticker/?id=90[,80,...]                     Coinlore ticker list
+    GET  /coingecko/coins/{nameid}/market_chart?days=N        CoinGecko market chart
+    POST /api/chat                                            Ollama streaming chat (NDJSON)
+    GET  /_stats, POST /_reset                                request counters per upstream
+
+Latency, rate limiting (429) and timeouts are injected per upstream, so cache and
+request coalescing behaviour can be measured without internet access:
+
+    python MockUpstreams.py --latency coingecko=lognormal:250:0.4 --rate-limit coingecko=5 \\
+                            --timeout-rate coinlore=0.01 --token-delay 20
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+UPSTREAMS = ["coinlore", "coingecko", "ollama"]
+
+# Coinlore ID: (symbol, name, CoinGecko nameid, reference price in USD)
+COINS = {
+    90: ("BTC", "Bitcoin", "bitcoin", 65000.0),
+    80: ("ETH", "Ethereum", "ethereum", 3200.0),
+    48543: ("SOL", "Solana", "solana", 150.0),
+    58: ("XRP", "XRP", "ripple", 0.55),
+    1: ("LTC", "Litecoin", "litecoin", 80.0),
+    257: ("ADA", "Cardano", "cardano", 0.45),
+}
+COINS_BY_NAMEID = {nameid: coin_id for coin_id, (_, _, nameid, _) in COINS.items()}
+
+AGENT_REPLY = ("Crypto prices are volatile. Consider your risk tolerance, diversify and never "
+               "invest more than you can afford to lose. This is not financial advice.").split(" ")
+
+
+def price_at(coin_id, timestamp):
+    """
+    Deterministic price of a coin at a Unix time: a multi-day and an hourly wave around
+    the reference price, so every call and every chart agree with each other.
+    """
+    base = COINS[coin_id][3]
+    phase = coin_id % 7
+    return base * (1 + 0.03 * math.sin(timestamp / (1.7 * 86400) * 2 * math.pi + phase)
+                   + 0.005 * math.sin(timestamp / 3600 * 2 * math.pi + phase))
+
+
+def parse_distribution(spec):
+    """
+    Parses fixed:MS, uniform:LO:HI, normal:MEAN:SD or lognormal:MEDIAN:SIGMA
+    (milliseconds) into a function rng -> delay in seconds.
+    """
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    samplers = {
+        "fixed": lambda rng: values[0],
+        "uniform": lambda rng: rng.uniform(values[0], values[1]),
+        "normal": lambda rng: max(0.0, rng.gauss(values[0], values[1])),
+        "lognormal": lambda rng: rng.lognormvariate(math.log(values[0]), values[1]),
+    }
+    if kind not in samplers:
+        raise argparse.ArgumentTypeError(f"unknown distribution: {spec}")
+    sampler = samplers[kind]
+    return lambda rng: sampler(rng) / 1000
+
+
+def per_upstream(values, convert):
+    """
+    Turns ["coingecko=5", "all=0.1"] into {upstream: converted value}.
+    """
+    settings = {}
+    for value in values or []:
+        name, _, setting = value.partition("=")
+        for upstream in UPSTREAMS if name == "all" else [name]:
+            if upstream not in UPSTREAMS:
+                raise SystemExit(f"unknown upstream: {name}")
+            settings[upstream] = convert(setting)
+    return settings
+
+
+class FaultInjector:
+    """
+    Per-upstream latency, fixed-window rate limit and timeout decisions, with request counters.
+    """
+
+    def __init__(self, latency, rate_limit, timeout_rate, seed):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.timeout_rate = timeout_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.windows = {}
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stats = {upstream: {"requests": 0, "rate_limited": 0, "timed_out": 0} for upstream in UPSTREAMS}
+
+    def decide(self, upstream):
+        """
+        Returns (delay_seconds, outcome) where outcome is "ok", "rate_limited" or "timeout".
+        """
+        with self.lock:
+            stats = self.stats[upstream]
+            stats["requests"] += 1
+
+            limit = self.rate_limit.get(upstream)
+            if limit is not None:
+                second = int(time.time())
+                window_second, count = self.windows.get(upstream, (second, 0))
+                count = count + 1 if window_second == second else 1
+                self.windows[upstream] = (second, count)
+                if count > limit:
+                    stats["rate_limited"] += 1
+                    return 0.0, "rate_limited"
+
+            if self.rng.random() < self.timeout_rate.get(upstream, 0.0):
+                stats["timed_out"] += 1
+                return 0.0, "timeout"
+
+            sampler = self.latency.get(upstream)
+            return (sampler(self.rng) if sampler else 0.0), "ok"
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    faults: FaultInjector = None
+    hang_seconds = 30.0
+    token_delay = 0.02
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == "/_stats":
+            return self.send_json(200, self.faults.stats)
+        if url.path.startswith("/coinlore/ticker"):
+            return self.serve("coinlore", lambda: self.ticker(query))
+
+        match = re.fullmatch(r"/coingecko/coins/([^/]+)/market_chart", url.path)
+        if match:
+            return self.serve("coingecko", lambda: self.market_chart(match.group(1), query))
+
+        self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+
+        if url.path == "/_reset":
+            self.faults.reset()
+            return self.send_json(200, self.faults.stats)
+        if url.path == "/api/chat":
+            return self.serve("ollama", lambda: self.chat(json.loads(body or b"{}")))
+
+        self.send_json(404, {"error": "not found"})
+
+    def serve(self, upstream, respond):
+        delay, outcome = self.faults.decide(upstream)
+        if outcome == "rate_limited":
+            return self.send_json(429, {"error": "rate limited"}, {"Retry-After": "1"})
+        if outcome == "timeout":
+            # Never answer; the caller's timeout decides how long this costs
+            time.sleep(self.hang_seconds)
+            self.close_connection = True
+            return
+        time.sleep(delay)
+        respond()
+
+    def ticker(self, query):
+        now = time.time()
+        tickers = []
+        for coin_id in (int(i) for i in query.get("id", [""])[0].split(",") if i.strip().isdigit()):
+            if coin_id not in COINS:
+                continue
+            symbol, name, nameid, _ = COINS[coin_id]
+            price = price_at(coin_id, now)
+            tickers.append({
+                "id": str(coin_id), "symbol": symbol, "name": name, "nameid": nameid, "rank": 1,
+                "price_usd": f"{price:.6f}",
+                "percent_change_24h": f"{(price / price_at(coin_id, now - 86400) - 1) * 100:.2f}",
+                "percent_change_1h": f"{(price / price_at(coin_id, now - 3600) - 1) * 100:.2f}",
+                "percent_change_7d": f"{(price / price_at(coin_id, now - 7 * 86400) - 1) * 100:.2f}",
+                "price_btc": f"{price / price_at(90, now):.8f}",
+                "market_cap_usd": f"{price * 1e9:.2f}", "volume24": price * 1e7,
+                "csupply": "1000000000.00", "tsupply": "1000000000", "msupply": "",
+            })
+        self.send_json(200, tickers)
+
+    def market_chart(self, nameid, query):
+        coin_id = COINS_BY_NAMEID.get(nameid)
+        if coin_id is None:
+            return self.send_json(404, {"error": "coin not found"})
+
+        # Same granularity as CoinGecko: 5 minutes up to 1 day, hourly up to 90 days, then daily
+        days = float(query.get("days", ["1"])[0])
+        step = 300 if days <= 1 else 3600 if days <= 90 else 86400
+        now = time.time()
+        start = now - days * 86400
+        timestamps = [start + i * step for i in range(int((now - start) // step) + 1)]
+        prices = [[int(t * 1000), price_at(coin_id, t)] for t in timestamps]
+        self.send_json(200, {
+            "prices": prices,
+            "market_caps": [[t, p * 1e9] for t, p in prices],
+            "total_volumes": [[t, p * 1e7] for t, p in prices],
+        })
+
+    def chat(self, request):
+        model = request.get("model", "tinyllama:latest")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def chunk(message):
+            data = (json.dumps(message) + "\n").encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        started = time.time()
+        created_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        try:
+            for i, word in enumerate(AGENT_REPLY):
+                time.sleep(self.token_delay)
+                chunk({"model": model, "created_at": created_at, "done": False,
+                       "message": {"role": "assistant", "content": word if i == 0 else " " + word}})
+            chunk({"model": model, "created_at": created_at, "done": True, "done_reason": "stop",
+                   "message": {"role": "assistant", "content": ""},
+                   "total_duration": int((time.time() - started) * 1e9), "eval_count": len(AGENT_REPLY)})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Coinlore, CoinGecko and Ollama for offline gateway runs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", action="append", metavar="UPSTREAM=DIST",
+                        help="response delay, e.g. coingecko=lognormal:250:0.4 (fixed, uniform, normal, lognormal; ms)")
+    parser.add_argument("--rate-limit", action="append", metavar="UPSTREAM=N",
+                        help="answer 429 beyond N requests per second")
+    parser.add_argument("--timeout-rate", action="append", metavar="UPSTREAM=P",
+                        help="share of requests that never get an answer")
+    parser.add_argument("--hang", type=float, default=30, help="seconds a timed out request is held open")
+    parser.add_argument("--token-delay", type=float, default=20, help="milliseconds between Ollama tokens")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the latency and timeout draws")
+    args = parser.parse_args()
+
+    UpstreamHandler.faults = FaultInjector(
+        latency=per_upstream(args.latency, parse_distribution),
+        rate_limit=per_upstream(args.rate_limit, int),
+        timeout_rate=per_upstream(args.timeout_rate, float),
+        seed=args.seed,
+    )
+    UpstreamHandler.hang_seconds = args.hang
+    UpstreamHandler.token_delay = args.token_delay / 1000
+
+    server = ThreadingHTTPServer((args.host, args.port), UpstreamHandler)
+    server.daemon_threads = True
+    print(f"Mock upstreams on http://{args.host}:{args.port}/ (coinlore/, coingecko/, api/chat)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
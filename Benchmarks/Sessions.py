@@ -0,0 +1,69 @@
+import json
+import random
+
+# Coinlore IDs of the gateway's supported currencies and the chart ranges the client offers
+CURRENCY_IDS = [90, 80, 48543, 58, 1, 257]
+HISTORY_DAYS = [1, 7, 30, 365]
+
+AGENT_PROMPTS = [
+    "Should I buy Bitcoin today?",
+    "Explain what Solana is in two sentences.",
+    "What moves the price of Ethereum?",
+]
+
+
+def step(route, method, path, data=None, params=None):
+    """
+    One gateway call. `route` is the name results are grouped under; the values
+    "$email" and "$password" in data are replaced by the virtual user's credentials.
+    """
+    return {"route": route, "method": method, "path": path, "data": data, "params": params}
+
+
+def synthetic_session(rng, agent_ratio=0.0):
+    """
+    Builds a session that makes the calls the GUI client makes, in the same order:
+    login, the currency list with its quotes, one currency window, the wallet, an optional trade,
+    the transaction history and, with probability agent_ratio, an AI agent question.
+    """
+    crypto_id = rng.choice(CURRENCY_IDS)
+    steps = [
+        step("login", "POST", "Users/login", data={"email": "$email", "password": "$password"}),
+        step("SupportedCurrencies", "GET", "APIServices/SupportedCurrencies"),
+        step("Quotes", "GET", "APIServices/Quotes"),
+        step("CurrencyInfo", "POST", "APIServices/CurrencyInfo", data={"id": crypto_id, "days": rng.choice(HISTORY_DAYS)}),
+        step("Portfolio", "GET", "Transactions/Portfolio"),
+    ]
+
+    # Sells only follow a buy of the same amount, so they never fail for lack of balance
+    if rng.random() < 0.5:
+        amount = rng.choice([0.001, 0.01, 0.1])
+        steps.append(step("Buy", "POST", "Transactions/Buy", data={"id": crypto_id, "amount": amount}))
+        if rng.random() < 0.5:
+            steps.append(step("Sell", "POST", "Transactions/Sell", data={"id": crypto_id, "amount": amount}))
+
+    steps.append(step("TransactionsHistory", "GET", "Transactions/TransactionsHistory"))
+
+    if rng.random() < agent_ratio:
+        steps.append(step("Agent", "POST", "APIServices/Agent", data={"prompt": rng.choice(AGENT_PROMPTS)}))
+
+    return {"steps": steps}
+
+
+def generate_sessions(count, seed=0, agent_ratio=0.0):
+    rng = random.Random(seed)
+    return [synthetic_session(rng, agent_ratio) for _ in range(count)]
+
+
+def save_sessions(path, sessions):
+    """
+    Writes sessions as JSON Lines, one session per line, so a run can be replayed exactly.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for session in sessions:
+            f.write(json.dumps(session) + "\n")
+
+
+def load_sessions(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,94 @@
+import json
+import math
+
+# Metrics compared against a baseline: (name, True when an increase is a regression)
+COMPARED_METRICS = [("p50_ms", True), ("p95_ms", True), ("p99_ms", True), ("throughput_rps", False)]
+
+
+def percentile(sorted_values, p):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples, elapsed):
+    """
+    Aggregates (route, latency_seconds, ok) samples into per-route statistics plus
+    a "total" entry. Latencies are reported in milliseconds, throughput in requests
+    per second over the measured window.
+    """
+    by_route = {}
+    for route, latency, ok in samples:
+        by_route.setdefault(route, []).append((latency, ok))
+    by_route["total"] = [(latency, ok) for _, latency, ok in samples]
+
+    summary = {}
+    for route, route_samples in by_route.items():
+        latencies = sorted(latency * 1000 for latency, _ in route_samples)
+        errors = sum(1 for _, ok in route_samples if not ok)
+        count = len(route_samples)
+        summary[route] = {
+            "count": count,
+            "errors": errors,
+            "error_rate": errors / count if count else 0.0,
+            "throughput_rps": count / elapsed if elapsed else 0.0,
+            "mean_ms": sum(latencies) / count if count else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": latencies[-1] if latencies else 0.0,
+        }
+    return summary
+
+
+def format_report(summary):
+    header = f"{'route':<22}{'count':>8}{'err%':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    lines = [header, "-" * len(header)]
+    for route in sorted(summary, key=lambda r: (r == "total", r)):
+        s = summary[route]
+        lines.append(f"{route:<22}{s['count']:>8}{s['error_rate'] * 100:>8.2f}{s['throughput_rps']:>9.1f}"
+                     f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}")
+    return "\n".join(lines)
+
+
+def save_results(path, results):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(summary, baseline, threshold):
+    """
+    Compares a run against a baseline summary. A route regresses when a latency
+    percentile grows, or throughput drops, by more than `threshold` (a fraction),
+    or when its error rate grows by more than one percentage point.
+    Returns (report lines, regressed routes).
+    """
+    lines = [f"{'route':<22}{'metric':<16}{'baseline':>12}{'current':>12}{'change':>10}"]
+    regressions = set()
+
+    for route in sorted(set(summary) & set(baseline), key=lambda r: (r == "total", r)):
+        current, previous = summary[route], baseline[route]
+        for metric, higher_is_worse in COMPARED_METRICS:
+            old, new = previous[metric], current[metric]
+            change = (new - old) / old if old else 0.0
+            worse = change > threshold if higher_is_worse else change < -threshold
+            if worse:
+                regressions.add(route)
+            lines.append(f"{route:<22}{metric:<16}{old:>12.1f}{new:>12.1f}{change * 100:>9.1f}%{'  !' if worse else ''}")
+
+        error_change = current["error_rate"] - previous["error_rate"]
+        if error_change > 0.01:
+            regressions.add(route)
+        lines.append(f"{route:<22}{'error_rate %':<16}{previous['error_rate'] * 100:>12.2f}{current['error_rate'] * 100:>12.2f}"
+                     f"{error_change * 100:>9.2f}pp{'  !' if error_change > 0.01 else ''}")
+
+    return lines, regressions
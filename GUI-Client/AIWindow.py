@@ -1,20 +1,50 @@
-import requests
+import json
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QTextCursor
 from PyQt6.QtWidgets import (
     QWidget, QPushButton,
     QVBoxLayout, QHBoxLayout, QTextEdit, QLineEdit
 )
-from Settings import API_KEY
+from ApiClient import client, iter_events
+from RequestExecutor import executor
+from Settings import AGENT_TIMEOUT
+
+
+def stream_agent_reply(task, prompt):
+    """
+    Reads the AgentStream endpoint on a worker thread and reports every event
+    through the task as (event, data): "queued" with the prompt's position while
+    it waits for the model, then "message" per token. Leaving the with-block
+    closes the connection, which makes the gateway stop generating.
+    """
+    data = {"prompt": prompt}
+    with client.post("APIServices/AgentStream", data=data, timeout=AGENT_TIMEOUT, stream=True) as response:
+        # 503 means the agent queue is full or the model is down; the body says which
+        if response.status_code == 503:
+            raise RuntimeError(response.text)
+        response.raise_for_status()
+        for event, payload in iter_events(response):
+            if task.cancelled or event == "done":
+                break
+            if event == "error":
+                raise RuntimeError(json.loads(payload)["message"])
+            task.report((event, json.loads(payload)))
 
 class AIChatWindow(QWidget):
     def __init__(self):
         super().__init__()
-        self.API_KEY = API_KEY
         self.setWindowTitle("AI Agent")
         self.setFixedSize(400, 500)
         self.setStyleSheet("background-color: #1e1e1e; color: white;")
 
         layout = QVBoxLayout()
 
+        # The gateway keeps the conversation for follow-up questions until it is cleared here
+        self.new_chat_button = QPushButton("New Chat")
+        self.new_chat_button.setStyleSheet("background-color: gray; color: white; font-size: 10px;")
+        self.new_chat_button.clicked.connect(self.new_chat)
+        layout.addWidget(self.new_chat_button, alignment=Qt.AlignmentFlag.AlignRight)
+
         self.chat_history = QTextEdit()
         self.chat_history.setReadOnly(True)
         self.chat_history.setStyleSheet("background-color: #2e2e2e; color: white;")
@@ -26,13 +56,20 @@ class AIChatWindow(QWidget):
         self.user_input.setStyleSheet("background-color: #333; color: white; padding: 5px;")
         input_layout.addWidget(self.user_input)
 
-        send_button = QPushButton("Send")
-        send_button.setStyleSheet("background-color: #FFD700; color: black; font-weight: bold;")
-        send_button.clicked.connect(self.handle_user_input)
-        input_layout.addWidget(send_button)
+        self.send_button = QPushButton("Send")
+        self.send_button.setStyleSheet("background-color: #FFD700; color: black; font-weight: bold;")
+        self.send_button.clicked.connect(self.handle_user_input)
+        input_layout.addWidget(self.send_button)
+
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setStyleSheet("background-color: gray; color: white; font-weight: bold;")
+        self.stop_button.clicked.connect(self.stop_response)
+        self.stop_button.hide()
+        input_layout.addWidget(self.stop_button)
 
         layout.addLayout(input_layout)
         self.setLayout(layout)
+        self.reply_task = None
 
     def handle_user_input(self):
         user_text = self.user_input.text().strip()
@@ -42,12 +79,58 @@ class AIChatWindow(QWidget):
         self.chat_history.append(f"<b>You:</b> {user_text}")
         self.user_input.clear()
 
-        # זמני: תשובה מדומה, אפשר לשלב כאן קריאה ל־API
-        url = "http://localhost:5182/api/APIServices/Agent"
-        header = {"X-Api-key": self.API_KEY}
-        data = {"prompt": user_text}
-        response = requests.post(url, data=data, headers=header)
-        if response.status_code == 200:
-            bot_reply = response.json()['agentResponse']
-            self.chat_history.append(f"<b>AI Agent:</b> {bot_reply}")
+        self.chat_history.append("<b>AI Agent:</b> ")
+        self.set_waiting(True)
+        self.reply_task = executor.submit(self, stream_agent_reply, user_text,
+                                          on_progress=self.on_agent_event,
+                                          on_success=self.on_agent_finished, on_error=self.on_agent_error)
+
+    def on_agent_event(self, item):
+        event, data = item
+        if event == "queued":
+            self.user_input.setPlaceholderText(f"Waiting for the AI agent (position {data['position']})...")
+        else:
+            self.user_input.setPlaceholderText("AI Agent is typing...")
+            self.append_token(data["token"])
+
+    def append_token(self, token):
+        # Tokens are inserted as plain text at the end of the current reply
+        cursor = self.chat_history.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(token)
+        self.chat_history.setTextCursor(cursor)
+        self.chat_history.ensureCursorVisible()
+
+    def on_agent_finished(self, _):
+        self.reply_task = None
+        self.set_waiting(False)
+
+    def on_agent_error(self, error):
+        self.reply_task = None
+        self.set_waiting(False)
+        self.chat_history.append(f"<i>Error: {error}</i>")
+
+    def new_chat(self):
+        self.stop_response()
+        self.chat_history.clear()
+        executor.submit(self, client.delete, "APIServices/AgentSession", on_error=self.on_agent_error)
+
+    def stop_response(self):
+        if self.reply_task is not None:
+            self.reply_task.cancel()
+            self.reply_task = None
+            self.append_token(" [stopped]")
+        self.set_waiting(False)
+
+    def set_waiting(self, waiting):
+        self.send_button.setVisible(not waiting)
+        self.stop_button.setVisible(waiting)
+        self.user_input.setEnabled(not waiting)
+        self.user_input.setPlaceholderText("AI Agent is typing..." if waiting else "Ask me a question...")
+
+    def closeEvent(self, event):
+        executor.cancel(self)
+        self.reply_task = None
+        self.set_waiting(False)
+        super().closeEvent(event)
 
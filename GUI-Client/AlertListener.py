@@ -0,0 +1,163 @@
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from requests import HTTPError
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QMessageBox, QStyle, QSystemTrayIcon
+from ApiClient import client, iter_events
+from CurrencyCache import currencies
+from RequestExecutor import executor
+from Settings import ALERT_RECONNECT_MS, ALERT_STREAM_TIMEOUT, CACHE_DIR
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def stream_alerts(task, since, after):
+    """
+    Holds the Alerts/Stream connection open on a worker thread and reports every
+    alert the gateway pushes as it fires. Returns when the gateway closes the stream.
+    The response is kept on the task so AlertListener.stop can close the connection
+    instead of waiting for the next keep-alive.
+    """
+    with client.get("Alerts/Stream", params={"since": since, "after": after}, timeout=ALERT_STREAM_TIMEOUT,
+                    stream=True) as response:
+        task.response = response
+        response.raise_for_status()
+        for event, payload in iter_events(response):
+            if task.cancelled:
+                return
+            if event == "alert":
+                task.report(json.loads(payload))
+
+
+def triggered_ms(alert):
+    # The gateway sends UTC times with up to 7 fractional digits and not always a "Z".
+    # Rounded up, so resuming the stream after this alert does not replay it
+    text = (alert.get("triggeredAt") or "").rstrip("Z")[:26]
+    triggered = datetime.fromisoformat(text).replace(tzinfo=timezone.utc)
+    microseconds = (triggered - EPOCH) // timedelta(microseconds=1)
+    return -(-microseconds // 1000)
+
+
+def format_price(price):
+    return f"${price:,.2f}" if price >= 1 else f"${price:.4f}"
+
+
+def describe_alert(alert):
+    """
+    The notification title and text of a fired alert.
+    """
+    names = {crypto_id: name for name, crypto_id in currencies.id_map.items()}
+    name = names.get(alert["cryptoId"], f"Currency {alert['cryptoId']}")
+    price = format_price(alert["triggeredPrice"])
+    if alert["type"] == "move":
+        text = f"Moved {alert['threshold']:g}% from {format_price(alert['referencePrice'])}, now {price}"
+    else:
+        text = f"{'Rose above' if alert['type'] == 'above' else 'Fell below'} {format_price(alert['threshold'])}, now {price}"
+    return name, text
+
+
+class AlertListener(QObject):
+    """
+    Receives the user's price alerts from the gateway as they fire, over one long-lived
+    event stream instead of polling, and shows each as a desktop notification.
+    The time and ID of the newest alert shown are kept next to the client cache, so alerts
+    that fired while the client was closed are shown on the next start.
+    """
+
+    alert_fired = pyqtSignal(dict)
+
+    def __init__(self, path=os.path.join(CACHE_DIR, "alerts.json")):
+        super().__init__()
+        self.path = path
+        self.since = 0
+        self.after = None
+        self.task = None
+        self.tray = None
+        self.message_boxes = []
+        self.quit_connected = False
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.setInterval(ALERT_RECONNECT_MS)
+        self.reconnect_timer.timeout.connect(self.start)
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.since, self.after = state.get("since", 0), state.get("after")
+        except (OSError, ValueError):
+            # First start: only alerts from now on
+            self.since = int(time.time() * 1000)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"since": self.since, "after": self.after}, f)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def is_running(self):
+        return self.task is not None
+
+    def start(self):
+        if self.task is not None:
+            return
+        if not self.quit_connected:
+            QApplication.instance().aboutToQuit.connect(self.stop)
+            self.quit_connected = True
+        self.task = executor.submit(self, stream_alerts, self.since, self.after,
+                                    on_progress=self.on_alert, on_success=self.on_closed, on_error=self.on_error)
+
+    def stop(self):
+        self.reconnect_timer.stop()
+        response = getattr(self.task, "response", None)
+        executor.cancel(self)
+        self.task = None
+        # Unblocks the worker's read, so quitting does not wait for the stream
+        if response is not None:
+            response.close()
+
+    def on_alert(self, alert):
+        # Alerts of one pass share their time; the gateway sends them in ID order, as
+        # lowercase GUIDs compare, and resumes after the last one received
+        cursor = (triggered_ms(alert), alert["id"])
+        if cursor > (self.since, self.after or ""):
+            self.since, self.after = cursor
+            self.save()
+        self.notify(*describe_alert(alert))
+        self.alert_fired.emit(alert)
+
+    def on_closed(self, _):
+        self.task = None
+        self.reconnect_timer.start()
+
+    def on_error(self, error):
+        self.task = None
+        # A rejected key stays rejected; the next login starts the listener again
+        if isinstance(error, HTTPError) and error.response is not None and error.response.status_code == 401:
+            return
+        self.reconnect_timer.start()
+
+    def notify(self, title, text):
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            # Without a tray (some Linux desktops) a non-modal message box stands in
+            box = QMessageBox(QMessageBox.Icon.Information, title, text)
+            box.setModal(False)
+            self.message_boxes.append(box)
+            box.finished.connect(lambda _: self.message_boxes.remove(box))
+            box.show()
+            return
+
+        if self.tray is None:
+            icon = QApplication.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxInformation)
+            self.tray = QSystemTrayIcon(icon, self)
+            self.tray.setToolTip("Price alerts")
+            self.tray.show()
+        self.tray.showMessage(title, text, QSystemTrayIcon.MessageIcon.Information, 10000)
+
+
+alert_listener = AlertListener()
@@ -0,0 +1,148 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QDoubleValidator
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QLineEdit,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from AlertListener import alert_listener, format_price
+from ApiClient import client, decode_json
+from RequestExecutor import executor
+
+ALERT_TYPES = {"Price above": "above", "Price below": "below", "Moves by %": "move"}
+
+
+def fetch_alerts(crypto_id):
+    """
+    Fetches the user's alerts for one currency, newest first.
+    Runs on the request executor.
+    """
+    response = client.get("Alerts", params={"cryptoId": crypto_id})
+    response.raise_for_status()
+    return decode_json(response)["alerts"]
+
+
+def create_alert(crypto_id, alert_type, threshold):
+    response = client.post("Alerts", data={"cryptoId": crypto_id, "type": alert_type, "threshold": threshold})
+    if response.status_code != 200:
+        raise RuntimeError(response.text)
+    return response.json()["alert"]
+
+
+def delete_alert(alert_id):
+    response = client.delete(f"Alerts/{alert_id}")
+    if response.status_code != 200:
+        raise RuntimeError(response.text)
+
+
+class AlertsWindow(QWidget):
+    """
+    Lists the price alerts of one currency and registers new ones. Alerts are evaluated
+    by the gateway; fired ones arrive through the AlertListener even when this window is closed.
+    """
+
+    def __init__(self, currency_name, currency_id):
+        super().__init__()
+        self.currency_id = currency_id
+        self.setWindowTitle(f"{currency_name} alerts")
+        self.setFixedSize(520, 420)
+        self.setStyleSheet("background-color: #1e1f26; color: #FFD700;")
+
+        layout = QVBoxLayout()
+
+        form_layout = QHBoxLayout()
+        self.type_input = QComboBox()
+        self.type_input.addItems(ALERT_TYPES)
+        self.threshold_input = QLineEdit()
+        self.threshold_input.setPlaceholderText("Price in USD or percent")
+        self.threshold_input.setValidator(QDoubleValidator(0.0, 1e12, 8))
+        self.add_button = QPushButton("Add Alert")
+        self.add_button.clicked.connect(self.add_alert)
+        form_layout.addWidget(self.type_input)
+        form_layout.addWidget(self.threshold_input, 1)
+        form_layout.addWidget(self.add_button)
+        layout.addLayout(form_layout)
+
+        self.status_label = QLabel("Loading...")
+        layout.addWidget(self.status_label)
+
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(["Alert", "Created at", "Status"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        self.delete_button = QPushButton("Delete Alert")
+        self.delete_button.clicked.connect(self.delete_selected)
+        layout.addWidget(self.delete_button, alignment=Qt.AlignmentFlag.AlignRight)
+
+        for button in (self.add_button, self.delete_button):
+            button.setStyleSheet("background-color: #FFD700; color: black; font-weight: bold; padding: 6px;")
+
+        self.setLayout(layout)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        alert_listener.alert_fired.connect(self.on_alert_fired)
+        self.load_alerts()
+
+    def hideEvent(self, event):
+        alert_listener.alert_fired.disconnect(self.on_alert_fired)
+        super().hideEvent(event)
+
+    def load_alerts(self):
+        executor.submit(self, fetch_alerts, self.currency_id,
+                        on_success=self.show_alerts, on_error=self.on_error)
+
+    def show_alerts(self, alerts):
+        self.status_label.setText(f"{sum(1 for alert in alerts if not alert['triggeredAt'])} active alerts")
+        self.table.setRowCount(len(alerts))
+        for row, alert in enumerate(alerts):
+            if alert["type"] == "move":
+                text = f"Moves {alert['threshold']:g}% from {format_price(alert['referencePrice'])}"
+            else:
+                text = f"{alert['type'].capitalize()} {format_price(alert['threshold'])}"
+            status = (f"Fired at {format_price(alert['triggeredPrice'])}" if alert["triggeredAt"] else "Active")
+
+            alert_item = QTableWidgetItem(text)
+            alert_item.setData(Qt.ItemDataRole.UserRole, alert["id"])
+            self.table.setItem(row, 0, alert_item)
+            self.table.setItem(row, 1, QTableWidgetItem(alert["createdAt"][:16].replace("T", " ")))
+            self.table.setItem(row, 2, QTableWidgetItem(status))
+
+    def add_alert(self):
+        try:
+            threshold = float(self.threshold_input.text())
+        except ValueError:
+            self.status_label.setText("Enter a price or a percentage.")
+            return
+
+        self.add_button.setEnabled(False)
+        executor.submit(self, create_alert, self.currency_id, ALERT_TYPES[self.type_input.currentText()], threshold,
+                        on_success=self.on_alert_added, on_error=self.on_error)
+
+    def on_alert_added(self, _):
+        self.add_button.setEnabled(True)
+        self.threshold_input.clear()
+        self.load_alerts()
+
+    def delete_selected(self):
+        row = self.table.currentRow()
+        if row < 0:
+            return
+        alert_id = self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+        executor.submit(self, delete_alert, alert_id,
+                        on_success=lambda _: self.load_alerts(), on_error=self.on_error)
+
+    def on_alert_fired(self, alert):
+        if alert["cryptoId"] == self.currency_id:
+            self.load_alerts()
+
+    def on_error(self, error):
+        self.add_button.setEnabled(True)
+        self.status_label.setText(f"Error: {error}")
+
+    def closeEvent(self, event):
+        executor.cancel(self)
+        super().closeEvent(event)
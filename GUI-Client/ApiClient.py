@@ -0,0 +1,105 @@
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from Settings import (
+    API_SERVER, API_KEY, REQUEST_TIMEOUT,
+    POOL_SIZE, MAX_RETRIES, RETRY_BACKOFF
+)
+from Profiler import profiler
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ApiClient:
+    """
+    Single keep-alive connection pool to the gateway shared by every window.
+    Injects the X-Api-Key header, applies default timeouts and retries
+    idempotent calls (and connection failures) with exponential backoff.
+    """
+
+    def __init__(self, base_url=API_SERVER, api_key=API_KEY):
+        self.base_url = base_url
+        self.session = requests.Session()
+
+        # POST/PUT are not retried on read errors or 5xx, so a Buy is never sent twice
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "OPTIONS", "DELETE"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.set_api_key(api_key)
+
+    def set_api_key(self, api_key):
+        if api_key:
+            self.session.headers["X-Api-Key"] = api_key
+        else:
+            self.session.headers.pop("X-Api-Key", None)
+
+    def request(self, method, path, **kwargs):
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        if not profiler.enabled:
+            return self.session.request(method, self.base_url + path, **kwargs)
+
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, **kwargs)
+        except requests.RequestException as error:
+            profiler.request(method, path, None, started, error=error)
+            raise
+        profiler.request(method, path, response, started, streamed=kwargs.get("stream", False))
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+
+def decode_json(response):
+    """
+    Decodes a JSON response body in a single pass, with orjson when it is installed
+    and the standard json module otherwise.
+    """
+    if orjson is None:
+        return response.json()
+    return orjson.loads(response.content)
+
+
+def iter_events(response):
+    """
+    Parses a text/event-stream response into (event, data) pairs as they arrive.
+    The gateway flushes every event as its own HTTP chunk, so chunk_size=None
+    hands each one over without waiting for a read buffer to fill.
+    """
+    event, data = "message", []
+    for raw_line in response.iter_lines(chunk_size=None):
+        line = raw_line.decode("utf-8")
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].lstrip())
+
+
+client = ApiClient()
@@ -0,0 +1,106 @@
+import numpy as np
+import pyqtgraph as pg
+from PyQt6.QtCore import QPointF, QRectF
+from PyQt6.QtGui import QPainter, QPicture
+
+RISING_COLOR = "#4caf50"
+FALLING_COLOR = "#f44336"
+# Share of the bucket width covered by a candle body
+BODY_WIDTH = 0.8
+
+
+class CandleSeries:
+    """
+    OHLC candles of one resolution as NumPy arrays, oldest first.
+    `x` holds the candle open times in epoch seconds and `width` the resolution in seconds.
+    """
+
+    def __init__(self, width, x, open_, high, low, close):
+        self.width = width
+        self.x = x
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+
+    def __len__(self):
+        return len(self.x)
+
+    @classmethod
+    def parse(cls, body):
+        """
+        Converts the gateway's columnar candles ({resolution, timestamps, open, high, low, close},
+        timestamps in milliseconds) into a CandleSeries.
+        """
+        return cls(body["resolution"],
+                   np.asarray(body["timestamps"], dtype=np.int64) / 1000.0,
+                   *(np.asarray(body[column], dtype=np.float64) for column in ("open", "high", "low", "close")))
+
+    def update(self, timestamp, price):
+        """
+        Folds a live price (epoch seconds) into the newest candle, or opens a new candle
+        when it falls into a later bucket. Prices older than the newest candle are ignored.
+        """
+        bucket = timestamp - timestamp % self.width
+        if len(self.x) and bucket < self.x[-1]:
+            return
+        if len(self.x) and bucket == self.x[-1]:
+            self.high[-1] = max(self.high[-1], price)
+            self.low[-1] = min(self.low[-1], price)
+            self.close[-1] = price
+            return
+
+        self.x = np.append(self.x, bucket)
+        for column in ("open", "high", "low", "close"):
+            setattr(self, column, np.append(getattr(self, column), price))
+
+
+class CandlestickItem(pg.GraphicsObject):
+    """
+    Draws a CandleSeries as candlesticks: a wick from low to high and a body from open to close,
+    green when the price rose within the candle and red when it fell. The candles are recorded
+    into a QPicture once per change, so panning and zooming only replay it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.candles = None
+        self.picture = QPicture()
+        self.bounds = QRectF()
+
+    def set_candles(self, candles):
+        self.prepareGeometryChange()
+        self.candles = candles
+        self.generate_picture()
+        self.update()
+
+    def generate_picture(self):
+        self.picture = QPicture()
+        candles = self.candles
+        if candles is None or not len(candles):
+            self.bounds = QRectF()
+            return
+
+        painter = QPainter(self.picture)
+        half_body = candles.width * BODY_WIDTH / 2
+        pens = {rising: pg.mkPen(RISING_COLOR if rising else FALLING_COLOR) for rising in (True, False)}
+        brushes = {rising: pg.mkBrush(RISING_COLOR if rising else FALLING_COLOR) for rising in (True, False)}
+
+        for x, open_, high, low, close in zip(candles.x + candles.width / 2, candles.open,
+                                              candles.high, candles.low, candles.close):
+            rising = close >= open_
+            painter.setPen(pens[rising])
+            painter.setBrush(brushes[rising])
+            painter.drawLine(QPointF(x, low), QPointF(x, high))
+            painter.drawRect(QRectF(x - half_body, open_, half_body * 2, close - open_))
+        painter.end()
+
+        # QPicture's own bounds are integer, which is too coarse for prices below a dollar
+        low, high = candles.low.min(), candles.high.max()
+        self.bounds = QRectF(candles.x[0], low, candles.x[-1] + candles.width - candles.x[0], high - low)
+
+    def paint(self, painter, *args):
+        painter.drawPicture(0, 0, self.picture)
+
+    def boundingRect(self):
+        return self.bounds
@@ -0,0 +1,71 @@
+import json
+import os
+import threading
+import time
+from ApiClient import client
+from Settings import CACHE_DIR, CURRENCIES_TTL
+
+
+class SupportedCurrenciesCache:
+    """
+    TTL cache for the APIServices/SupportedCurrencies map, persisted to disk so
+    the currency list can be shown instantly at startup from the last snapshot.
+    Revalidation sends If-None-Match when the gateway provided an ETag.
+    """
+
+    def __init__(self, path=os.path.join(CACHE_DIR, "supported_currencies.json"), ttl=CURRENCIES_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.id_map = {}
+        self.etag = None
+        self.fetched_at = 0.0
+        self._lock = threading.Lock()
+        self.load()
+
+    @property
+    def is_fresh(self):
+        return bool(self.id_map) and time.time() - self.fetched_at < self.ttl
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.id_map = snapshot.get("supportedCurrencies", {})
+            self.etag = snapshot.get("etag")
+            self.fetched_at = snapshot.get("fetchedAt", 0.0)
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        snapshot = {"supportedCurrencies": self.id_map, "etag": self.etag, "fetchedAt": self.fetched_at}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+
+    def revalidate(self):
+        """
+        Blocking refresh against the gateway, meant to run on the request executor.
+        Returns True when the map changed.
+        """
+        headers = {"If-None-Match": self.etag} if self.etag and self.id_map else {}
+        response = client.get("APIServices/SupportedCurrencies", headers=headers)
+
+        with self._lock:
+            if response.status_code == 304:
+                self.fetched_at = time.time()
+                self.save()
+                return False
+
+            response.raise_for_status()
+            id_map = response.json().get("supportedCurrencies", {})
+            changed = id_map != self.id_map
+            self.id_map = id_map
+            self.etag = response.headers.get("ETag")
+            self.fetched_at = time.time()
+            self.save()
+            return changed
+
+
+currencies = SupportedCurrenciesCache()
@@ -1,26 +1,84 @@
-from datetime import datetime
-import requests
+import time
 import traceback
 
 from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import (
-    QWidget, QLabel, QPushButton, QTableWidget, QTableWidgetItem, QMessageBox,
-    QVBoxLayout, QMessageBox, QHBoxLayout, QFrame
+    QWidget, QLabel, QPushButton, QMessageBox,
+    QVBoxLayout, QMessageBox, QHBoxLayout, QFrame, QButtonGroup
 )
-import json
 import pyqtgraph as pg
 from PyQt6.QtCore import Qt
 
 from AIWindow import AIChatWindow
+from AlertsWindow import AlertsWindow
+from Candlesticks import CandleSeries, CandlestickItem
 from Transactions import BuySellWindow
-from Settings import API_KEY, API_SERVER
+from TransactionHistory import TransactionHistoryWindow
+from ApiClient import client, decode_json
+from PriceFeed import ticker_hub
+from PriceSeries import PriceSeries, parse_history
+from PriceStore import price_store, granularity
+from Profiler import profiler
+from RequestExecutor import executor
+from Settings import CHART_MAX_POINTS
+
+HISTORY_RANGES = {"1D": 1, "7D": 7, "30D": 30, "1Y": 365}
+DAY_MS = 24 * 60 * 60 * 1000
+STEP_MS = {"5m": 5 * 60 * 1000, "1h": 60 * 60 * 1000, "1d": DAY_MS}
+
+
+def fetch_currency_info(crypto_id, days):
+    """
+    Fetches the quote and the price history for the last `days` days. When the local
+    store already covers the range at the step this range is returned in, only the points
+    after its newest timestamp are requested. Runs on the request executor; returns (quote, (x, y)).
+    """
+    range_start = time.time() * 1000 - days * DAY_MS
+    step = granularity(days)
+    covered_from = price_store.covered_from(crypto_id, step)
+    last_timestamp = price_store.last_timestamp(crypto_id, step)
+    is_covered = covered_from is not None and covered_from <= range_start and last_timestamp >= range_start
+
+    data = {"id": crypto_id, "days": days, "delta": "true"}
+    if is_covered:
+        data["since"] = last_timestamp
+
+    response = client.post("APIServices/CurrencyInfo", data=data)
+    response.raise_for_status()
+    with profiler.span("decode CurrencyInfo", "decode", bytes=len(response.content)):
+        body = decode_json(response)
+        x, y = parse_history(body["history"])
+    quote = body["quote"]
+
+    covered_from = None
+    if not is_covered and len(x):
+        # The gateway's own fallback history may only hold what it collected lately,
+        # so the range is only complete from its first point on
+        first_timestamp = x[0] * 1000
+        partial = body.get("partial") or first_timestamp > range_start + 2 * STEP_MS[step]
+        covered_from = first_timestamp if partial else range_start
+    price_store.append(crypto_id, step, x * 1000, y, covered_from=covered_from)
+    return quote, price_store.load(crypto_id, step, range_start)
+
+
+def fetch_candles(crypto_id, days):
+    """
+    Fetches the OHLC candles of the last `days` days; the gateway picks a resolution
+    that keeps the range to a few hundred candles. Runs on the request executor;
+    returns a CandleSeries.
+    """
+    params = {"id": crypto_id, "from": int(time.time() * 1000 - days * DAY_MS)}
+    response = client.get("APIServices/Candles", params=params)
+    response.raise_for_status()
+    with profiler.span("decode Candles", "decode", bytes=len(response.content)):
+        return CandleSeries.parse(decode_json(response))
 
 
 class CurrencyListWindow(QWidget):
     def __init__(self, currency_name, currency_id):
         super().__init__()
-        self.API_KEY = API_KEY
         self.setWindowTitle(currency_name)
+        self.currency_name = currency_name
         self.setFixedSize(1100, 900)
         self.currency_id = currency_id
 
@@ -36,14 +94,40 @@ class CurrencyListWindow(QWidget):
         self.info_label.setStyleSheet("font-size: 14px; padding: 4px;")
         self.layout.addWidget(self.info_label)
 
+        range_layout = QHBoxLayout()
+        self.range_group = QButtonGroup(self)
+        for label, days in HISTORY_RANGES.items():
+            range_button = QPushButton(label)
+            range_button.setCheckable(True)
+            range_button.setChecked(days == 1)
+            range_button.setStyleSheet("background-color: gray; font-size: 10px; padding: 4px;")
+            self.range_group.addButton(range_button, days)
+            range_layout.addWidget(range_button)
+        range_layout.addStretch()
+        self.range_group.idClicked.connect(self.select_range)
+        self.candles_button = QPushButton("Candles")
+        self.candles_button.setCheckable(True)
+        self.candles_button.setStyleSheet("background-color: gray; font-size: 10px; padding: 4px;")
+        self.candles_button.toggled.connect(self.toggle_candles)
+        range_layout.addWidget(self.candles_button)
+        self.layout.addLayout(range_layout)
+
         # Chart Area
         chart_frame = QFrame()
         chart_layout = QVBoxLayout()
 
-        self.plot_widget = pg.PlotWidget()
+        self.plot_widget = pg.PlotWidget(axisItems={"bottom": pg.DateAxisItem(orientation="bottom")})
         self.plot_widget.setBackground('w')
         self.plot_widget.showGrid(x=True, y=True)
+        self.plot_widget.getAxis("bottom").setStyle(tickFont=QFont("Arial", 10), tickTextOffset=10)
         self.plot_data = self.plot_widget.plot([], pen=pg.mkPen(color='b', width=2))
+
+        # Only the visible range is drawn, reduced to min/max per pixel column
+        self.plot_data.setClipToView(True)
+        self.plot_data.setDownsampling(auto=True, method="peak")
+        self.candle_item = CandlestickItem()
+        self.candle_item.setVisible(False)
+        self.plot_widget.addItem(self.candle_item)
         chart_layout.addWidget(self.plot_widget)
         chart_frame.setLayout(chart_layout)
 
@@ -61,66 +145,111 @@ class CurrencyListWindow(QWidget):
         self.transactions_button.clicked.connect(self.open_transaction)
         self.ai_button = QPushButton("AI Agent")
         self.ai_button.clicked.connect(self.open_ai_chat)
+        self.alerts_button = QPushButton("Alerts")
+        self.alerts_button.clicked.connect(self.open_alerts)
 
 
-        for btn in [self.buy_button, self.sell_button, self.transactions_button, self.ai_button]:
+        for btn in [self.buy_button, self.sell_button, self.transactions_button, self.ai_button, self.alerts_button]:
             btn.setStyleSheet("background-color: #FFD700; color: black; font-weight: bold; padding: 8px;")
             btn_layout.addWidget(btn)
 
         self.layout.addLayout(btn_layout)
         self.setLayout(self.layout)
 
-        self.currency_data = self.load_currency_data()
+        # Chart ring buffer; live ticker points are appended and the oldest dropped
+        self.series = PriceSeries(CHART_MAX_POINTS)
+        self.days = 1
+        self.history_task = None
+        self.candles = None
+        self.candles_task = None
+        self.subscribed = False
+
+        # Buy/Sell need the quote, so they stay disabled until it arrives
+        self.currency_data = None
+        self.buy_button.setEnabled(False)
+        self.sell_button.setEnabled(False)
+        self.load_currency_data()
+
+    def select_range(self, days):
+        if days != self.days:
+            self.days = days
+            self.load_currency_data()
+            if self.candles_button.isChecked():
+                self.load_candles()
 
     def load_currency_data(self):
-        try:
-            response = requests.post("http://localhost:5182/api/APIServices/CurrencyInfo", 
-                                    data={"id": self.currency_id}, headers={"X-Api-Key": self.API_KEY})
-            if response.status_code == 200:
-                data = json.loads(response.json()['currencyData'])[0]
-                self.info_label.setText(f"Rank: {data['rank']} | Current price: {data['price_usd']}$")
-
-                # גרף
-                if response.json().get("currencyHistory", None):
-                    history_list = response.json().get("currencyHistory")
-                    self.draw_graph(history_list)
-
-                return data
-            else:
-                self.info_label.setText("Failed in fetching data")
-        except Exception as e:
-            self.info_label.setText(f"Error: {str(e)}")
-
-    def draw_graph(self, history):
-        try:
-            self.y_data = []
-            hour_labels = []
-
-            for point in history:
-                timestamp = point["timestamp"]
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                hour_label = dt.strftime("%H:00")
-                self.y_data.append(point["price"])
-                if hour_label not in hour_labels:
-                    hour_labels.append(hour_label)
-                else:
-                    hour_labels.append("                                                                              ")
-
-            # Generate x_data as numeric indices
-            self.x_data = list(range(len(self.y_data)))
-
-            # Map numeric index to hour label
-            ticks = [(i, hour_labels[i]) for i in range(len(hour_labels))]
-
-            self.plot_data.setData(self.x_data, self.y_data)
-
-            # Apply clean, hourly tick labels
-            x_axis = self.plot_widget.getAxis("bottom")
-            x_axis.setTicks([ticks])
-            x_axis.setStyle(tickFont=QFont("Arial", 10), tickTextOffset=10)
-
-        except Exception as e:
-            print(f"Graph draw error: {e}")
+        # A newer range selection supersedes a history load that is still running
+        if self.history_task is not None:
+            self.history_task.cancel()
+        self.info_label.setText("Loading...")
+        self.history_task = executor.submit(self, fetch_currency_info, self.currency_id, self.days,
+                                            on_success=self.on_currency_data, on_error=self.on_currency_error)
+
+    def on_currency_data(self, result):
+        self.history_task = None
+        data, (x, y) = result
+        self.info_label.setText(f"Rank: {data['rank']} | Current price: {data['priceUsd']}$")
+
+        # גרף
+        with profiler.span("render CurrencyInfo", "render", points=len(x)):
+            self.series.clear()
+            self.series.extend(x, y)
+            self.render_graph()
+            self.plot_widget.autoRange()
+
+        self.currency_data = data
+        self.buy_button.setEnabled(True)
+        self.sell_button.setEnabled(True)
+        if not self.subscribed:
+            ticker_hub.subscribe(self.currency_id, self.on_ticker)
+            self.subscribed = True
+
+    def on_currency_error(self, error):
+        self.history_task = None
+        self.info_label.setText(f"Error: {str(error)}")
+
+    def toggle_candles(self, checked):
+        self.plot_data.setVisible(not checked)
+        self.candle_item.setVisible(checked)
+        if checked:
+            self.load_candles()
+        else:
+            self.plot_widget.autoRange()
+
+    def load_candles(self):
+        if self.candles_task is not None:
+            self.candles_task.cancel()
+        self.candles_task = executor.submit(self, fetch_candles, self.currency_id, self.days,
+                                            on_success=self.on_candles, on_error=self.on_candles_error)
+
+    def on_candles(self, candles):
+        self.candles_task = None
+        self.candles = candles
+        with profiler.span("render Candles", "render", candles=len(candles)):
+            self.candle_item.set_candles(candles)
+            self.plot_widget.autoRange()
+
+    def on_candles_error(self, error):
+        self.candles_task = None
+        self.info_label.setText(f"Error: {str(error)}")
+
+    def render_graph(self):
+        # x is epoch seconds, labelled by the DateAxisItem
+        self.plot_data.setData(self.series.x, self.series.y, skipFiniteCheck=True)
+
+    def on_ticker(self, points):
+        timestamps, prices = zip(*points)
+        with profiler.span("render ticker", "render", points=len(points)):
+            self.series.extend([timestamp / 1000 for timestamp in timestamps], prices)
+            self.render_graph()
+            if self.candles is not None:
+                for timestamp, price in points:
+                    self.candles.update(timestamp / 1000, price)
+                self.candle_item.set_candles(self.candles)
+
+        latest_price = points[-1][1]
+        self.currency_data['priceUsd'] = latest_price
+        self.info_label.setText(f"Rank: {self.currency_data['rank']} | Current price: {latest_price}$")
 
     def open_buy(self):
         try:
@@ -135,46 +264,23 @@ class CurrencyListWindow(QWidget):
         self.ai_window = AIChatWindow()
         self.ai_window.show()
 
+    def open_alerts(self):
+        self.alerts_window = AlertsWindow(self.currency_name, self.currency_id)
+        self.alerts_window.show()
+
     def open_sell(self):
         self.sell_window = BuySellWindow("Sell", self.currency_data, self.currency_id)
         self.sell_window.show()
 
     def open_transaction(self):
-        try:
-            response = requests.get(API_SERVER + "Transactions/TransactionsHistory", headers={"X-Api-Key": self.API_KEY})
-            response.raise_for_status()
-            data = response.json()
-            transactions = data.get("transactionsHistory", [])
-
-            if not transactions:
-                QMessageBox.information(self, "No Transactions", "No transactions found for this user.")
-                return
-
-            # Create a new window
-            self.transaction_window = QWidget()
-            self.transaction_window.setWindowTitle("Transaction History")
-            layout = QVBoxLayout(self.transaction_window)
-
-            table = QTableWidget()
-            table.setColumnCount(6)
-            table.setHorizontalHeaderLabels(["Blockchain ID", "Currency", "Type", "Amount", "Total Price", "DateTime"])
-
-            table.setRowCount(len(transactions))
-            for row, tx in enumerate(transactions):
-                table.setItem(row, 0, QTableWidgetItem(str(tx.get("id", ""))))
-                table.setItem(row, 1, QTableWidgetItem(tx.get("cryptoId", "")))
-                table.setItem(row, 2, QTableWidgetItem(tx.get("type", "")))
-                table.setItem(row, 3, QTableWidgetItem(str(tx.get("amount", ""))))
-                table.setItem(row, 4, QTableWidgetItem(str(tx.get("priceAtTransaction"))))
-                table.setItem(row, 5, QTableWidgetItem(tx.get("dateTime", "").split("T")[0]))
-
-            layout.addWidget(table)
-            self.transaction_window.setLayout(layout)
-            self.transaction_window.resize(600, 600)
-            self.transaction_window.show()
-
-        except requests.exceptions.RequestException as e:
-            QMessageBox.critical(self, "Error", f"Failed to fetch transactions:\n{e}")
+        self.transaction_window = TransactionHistoryWindow()
+        self.transaction_window.show()
+
+    def closeEvent(self, event):
+        executor.cancel(self)
+        ticker_hub.unsubscribe(self.currency_id, self.on_ticker)
+        self.subscribed = False
+        super().closeEvent(event)
 
 
     # def go_back(self):
@@ -1,19 +1,39 @@
-import requests
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QPushButton, QHBoxLayout
-from PyQt6.QtCore import Qt
-from CurrencyDataWindow import CurrencyListWindow
-from Settings import API_KEY, API_SERVER
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor
+from ApiClient import client
+from CurrencyCache import currencies
+from Profiler import profiler
+from RequestExecutor import executor
+from Settings import QUOTES_INTERVAL_MS
+
+
+def fetch_quotes():
+    """
+    Fetches the quotes of all supported currencies in one request.
+    Runs on the request executor; returns {crypto_id: quote}.
+    """
+    response = client.get("APIServices/Quotes")
+    response.raise_for_status()
+    with profiler.span("decode Quotes", "decode"):
+        return {quote["cryptoId"]: quote for quote in response.json().get("quotes", [])}
+
+
+def format_price(price):
+    return f"${price:,.2f}" if price >= 1 else f"${price:.4f}"
 
 
 class CurrencySelectionWindow(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Choose Crypto currency")
-        self.setFixedSize(400, 550)
-        self.API_KEY = API_KEY
-        response = requests.get(API_SERVER + "APIServices/SupportedCurrencies", headers={"X-Api-Key": self.API_KEY})
-        if response.status_code == 200:
-            self.ID_MAP = response.json().get("supportedCurrencies")
+        self.setFixedSize(520, 550)
+        self.ID_MAP = currencies.id_map
+        self.quotes = {}
+        self.quotes_task = None
 
         self.setStyleSheet("""
             QWidget {
@@ -27,7 +47,7 @@ class CurrencySelectionWindow(QWidget):
                 padding: 10px;
             }
 
-            QListWidget {
+            QTableWidget {
                 background-color: #2c2f38;
                 border: none;
                 border-radius: 10px;
@@ -35,21 +55,28 @@ class CurrencySelectionWindow(QWidget):
                 font-size: 16px;
             }
 
-            QListWidget::item {
+            QTableWidget::item {
                 padding: 10px;
                 color: #ffffff;
             }
 
-            QListWidget::item:hover {
+            QTableWidget::item:hover {
                 background-color: #3d414e;
                 color: #ffd700;  /* זהב */
             }
 
-            QListWidget::item:selected {
+            QTableWidget::item:selected {
                 background-color: #5a5f73;
                 color: #ffd700;
             }
 
+            QHeaderView::section {
+                background-color: #2c2f38;
+                color: #bbbbbb;
+                border: none;
+                padding: 5px;
+            }
+
             QPushButton {
                 background-color: transparent;
                 color: #bbbbbb;
@@ -79,17 +106,110 @@ class CurrencySelectionWindow(QWidget):
         label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         main_layout.addWidget(label)
 
-        self.crypto_list = QListWidget()
-        self.crypto_list.addItems([name for name in self.ID_MAP.keys()])
+        self.crypto_list = QTableWidget(0, 3)
+        self.crypto_list.setHorizontalHeaderLabels(["Currency", "Price", "24h"])
+        self.crypto_list.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.crypto_list.verticalHeader().setVisible(False)
+        self.crypto_list.setShowGrid(False)
+        self.crypto_list.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.crypto_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.crypto_list.itemDoubleClicked.connect(self.open_currency_detail)
         main_layout.addWidget(self.crypto_list)
+        self.show_currencies()
 
         self.setLayout(main_layout)
 
+        # Every supported quote comes from a single request per refresh
+        self.quotes_timer = QTimer(self)
+        self.quotes_timer.setInterval(QUOTES_INTERVAL_MS)
+        self.quotes_timer.timeout.connect(self.refresh_quotes)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not currencies.is_fresh:
+            self.load_currencies()
+        self.refresh_quotes()
+        self.quotes_timer.start()
+
+    def hideEvent(self, event):
+        self.quotes_timer.stop()
+        super().hideEvent(event)
+
+    def show_message(self, text):
+        self.crypto_list.setRowCount(1)
+        self.crypto_list.setItem(0, 0, QTableWidgetItem(text))
+        self.crypto_list.setEnabled(False)
+
+    def show_currencies(self):
+        self.crypto_list.setRowCount(len(self.ID_MAP))
+        for row, (name, crypto_id) in enumerate(self.ID_MAP.items()):
+            name_item = QTableWidgetItem(name)
+            name_item.setData(Qt.ItemDataRole.UserRole, crypto_id)
+            self.crypto_list.setItem(row, 0, name_item)
+            self.crypto_list.setItem(row, 1, QTableWidgetItem(""))
+            self.crypto_list.setItem(row, 2, QTableWidgetItem(""))
+        self.crypto_list.setEnabled(bool(self.ID_MAP))
+        self.show_quotes()
+
+    def load_currencies(self):
+        # The last snapshot stays usable while the list is revalidated in the background
+        if not self.ID_MAP:
+            self.show_message("Loading...")
+        executor.submit(self, currencies.revalidate,
+                        on_success=self.on_currencies_loaded, on_error=self.on_currencies_failed)
+
+    def on_currencies_loaded(self, changed):
+        if not changed and self.crypto_list.isEnabled():
+            return
+
+        self.ID_MAP = currencies.id_map
+        self.show_currencies()
+
+    def on_currencies_failed(self, error):
+        if self.ID_MAP:
+            return
+        self.show_message(f"Failed to load currencies: {error}")
+
+    def refresh_quotes(self):
+        if self.quotes_task is not None:
+            return
+        self.quotes_task = executor.submit(self, fetch_quotes,
+                                           on_success=self.on_quotes_loaded, on_error=self.on_quotes_failed)
+
+    def on_quotes_loaded(self, quotes):
+        self.quotes_task = None
+        self.quotes = quotes
+        self.show_quotes()
+
+    def on_quotes_failed(self, error):
+        # The last quotes stay on screen until the next refresh succeeds
+        self.quotes_task = None
+
+    def show_quotes(self):
+        if not self.crypto_list.isEnabled():
+            return
+        with profiler.span("render Quotes", "render"):
+            for row in range(self.crypto_list.rowCount()):
+                quote = self.quotes.get(self.crypto_list.item(row, 0).data(Qt.ItemDataRole.UserRole))
+                if quote is None:
+                    continue
+                change = quote["percentChange24h"]
+                self.crypto_list.item(row, 1).setText(format_price(quote["priceUsd"]))
+                self.crypto_list.item(row, 2).setText(f"{change:+.2f}%")
+                self.crypto_list.item(row, 2).setForeground(QColor("#4caf50" if change >= 0 else "#f44336"))
+
+    def closeEvent(self, event):
+        self.quotes_timer.stop()
+        executor.cancel(self)
+        self.quotes_task = None
+        super().closeEvent(event)
+
     def open_currency_detail(self, item):
-        name = item.text()
+        name = self.crypto_list.item(item.row(), 0).text()
 
         crypto_id = self.ID_MAP.get(name, 0)
+        # Imported on first use: the chart window pulls in pyqtgraph and numpy, which would delay startup
+        from CurrencyDataWindow import CurrencyListWindow
         self.detail_window = CurrencyListWindow(name, crypto_id)
         self.detail_window.show()
         self.close()
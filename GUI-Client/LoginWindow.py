@@ -1,3 +1,7 @@
+import time
+# Time-to-interactive is measured from here, before the Qt and client imports
+STARTED = time.perf_counter()
+
 from CurrencySelectionWindow import CurrencySelectionWindow
 from PyQt6.QtWidgets import (
     QApplication, QLineEdit,
@@ -9,22 +13,26 @@ from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
 import requests
 from SignupWindow import RegisterWindow
-from Settings import API_SERVER
+from ApiClient import client
+from Profiler import profiler, ProfilerOverlay, StartupTimer
+from RequestExecutor import executor
+from Session import session
+from AlertListener import alert_listener
 import sys
 
 
 class LoginWindow(QWidget):
-    def __init__(self):
+    def __init__(self, startup_timer=None):
         super().__init__()
-        self.register_window = RegisterWindow()
+        # The sign-up and currency windows are only built when they are opened
+        self.register_window = None
+        self.currency_window = None
+        self.startup_timer = startup_timer
         self.form_container = QWidget(self)
-        self.currency_window = CurrencySelectionWindow()
         self.username_input = QLineEdit()
         self.password_input = QLineEdit()
         self.show_password_checkbox = QCheckBox("Show password")
         self.login_button = QPushButton("Login")
-        with open(".env", "w") as f:
-            f.write("API_KEY=''")
 
         self.setWindowTitle("Welcome to trading system")
         self.setFixedSize(400, 550)
@@ -139,32 +147,89 @@ class LoginWindow(QWidget):
             QLineEdit.EchoMode.Normal if state == Qt.CheckState.Checked.value else QLineEdit.EchoMode.Password
         )
 
+    def start(self):
+        """
+        Shows the login form, or goes straight to the currency list once the gateway
+        confirms that the saved session's API key is still valid.
+        """
+        self.show()
+        if not session.is_active:
+            self.mark_interactive("login")
+            return
+
+        self.set_loading(True, "Resuming session...")
+        self.username_input.setText(session.email or "")
+        executor.submit(self, session.validate,
+                        on_success=self.on_session_checked, on_error=self.on_session_error)
+
+    def on_session_checked(self, valid):
+        if valid:
+            self.open_currency_window()
+            return
+        session.clear()
+        self.set_loading(False)
+        self.mark_interactive("login")
+
+    def on_session_error(self, error):
+        # The key may still be valid; keep it and let the user retry through the form
+        self.set_loading(False)
+        self.mark_interactive("login")
+
+    def mark_interactive(self, window_name):
+        if self.startup_timer is not None:
+            self.startup_timer.interactive(window_name)
+
     def handle_login(self):
         email = self.username_input.text()
         password = self.password_input.text()
 
-        url = API_SERVER + "Users/login"
         data = {"email": email, "password": password}
-        try:
-            response = requests.post(url, data=data)
-            if response.status_code == 200:
-                with open(".env", "w") as f:
-                    f.write(f"API_KEY={response.json()['apiKey']}")
-
-                self.currency_window.show()
-                self.close()
-            else:
-                QMessageBox.warning(self, "ERROR", "Wrong username or password.")
-
-        except requests.exceptions.RequestException as e:
-            QMessageBox.critical(self, "ERROR", f"Network error: {e}")
+        self.set_loading(True)
+        executor.submit(self, client.post, "Users/login", data=data,
+                        on_success=self.on_login_response, on_error=self.on_login_error)
+
+    def on_login_response(self, response):
+        self.set_loading(False)
+        if response.status_code == 200:
+            session.start(response.json()['apiKey'], self.username_input.text())
+            self.open_currency_window()
+        else:
+            QMessageBox.warning(self, "ERROR", "Wrong username or password.")
+
+    def on_login_error(self, error):
+        self.set_loading(False)
+        if isinstance(error, requests.exceptions.RequestException):
+            QMessageBox.critical(self, "ERROR", f"Network error: {error}")
+        else:
+            QMessageBox.critical(self, "ERROR", str(error))
+
+    def set_loading(self, loading, text="Logging in..."):
+        self.login_button.setEnabled(not loading)
+        self.login_button.setText(text if loading else "Login")
+
+    def open_currency_window(self):
+        self.currency_window = CurrencySelectionWindow()
+        self.currency_window.show()
+        self.mark_interactive("currencies")
+        # Alerts are pushed from now on, whichever windows are open
+        alert_listener.start()
+        self.close()
 
     def open_register_window(self):
+        if self.register_window is None:
+            self.register_window = RegisterWindow()
         self.register_window.show()
 
+    def closeEvent(self, event):
+        executor.cancel(self)
+        super().closeEvent(event)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    window = LoginWindow()
-    window.show()
+    if profiler.enabled:
+        overlay = ProfilerOverlay()
+        overlay.show()
+    window = LoginWindow(StartupTimer(STARTED))
+    window.start()
     sys.exit(app.exec())
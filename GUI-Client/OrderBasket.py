@@ -0,0 +1,130 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import (
+    QWidget, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QVBoxLayout, QHBoxLayout, QMessageBox
+)
+from ApiClient import client
+from RequestExecutor import executor
+
+COLUMNS = ["Currency", "Type", "Amount", "Status"]
+
+
+class OrderBasket(QObject):
+    """
+    Buy and sell orders collected across currency windows and submitted to the
+    gateway as one Transactions/Orders batch, so rebalancing several coins costs
+    one round trip and one price fetch instead of one per coin.
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.orders = []
+
+    def add(self, crypto_id, name, order_type, amount):
+        self.orders.append({"id": crypto_id, "name": name, "type": order_type, "amount": amount})
+        self.changed.emit()
+
+    def remove(self, rows):
+        for row in sorted(rows, reverse=True):
+            del self.orders[row]
+        self.changed.emit()
+
+    def clear(self):
+        self.orders = []
+        self.changed.emit()
+
+    def payload(self):
+        return [{"id": o["id"], "type": o["type"], "amount": o["amount"]} for o in self.orders]
+
+
+basket = OrderBasket()
+
+
+class OrderBasketWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Order Basket")
+        self.resize(480, 400)
+        # Per-order outcome of the last submission, shown in the Status column
+        self.statuses = {}
+
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel(" ")
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        self.remove_button = QPushButton("Remove Selected")
+        self.remove_button.clicked.connect(self.remove_selected)
+        self.clear_button = QPushButton("Clear")
+        self.clear_button.clicked.connect(basket.clear)
+        self.submit_button = QPushButton("Submit Orders")
+        self.submit_button.setStyleSheet("background-color: #FFD700; color: black; font-weight: bold; padding: 8px;")
+        self.submit_button.clicked.connect(self.submit)
+        for button in [self.remove_button, self.clear_button, self.submit_button]:
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+
+        basket.changed.connect(self.show_orders)
+        self.show_orders()
+
+    def show_orders(self):
+        self.table.setRowCount(len(basket.orders))
+        for row, order in enumerate(basket.orders):
+            values = [order["name"], order["type"].capitalize(), f"{order['amount']:g}", self.statuses.get(id(order), "")]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+        self.submit_button.setEnabled(bool(basket.orders))
+
+    def remove_selected(self):
+        basket.remove({index.row() for index in self.table.selectionModel().selectedRows()})
+
+    def set_busy(self, busy):
+        for button in [self.remove_button, self.clear_button, self.submit_button]:
+            button.setEnabled(not busy)
+
+    def submit(self):
+        submitted = list(basket.orders)
+        self.set_busy(True)
+        self.submit_button.setText("Processing...")
+        executor.submit(self, client.post, "Transactions/Orders", json=basket.payload(),
+                        on_success=lambda response: self.on_submitted(response, submitted),
+                        on_error=self.on_submit_error)
+
+    def on_submitted(self, response, submitted):
+        self.set_busy(False)
+        self.submit_button.setText("Submit Orders")
+        if response.status_code != 200:
+            QMessageBox.warning(self, "Failed", f"Orders were not submitted:\n{response.text}")
+            return
+
+        body = response.json()
+        results = body.get("orders", [])
+        # Filled orders leave the basket; rejected ones stay with the reason so they can be fixed
+        filled = [submitted[r["index"]] for r in results if r["filled"]]
+        self.statuses = {id(submitted[r["index"]]): r.get("error") or "" for r in results if not r["filled"]}
+        basket.remove(row for row, order in enumerate(basket.orders) if any(order is f for f in filled))
+
+        portfolio = body.get("portfolio")
+        summary = f"{len(filled)} of {len(results)} orders filled."
+        if portfolio:
+            summary += f" Wallet: ${portfolio['cashUsd']:,.2f}, portfolio total: ${portfolio['totalValueUsd']:,.2f}"
+        self.status_label.setText(summary)
+
+    def on_submit_error(self, error):
+        self.set_busy(False)
+        self.submit_button.setText("Submit Orders")
+        QMessageBox.critical(self, "Error", f"An error occurred:\n{str(error)}")
+
+    def closeEvent(self, event):
+        executor.cancel(self)
+        super().closeEvent(event)
@@ -0,0 +1,90 @@
+import logging
+from PyQt6.QtCore import QObject, QTimer
+from ApiClient import client
+from Profiler import profiler
+from RequestExecutor import executor
+from Settings import TICKER_INTERVAL_MS
+
+logger = logging.getLogger("ticker")
+
+
+class TickerSubscription:
+    def __init__(self, crypto_id):
+        self.crypto_id = crypto_id
+        self.callbacks = []
+        self.last_timestamp = 0
+        self.in_flight = False
+        self.failing = False
+        self.timer = QTimer()
+        self.timer.setInterval(TICKER_INTERVAL_MS)
+
+
+class TickerHub(QObject):
+    """
+    Polls APIServices/Ticker for new price points. Every open window watching the
+    same currency shares one upstream subscription; polling stops once the last
+    subscriber leaves. Callbacks receive a list of (timestamp_ms, price) tuples.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._subscriptions = {}
+
+    def subscribe(self, crypto_id, callback):
+        subscription = self._subscriptions.get(crypto_id)
+        if subscription is None:
+            subscription = TickerSubscription(crypto_id)
+            subscription.timer.timeout.connect(lambda: self.poll(subscription))
+            subscription.timer.start()
+            self._subscriptions[crypto_id] = subscription
+        subscription.callbacks.append(callback)
+
+    def unsubscribe(self, crypto_id, callback):
+        subscription = self._subscriptions.get(crypto_id)
+        if subscription is None:
+            return
+        if callback in subscription.callbacks:
+            subscription.callbacks.remove(callback)
+        if not subscription.callbacks:
+            subscription.timer.stop()
+            del self._subscriptions[crypto_id]
+
+    def poll(self, subscription):
+        # A slow gateway must not pile up overlapping polls for the same currency
+        if subscription.in_flight:
+            return
+        subscription.in_flight = True
+        params = {"id": subscription.crypto_id, "since": subscription.last_timestamp}
+        executor.submit(self, client.get, "APIServices/Ticker", params=params,
+                        on_success=lambda response: self.on_points(subscription, response),
+                        on_error=lambda error: self.on_error(subscription, error))
+
+    def on_points(self, subscription, response):
+        subscription.in_flight = False
+        if subscription.failing:
+            subscription.failing = False
+            logger.info("Ticker polling for %s recovered", subscription.crypto_id)
+        if response.status_code != 200:
+            return
+
+        with profiler.span("decode PriceHistory", "decode"):
+            points = [(point["timestamp"], point["price"]) for point in response.json().get("points", [])
+                      if point["timestamp"] > subscription.last_timestamp]
+        if not points:
+            return
+
+        subscription.last_timestamp = points[-1][0]
+        for callback in list(subscription.callbacks):
+            callback(points)
+
+    def on_error(self, subscription, error):
+        subscription.in_flight = False
+        # Reported once per outage; the next polls retry quietly until one succeeds
+        if not subscription.failing:
+            subscription.failing = True
+            logger.warning("Ticker polling for %s failed: %s", subscription.crypto_id, error)
+        else:
+            logger.debug("Ticker polling for %s failed: %s", subscription.crypto_id, error)
+
+
+ticker_hub = TickerHub()
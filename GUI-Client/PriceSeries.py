@@ -0,0 +1,50 @@
+import numpy as np
+
+
+def parse_history(history):
+    """
+    Converts the gateway's columnar history ({timestamps, prices, delta}, oldest
+    first, timestamps in milliseconds) into (epoch_seconds, price) float arrays.
+    Delta encoded timestamps are restored with a cumulative sum.
+    """
+    timestamps = np.asarray(history["timestamps"], dtype=np.int64)
+    if history.get("delta"):
+        timestamps = np.cumsum(timestamps)
+    return timestamps / 1000.0, np.asarray(history["prices"], dtype=np.float64)
+
+
+class PriceSeries:
+    """
+    Fixed-capacity, time-ordered price buffer backed by NumPy arrays.
+    Appending past the capacity drops the oldest points.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+
+    def __len__(self):
+        return len(self.x)
+
+    @property
+    def last_timestamp(self):
+        return self.x[-1] if len(self.x) else None
+
+    def clear(self):
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+
+    def extend(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        # Only points newer than what we already hold are appended
+        if len(self.x):
+            newer = x > self.x[-1]
+            x, y = x[newer], y[newer]
+        if not len(x):
+            return
+
+        self.x = np.concatenate((self.x, x))[-self.capacity:]
+        self.y = np.concatenate((self.y, y))[-self.capacity:]
@@ -0,0 +1,103 @@
+import os
+import sqlite3
+import threading
+import numpy as np
+from Settings import CACHE_DIR
+
+# Bumped whenever the tables change; the store is a cache, so older files are simply rebuilt
+SCHEMA_VERSION = 1
+
+
+def granularity(days):
+    """
+    The step of the history the gateway returns for a range (CoinGecko's market chart):
+    5-minute points for a day, hourly points up to 90 days and daily points beyond.
+    """
+    if days <= 1:
+        return "5m"
+    return "1h" if days <= 90 else "1d"
+
+
+class PriceStore:
+    """
+    Append-only local price history, one clustered (crypto_id, granularity, ts) table in SQLite.
+    Series of different steps are kept apart, so a day drawn after a year is not made of daily points.
+    Besides the points it records, per currency and granularity, how far back the stored history is
+    complete, so a chart for an already covered range only needs the points newer
+    than the last stored timestamp.
+    Timestamps are Unix milliseconds.
+    """
+
+    def __init__(self, path=os.path.join(CACHE_DIR, "price_history.sqlite")):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Shared by the worker threads of the request executor, serialized by the lock
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            if self._connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._connection.execute("DROP TABLE IF EXISTS points")
+                self._connection.execute("DROP TABLE IF EXISTS coverage")
+                self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS points (
+                    crypto_id INTEGER NOT NULL,
+                    granularity TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    price REAL NOT NULL,
+                    PRIMARY KEY (crypto_id, granularity, ts)
+                ) WITHOUT ROWID
+            """)
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS coverage (
+                    crypto_id INTEGER NOT NULL,
+                    granularity TEXT NOT NULL,
+                    covered_from INTEGER NOT NULL,
+                    PRIMARY KEY (crypto_id, granularity)
+                )
+            """)
+
+    def covered_from(self, crypto_id, granularity):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT covered_from FROM coverage WHERE crypto_id = ? AND granularity = ?",
+                (crypto_id, granularity)).fetchone()
+        return row[0] if row else None
+
+    def last_timestamp(self, crypto_id, granularity):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MAX(ts) FROM points WHERE crypto_id = ? AND granularity = ?",
+                (crypto_id, granularity)).fetchone()
+        return row[0]
+
+    def append(self, crypto_id, granularity, timestamps, prices, covered_from=None):
+        """
+        Stores new points of a series; existing timestamps are left untouched. When covered_from
+        is given, the series from that time up to the newest point is marked complete.
+        """
+        rows = [(crypto_id, granularity, int(ts), float(price)) for ts, price in zip(timestamps, prices)]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO points (crypto_id, granularity, ts, price) VALUES (?, ?, ?, ?)", rows)
+            if covered_from is not None:
+                self._connection.execute("""
+                    INSERT INTO coverage (crypto_id, granularity, covered_from) VALUES (?, ?, ?)
+                    ON CONFLICT (crypto_id, granularity) DO UPDATE SET covered_from = MIN(covered_from, excluded.covered_from)
+                """, (crypto_id, granularity, int(covered_from)))
+
+    def load(self, crypto_id, granularity, start):
+        """
+        Returns (epoch_seconds, prices) arrays for every stored point of a series at or after start.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT ts, price FROM points WHERE crypto_id = ? AND granularity = ? AND ts >= ? ORDER BY ts",
+                (crypto_id, granularity, int(start))).fetchall()
+        if not rows:
+            return np.empty(0), np.empty(0)
+        data = np.array(rows, dtype=np.float64)
+        return data[:, 0] / 1000.0, data[:, 1]
+
+
+price_store = PriceStore()
@@ -0,0 +1,200 @@
+import atexit
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from PyQt6.QtCore import Qt, QTimer, QCoreApplication
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QWidget, QPlainTextEdit, QPushButton, QVBoxLayout, QHBoxLayout, QLabel
+from Settings import PROFILE, PROFILE_TRACE_FILE, STARTUP_BUDGET_MS, STARTUP_PROBE
+
+logger = logging.getLogger("profiler")
+
+
+class Span:
+    def __init__(self, profiler, name, category, args):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.args = args
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.category, self.started, time.perf_counter() - self.started, self.args)
+        return False
+
+
+class Profiler:
+    """
+    Opt-in client instrumentation (set GUI_PROFILE=1). Records every gateway request with
+    its latency, payload size and the gateway's Server-Timing breakdown, plus decode and
+    render spans, and writes them as a Chrome trace (chrome://tracing or ui.perfetto.dev)
+    on exit. When disabled, span() returns a shared no-op context and nothing is recorded.
+    """
+
+    def __init__(self, enabled, trace_path, max_events=200_000):
+        self.enabled = enabled
+        self.trace_path = trace_path
+        self.origin = time.perf_counter()
+        self.events = deque(maxlen=max_events)
+        self.recent_requests = deque(maxlen=30)
+        # name -> [count, total seconds, max seconds]
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._disabled_span = contextlib.nullcontext()
+
+        if enabled:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            atexit.register(self.save_trace)
+
+    def span(self, name, category="client", **args):
+        """
+        Context manager timing the enclosed block, e.g. with profiler.span("decode Quotes", "decode").
+        """
+        if not self.enabled:
+            return self._disabled_span
+        return Span(self, name, category, args)
+
+    def record(self, name, category, started, elapsed, args=None):
+        event = {
+            "name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+            "ts": (started - self.origin) * 1e6, "dur": elapsed * 1e6,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+            stats = self.stats.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+
+    def request(self, method, path, response, started, error=None, streamed=False):
+        """
+        Records one gateway call. Streamed responses are timed to their headers and sized
+        from Content-Length, so the body is not consumed here.
+        """
+        elapsed = time.perf_counter() - started
+        if response is None:
+            size, status, server_timing = None, type(error).__name__, ""
+        else:
+            length = response.headers.get("Content-Length")
+            size = int(length) if streamed and length else None if streamed else len(response.content)
+            status, server_timing = response.status_code, response.headers.get("Server-Timing", "")
+
+        self.record(f"{method} {path}", "request", started, elapsed,
+                    {"status": status, "bytes": size, "server_timing": server_timing})
+        with self._lock:
+            self.recent_requests.append((method, path, status, elapsed, size, server_timing))
+        logger.info("%s %s %s %.1f ms %s bytes %s", method, path, status, elapsed * 1000,
+                    "?" if size is None else size, server_timing)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.recent_requests), {name: list(stats) for name, stats in self.stats.items()}
+
+    def save_trace(self, path=None):
+        path = path or self.trace_path
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        logger.info("Trace with %d events written to %s", len(events), os.path.abspath(path))
+        return path
+
+
+profiler = Profiler(PROFILE, PROFILE_TRACE_FILE)
+
+
+class StartupTimer:
+    """
+    Time-to-interactive: from the first line of LoginWindow.py until the first window
+    (the login form, or the currency list when a saved session is resumed) is shown
+    and the event loop has handled its pending events. Runs over the budget are logged
+    as warnings; with GUI_STARTUP_PROBE=1 the time is printed and the client exits.
+    """
+
+    def __init__(self, started, budget_ms=STARTUP_BUDGET_MS, probe=STARTUP_PROBE):
+        self.started = started
+        self.budget_ms = budget_ms
+        self.probe = probe
+        self.elapsed_ms = None
+
+    def interactive(self, window_name):
+        if self.elapsed_ms is None:
+            QTimer.singleShot(0, lambda: self.finish(window_name))
+
+    def finish(self, window_name):
+        if self.elapsed_ms is not None:
+            return
+        elapsed = time.perf_counter() - self.started
+        self.elapsed_ms = elapsed * 1000
+        if profiler.enabled:
+            profiler.record(f"startup until {window_name}", "startup", self.started, elapsed)
+
+        if self.elapsed_ms > self.budget_ms:
+            logger.warning("Time to interactive %.0f ms (%s) is over the %d ms budget",
+                           self.elapsed_ms, window_name, self.budget_ms)
+        else:
+            logger.info("Time to interactive %.0f ms (%s)", self.elapsed_ms, window_name)
+
+        if self.probe:
+            print(f"time-to-interactive {self.elapsed_ms:.1f} ms {window_name}", flush=True)
+            QCoreApplication.quit()
+
+
+class ProfilerOverlay(QWidget):
+    """
+    Small always-on-top window listing the latest requests and the slowest spans.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Profiler")
+        self.setWindowFlags(Qt.WindowType.Tool | Qt.WindowType.WindowStaysOnTopHint)
+        self.resize(640, 420)
+
+        layout = QVBoxLayout(self)
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFont("Courier New", 9))
+        layout.addWidget(self.text)
+
+        bottom = QHBoxLayout()
+        self.status_label = QLabel(f"Trace: {os.path.abspath(profiler.trace_path)}")
+        bottom.addWidget(self.status_label)
+        bottom.addStretch()
+        save_button = QPushButton("Save Trace")
+        save_button.clicked.connect(lambda: self.status_label.setText(f"Saved {os.path.abspath(profiler.save_trace())}"))
+        bottom.addWidget(save_button)
+        layout.addLayout(bottom)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    def refresh(self):
+        requests, stats = profiler.snapshot()
+        lines = ["Recent requests (latency, bytes, gateway stages)"]
+        for method, path, status, elapsed, size, server_timing in reversed(requests):
+            size_text = "?" if size is None else f"{size / 1024:.1f}k"
+            lines.append(f"{method:<6}{path:<36}{status!s:>5}{elapsed * 1000:>9.1f} ms{size_text:>9}  {server_timing}")
+
+        lines += ["", f"{'Span':<44}{'count':>7}{'mean ms':>10}{'max ms':>10}"]
+        slowest = sorted(stats.items(), key=lambda item: item[1][1], reverse=True)[:15]
+        for name, (count, total, longest) in slowest:
+            lines.append(f"{name[:43]:<44}{count:>7}{total / count * 1000:>10.2f}{longest * 1000:>10.2f}")
+
+        self.text.setPlainText("\n".join(lines))
@@ -0,0 +1,102 @@
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from Settings import POOL_SIZE
+
+
+class RequestSignals(QObject):
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    progress = pyqtSignal(object)
+    done = pyqtSignal()
+
+
+class RequestTask(QRunnable):
+    """
+    Runs one blocking gateway call on a worker thread and reports the result
+    back to the Qt event loop through queued signals.
+    Streaming tasks receive the task itself as first argument so they can
+    report partial results and stop early once cancelled.
+    """
+
+    def __init__(self, fn, args, kwargs, streaming=False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.streaming = streaming
+        self.signals = RequestSignals()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def report(self, item):
+        if not self.cancelled:
+            self.signals.progress.emit(item)
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            if self.streaming:
+                result = self.fn(self, *self.args, **self.kwargs)
+            else:
+                result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(e)
+        else:
+            if not self.cancelled:
+                self.signals.succeeded.emit(result)
+        finally:
+            self.signals.done.emit()
+
+
+class RequestExecutor:
+    """
+    Shared worker pool for gateway I/O. Tasks are grouped by the widget that
+    submitted them so a window can drop all of its pending work when it closes.
+    """
+
+    def __init__(self, max_threads=POOL_SIZE):
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self._tasks = {}
+
+    def submit(self, owner, fn, *args, on_success=None, on_error=None, on_progress=None, **kwargs):
+        task = RequestTask(fn, args, kwargs, streaming=on_progress is not None)
+
+        # Callbacks run on the GUI thread; results of cancelled tasks are discarded
+        if on_success:
+            task.signals.succeeded.connect(lambda result: task.cancelled or on_success(result))
+        if on_error:
+            task.signals.failed.connect(lambda error: task.cancelled or on_error(error))
+        if on_progress:
+            task.signals.progress.connect(lambda item: task.cancelled or on_progress(item))
+        task.signals.done.connect(lambda: self._discard(owner, task))
+
+        self._tasks.setdefault(owner, set()).add(task)
+        self.pool.start(task)
+        return task
+
+    def cancel(self, owner):
+        for task in list(self._tasks.get(owner, ())):
+            task.cancel()
+            if self.pool.tryTake(task):
+                self._discard(owner, task)
+
+    def _discard(self, owner, task):
+        tasks = self._tasks.get(owner)
+        if tasks is None:
+            return
+        tasks.discard(task)
+        if not tasks:
+            del self._tasks[owner]
+
+
+executor = RequestExecutor()
@@ -0,0 +1,72 @@
+import json
+import os
+from requests import HTTPError
+from ApiClient import client
+from CurrencyCache import currencies
+from Settings import API_KEY, CACHE_DIR
+
+
+class Session:
+    """
+    The signed-in user's API key, held in memory and applied to the shared ApiClient,
+    instead of being written to .env and read back by Settings on the next import.
+    A snapshot next to the client cache lets the next start reuse a key the gateway
+    still accepts and skip the login form.
+    """
+
+    def __init__(self, path=os.path.join(CACHE_DIR, "session.json"), api_key=API_KEY):
+        self.path = path
+        self.api_key = None
+        self.email = None
+        self.load(api_key)
+
+    @property
+    def is_active(self):
+        return bool(self.api_key)
+
+    def load(self, fallback_key=None):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.api_key = snapshot.get("apiKey")
+            self.email = snapshot.get("email")
+        except (OSError, ValueError):
+            self.api_key = fallback_key or None
+        client.set_api_key(self.api_key)
+
+    def start(self, api_key, email):
+        self.api_key = api_key
+        self.email = email
+        client.set_api_key(api_key)
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"apiKey": api_key, "email": email}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        self.api_key = None
+        self.email = None
+        client.set_api_key(None)
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def validate(self):
+        """
+        Blocking check that the gateway still accepts the key, meant to run on the request
+        executor. It revalidates the supported currencies, which the next window needs anyway,
+        so a valid session costs no extra round trip. Returns False when the key was rejected.
+        """
+        try:
+            currencies.revalidate()
+        except HTTPError as error:
+            if error.response is not None and error.response.status_code == 401:
+                return False
+            raise
+        return True
+
+
+session = Session()
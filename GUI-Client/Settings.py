@@ -4,3 +4,36 @@ load_dotenv()
 
 API_SERVER = "http://localhost:5182/api/"
 API_KEY = getenv("API_KEY")
+
+# HTTP client tuning: (connect, read) timeouts in seconds, keep-alive pool size
+# and retry policy for idempotent gateway calls
+REQUEST_TIMEOUT = (3.05, 15)
+AGENT_TIMEOUT = (3.05, 120)
+POOL_SIZE = 10
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+
+# Client-side cache: snapshots persisted between runs and their freshness window in seconds
+CACHE_DIR = ".cache"
+CURRENCIES_TTL = 24 * 60 * 60
+
+# Live price updates: ticker and quote table poll intervals in milliseconds and chart ring buffer length
+TICKER_INTERVAL_MS = 15000
+QUOTES_INTERVAL_MS = 15000
+CHART_MAX_POINTS = 100000
+
+# Price alerts: stream read timeout in seconds (the gateway sends a keep-alive every 30s)
+# and the delay before reconnecting a dropped stream in milliseconds
+ALERT_STREAM_TIMEOUT = (3.05, 75)
+ALERT_RECONNECT_MS = 5000
+
+# Transaction history rows requested per page while scrolling; the gateway caches first pages of up to 100 rows
+TRANSACTIONS_PAGE_SIZE = 100
+
+# Opt-in profiling (GUI_PROFILE=1): per-request timings, a debug overlay and a Chrome trace written on exit
+PROFILE = getenv("GUI_PROFILE", "") not in ("", "0")
+PROFILE_TRACE_FILE = getenv("GUI_PROFILE_TRACE", "gui-trace.json")
+
+# Time-to-interactive budget in milliseconds; GUI_STARTUP_PROBE=1 prints it and exits (used by Benchmarks/ClientStartup.py)
+STARTUP_BUDGET_MS = 1000
+STARTUP_PROBE = getenv("GUI_STARTUP_PROBE", "") not in ("", "0")
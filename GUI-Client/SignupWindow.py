@@ -3,7 +3,8 @@ from PyQt6.QtWidgets import (
     QWidget, QLineEdit, QPushButton,
     QVBoxLayout, QMessageBox, QLabel
 )
-from Settings import API_SERVER
+from ApiClient import client
+from RequestExecutor import executor
 
 
 class RegisterWindow(QWidget):
@@ -81,15 +82,33 @@ class RegisterWindow(QWidget):
             email = self.email_input.text()
             password = self.password_input.text()
             username = self.username_input.text()
-            url = API_SERVER + "Users/register"
             data = {"email": email,"username": username , "password": password}
-            try:
-                response = requests.put(url, data=data)
-                if response.status_code == 200:
-                    QMessageBox.information(self, "Signup", "Successfully Signup")
-                else:
-                    QMessageBox.warning(self, "ERROR", "Wrong username or password")
-            except requests.exceptions.RequestException as e:
-                QMessageBox.critical(self, "ERROR", f"Network error: {e}")
+            self.register_button.setEnabled(False)
+            self.register_button.setText("Signing up...")
+            executor.submit(self, client.put, "Users/register", data=data,
+                            on_success=self.on_register_response, on_error=self.on_register_error)
 
-            self.close()
+    def on_register_response(self, response):
+        self.reset_register_button()
+        if response.status_code == 200:
+            QMessageBox.information(self, "Signup", "Successfully Signup")
+        else:
+            QMessageBox.warning(self, "ERROR", "Wrong username or password")
+        self.close()
+
+    def on_register_error(self, error):
+        self.reset_register_button()
+        if isinstance(error, requests.exceptions.RequestException):
+            QMessageBox.critical(self, "ERROR", f"Network error: {error}")
+        else:
+            QMessageBox.critical(self, "ERROR", str(error))
+        self.close()
+
+    def reset_register_button(self):
+        self.register_button.setEnabled(True)
+        self.register_button.setText("Sign up")
+
+    def closeEvent(self, event):
+        executor.cancel(self)
+        self.reset_register_button()
+        super().closeEvent(event)
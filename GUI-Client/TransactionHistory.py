@@ -0,0 +1,223 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate, QDateTime, QTime, pyqtSignal
+from PyQt6.QtWidgets import (
+    QWidget, QLabel, QTableView, QHeaderView, QComboBox, QDateEdit,
+    QVBoxLayout, QHBoxLayout, QMessageBox
+)
+from ApiClient import client
+from CurrencyCache import currencies
+from Profiler import profiler
+from RequestExecutor import executor
+from Settings import TRANSACTIONS_PAGE_SIZE
+
+COLUMNS = ["Blockchain ID", "Currency", "Type", "Amount", "Total Price", "DateTime"]
+NUMERIC_COLUMNS = {3, 4}
+
+
+def fetch_transactions_page(filters, cursor, limit):
+    """
+    Fetches one page of the transaction history, newest first.
+    Runs on the request executor; returns (transactions, next_cursor).
+    """
+    params = {key: value for key, value in filters.items() if value is not None}
+    params["limit"] = limit
+    if cursor:
+        params["cursor"] = cursor
+
+    response = client.get("Transactions/TransactionsHistory", params=params)
+    response.raise_for_status()
+    with profiler.span("decode TransactionsHistory", "decode"):
+        body = response.json()
+    return body.get("transactionsHistory", []), body.get("nextCursor")
+
+
+class TransactionsModel(QAbstractTableModel):
+    """
+    Table model over the paginated TransactionsHistory endpoint. The view asks for
+    more rows through canFetchMore/fetchMore as it scrolls, and each request loads
+    the next page on the request executor. Rows are formatted once when a page
+    arrives so data() stays a lookup.
+    """
+
+    page_loaded = pyqtSignal()
+    page_failed = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names = {crypto_id: name for name, crypto_id in currencies.id_map.items()}
+        self.filters = {}
+        self.rows = []
+        self.cursor = None
+        self.has_more = True
+        self.task = None
+
+    @property
+    def is_loading(self):
+        return self.task is not None
+
+    def set_filters(self, filters):
+        """
+        Drops the loaded rows and starts over with the given query filters.
+        """
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+        self.beginResetModel()
+        self.filters = filters
+        self.rows = []
+        self.cursor = None
+        self.has_more = True
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column() in NUMERIC_COLUMNS:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more and not self.is_loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self.task = executor.submit(self, fetch_transactions_page, dict(self.filters), self.cursor,
+                                    TRANSACTIONS_PAGE_SIZE, on_success=self.on_page, on_error=self.on_error)
+
+    def on_page(self, page):
+        transactions, next_cursor = page
+        self.task = None
+        self.cursor = next_cursor
+        self.has_more = next_cursor is not None
+
+        if transactions:
+            first = len(self.rows)
+            with profiler.span("render TransactionsHistory page", "render", rows=len(transactions)):
+                self.beginInsertRows(QModelIndex(), first, first + len(transactions) - 1)
+                self.rows.extend(self.format_row(tx) for tx in transactions)
+                self.endInsertRows()
+        self.page_loaded.emit()
+
+    def on_error(self, error):
+        self.task = None
+        self.page_failed.emit(error)
+
+    def format_row(self, tx):
+        crypto_id = tx.get("cryptoId")
+        return (
+            str(tx.get("id", "")),
+            self.names.get(crypto_id, str(crypto_id)),
+            tx.get("type", ""),
+            str(tx.get("amount", "")),
+            str(tx.get("priceAtTransaction", "")),
+            tx.get("dateTime", "")[:16].replace("T", " "),
+        )
+
+
+class TransactionHistoryWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Transaction History")
+        self.resize(700, 600)
+
+        layout = QVBoxLayout(self)
+
+        filter_layout = QHBoxLayout()
+        self.currency_filter = QComboBox()
+        self.currency_filter.addItem("All currencies", None)
+        for name, crypto_id in currencies.id_map.items():
+            self.currency_filter.addItem(name, crypto_id)
+
+        self.type_filter = QComboBox()
+        self.type_filter.addItem("Buy & Sell", None)
+        self.type_filter.addItem("Buy", "buy")
+        self.type_filter.addItem("Sell", "sell")
+
+        # The minimum date stands for "no bound" and is shown as "Any"
+        self.from_filter = self.create_date_filter("From: ")
+        self.to_filter = self.create_date_filter("To: ")
+
+        for widget in [self.currency_filter, self.type_filter, self.from_filter, self.to_filter]:
+            filter_layout.addWidget(widget)
+        filter_layout.addStretch()
+        layout.addLayout(filter_layout)
+
+        self.model = TransactionsModel(self)
+        self.model.page_loaded.connect(self.update_status)
+        self.model.page_failed.connect(self.on_page_error)
+
+        # Fixed row heights and column sizes keep layout independent of the number of rows
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel("Loading...")
+        layout.addWidget(self.status_label)
+
+        self.currency_filter.currentIndexChanged.connect(self.apply_filters)
+        self.type_filter.currentIndexChanged.connect(self.apply_filters)
+        self.from_filter.dateChanged.connect(self.apply_filters)
+        self.to_filter.dateChanged.connect(self.apply_filters)
+        self.apply_filters()
+
+    @staticmethod
+    def create_date_filter(prefix):
+        date_filter = QDateEdit()
+        date_filter.setCalendarPopup(True)
+        date_filter.setDisplayFormat(prefix + "yyyy-MM-dd")
+        date_filter.setMinimumDate(QDate(2000, 1, 1))
+        date_filter.setSpecialValueText(prefix + "Any")
+        date_filter.setDate(date_filter.minimumDate())
+        return date_filter
+
+    @staticmethod
+    def to_utc(date_filter, days=0):
+        if date_filter.date() == date_filter.minimumDate():
+            return None
+        start_of_day = QDateTime(date_filter.date().addDays(days), QTime(0, 0))
+        return start_of_day.toUTC().toString(Qt.DateFormat.ISODate)
+
+    def apply_filters(self):
+        self.status_label.setText("Loading...")
+        self.model.set_filters({
+            "cryptoId": self.currency_filter.currentData(),
+            "type": self.type_filter.currentData(),
+            "from": self.to_utc(self.from_filter),
+            # The "To" day is included, so the bound is the start of the next day
+            "to": self.to_utc(self.to_filter, days=1),
+        })
+
+    def update_status(self):
+        count = self.model.rowCount()
+        if not count:
+            self.status_label.setText("No transactions found.")
+        elif self.model.has_more:
+            self.status_label.setText(f"{count} transactions loaded, scroll for more")
+        else:
+            self.status_label.setText(f"{count} transactions")
+
+    def on_page_error(self, error):
+        self.status_label.setText("Failed to load transactions.")
+        QMessageBox.critical(self, "Error", f"Failed to fetch transactions:\n{error}")
+
+    def closeEvent(self, event):
+        executor.cancel(self.model)
+        super().closeEvent(event)
@@ -1,43 +1,52 @@
-import requests
 from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import (
     QWidget, QLabel, QPushButton,
     QVBoxLayout, QMessageBox, QHBoxLayout, QSpinBox, QSlider, QInputDialog
 )
 from PyQt6.QtCore import Qt
-from Settings import API_KEY, API_SERVER
-
-
-Wallet: {str, int} = {}
+from ApiClient import client
+from OrderBasket import basket, OrderBasketWindow
+from RequestExecutor import executor
 
 
 class BuySellWindow(QWidget):
     def __init__(self, action, currency_data, currency_id):
         super().__init__()
-        self.wallet = Wallet
-        self.API_KEY = API_KEY
-
-        response = requests.get(API_SERVER + "APIServices/SupportedCurrencies", headers={"X-Api-Key": self.API_KEY})
-        if response.status_code == 200:
-            self.ID_MAP = response.json().get("supportedCurrencies")
-
+        # Latest Transactions/Portfolio snapshot; Buy, Sell and AddMoney return a fresh one
+        self.portfolio = None
         self.currency_id = currency_id
+        self.basket_window = None
 
         self.setWindowTitle(f"{action} {currency_data['name']}")
-        self.setFixedSize(420, 400)
+        self.setFixedSize(420, 490)
         self.currency_data = currency_data
         self.action = action.lower()
 
         self.add_money_button = QPushButton("Add Money")
         self.confirm_button = QPushButton("Confirm Transaction")
+        self.add_to_basket_button = QPushButton("Add to Basket")
+        self.view_basket_button = QPushButton()
         self.back_button = QPushButton("Back")
-        self.label = QLabel(f"{self.action.capitalize()} - Price: ${self.currency_data['price_usd']}")
+        self.label = QLabel(f"{self.action.capitalize()} - Price: ${self.currency_data['priceUsd']}")
         self.amount_input = QSpinBox()
         self.total_price_label = QLabel("Total Price: $0.00")
 
         self.init_ui()
+        self.wallet_status_label.setText("Loading wallet...")
         self.refresh_wallet_display()
 
+    def on_request_error(self, error):
+        self.set_busy(False)
+        QMessageBox.critical(self, "Error", f"An error occurred:\n{str(error)}")
+
+    def set_busy(self, busy):
+        for button in [self.confirm_button, self.add_money_button, self.balance_button]:
+            button.setEnabled(not busy)
+
+    def closeEvent(self, event):
+        executor.cancel(self)
+        super().closeEvent(event)
+
     def init_ui(self):
         layout = QVBoxLayout()
         layout.setContentsMargins(20, 20, 20, 20)
@@ -84,6 +93,18 @@ class BuySellWindow(QWidget):
 
         layout.addLayout(button_layout)
 
+        basket_layout = QHBoxLayout()
+        self.add_to_basket_button.setStyleSheet(button_style)
+        self.add_to_basket_button.clicked.connect(self.add_to_basket)
+        basket_layout.addWidget(self.add_to_basket_button)
+
+        self.view_basket_button.setStyleSheet(button_style)
+        self.view_basket_button.clicked.connect(self.open_basket)
+        basket_layout.addWidget(self.view_basket_button)
+        layout.addLayout(basket_layout)
+        basket.changed.connect(self.update_basket_button)
+        self.update_basket_button()
+
         self.wallet_status_label = QLabel(" ")
         self.wallet_status_label.setFont(QFont("Arial", 12))
         layout.addWidget(self.wallet_status_label)
@@ -99,81 +120,108 @@ class BuySellWindow(QWidget):
         # layout.addWidget(self.back_button)
         self.setLayout(layout)
 
+    def add_to_basket(self):
+        basket.add(self.currency_id, self.currency_data["name"], self.action, self.amount_input.value())
+
+    def update_basket_button(self):
+        self.view_basket_button.setText(f"View Basket ({len(basket.orders)})")
+
+    def open_basket(self):
+        if self.basket_window is None:
+            self.basket_window = OrderBasketWindow()
+        self.basket_window.show()
+        self.basket_window.raise_()
+
+    def current_holding(self):
+        if not self.portfolio:
+            return None
+        return next((h for h in self.portfolio["holdings"] if h["cryptoId"] == self.currency_id), None)
+
     def update_amount_from_slider(self, percent):
+        if not self.portfolio:
+            return
         if self.action == "buy":
-            dollar_balance = self.wallet.get("usd_balance", 0)
-            amount_dollars = (percent / 100) * dollar_balance
-            units = amount_dollars / float(self.currency_data['price_usd'])
+            amount_dollars = (percent / 100) * self.portfolio["cashUsd"]
+            units = amount_dollars / float(self.currency_data['priceUsd'])
         else:
-            coin_balance = self.wallet.get(self.currency_data['id'], 0)
-            units = (percent / 100) * coin_balance
+            holding = self.current_holding()
+            units = (percent / 100) * (holding["amount"] if holding else 0)
 
         self.amount_input.setValue(int(units))
         self.update_total_price()
 
-    def update_wallet_local(self, currency_id: int, amount: float, action: str):
-        coin_key = self.ID_MAP.get(currency_id, None)
-        price_per_unit = float(self.currency_data["price_usd"])
-        usd_change = amount * price_per_unit
-
-        if action == "buy":
-            self.wallet["balance"] -= usd_change
-            self.wallet[coin_key] = self.wallet.get(coin_key, 0) + amount
-        elif action == "sell":
-            self.wallet["balance"] += usd_change
-            self.wallet[coin_key] = self.wallet.get(coin_key, 0) - amount
-
     def update_total_price(self):
         units = self.amount_input.value()
-        price_per_unit = float(self.currency_data['price_usd'])
+        price_per_unit = float(self.currency_data['priceUsd'])
         total = units * price_per_unit
         self.total_price_label.setText(f"Total Price: ${total:.2f}")
 
     def refresh_wallet_display(self):
-        try:
-            url = API_SERVER + f"Transactions/WalletBalance"
-            response = requests.get(url, headers={"X-Api-Key": self.API_KEY})
-            if response.status_code == 200:
-                self.wallet.update(response.json().get('walletBalance'))
-                usd_balance = self.wallet.get("balance", 0)
-                coin_balance = self.wallet.get(self.ID_MAP.get(self.currency_id, None), 0)
-                self.wallet_status_label.setText(
-                    f"Wallet: ${usd_balance:.2f}\n\n{self.currency_data['name']}: {coin_balance:.2f}"
-                )
-            else:
-                QMessageBox.warning(self, "Error", "Failed to retrieve wallet.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        self.balance_button.setEnabled(False)
+        executor.submit(self, client.get, "Transactions/Portfolio",
+                        on_success=self.on_wallet_loaded, on_error=self.on_request_error)
+
+    def on_wallet_loaded(self, response):
+        self.balance_button.setEnabled(True)
+        if response.status_code == 200:
+            self.show_portfolio(response.json().get("portfolio"))
+        else:
+            QMessageBox.warning(self, "Error", "Failed to retrieve wallet.")
+
+    def show_portfolio(self, portfolio):
+        if not portfolio:
+            # The change went through but could not be valued; fetch the snapshot instead
+            self.refresh_wallet_display()
+            return
+
+        self.portfolio = portfolio
+        holding = self.current_holding()
+        amount = holding["amount"] if holding else 0
+        value = holding["valueUsd"] if holding else 0
+        self.wallet_status_label.setText(
+            f"Wallet: ${portfolio['cashUsd']:,.2f}\n\n"
+            f"{self.currency_data['name']}: {amount:g} (${value:,.2f})\n\n"
+            f"Portfolio total: ${portfolio['totalValueUsd']:,.2f}"
+        )
 
     def add_money(self):
         amount, ok = QInputDialog.getInt(self, "Add Money", "Enter amount to add:", min=1)
         if ok:
-            try:
-                url = API_SERVER + "Transactions/AddMoney"
-                data = {"amount": amount}
-                response = requests.post(url, headers={"X-Api-Key": self.API_KEY}, data=data)
-                if response.status_code == 200:
-                    QMessageBox.information(self, "Success", f"${amount} added to your wallet.")
-                    self.refresh_wallet_display()
-                else:
-                    QMessageBox.warning(self, "Error", "Failed to add money.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"An error occurred:\n{str(e)}")
+            data = {"amount": amount}
+            self.set_busy(True)
+            executor.submit(self, client.post, "Transactions/AddMoney", data=data,
+                            on_success=lambda response: self.on_money_added(response, amount),
+                            on_error=self.on_request_error)
+
+    def on_money_added(self, response, amount):
+        self.set_busy(False)
+        if response.status_code == 200:
+            QMessageBox.information(self, "Success", f"${amount} added to your wallet.")
+            self.show_portfolio(response.json().get("portfolio"))
+        else:
+            QMessageBox.warning(self, "Error", "Failed to add money.")
 
     def confirm_transaction(self):
         amount = self.amount_input.value()
-        try:
-            url = API_SERVER + f"Transactions/{self.action}"
-            data = {
-                "id": self.currency_data["id"],
-                "amount": amount
-            }
-            response = requests.post(url, headers={"X-Api-Key": self.API_KEY}, data=data)
-            if response.status_code == 200:
-                QMessageBox.information(self, "Success", f"{self.action.capitalize()} completed successfully.")
-                self.refresh_wallet_display()
-                self.update_wallet_local(self.currency_data["id"], amount, self.action)
-            else:
-                QMessageBox.warning(self, "Failed", f"{self.action.capitalize()} failed.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred:\n{str(e)}")
+        data = {
+            "id": self.currency_data["id"],
+            "amount": amount
+        }
+        self.set_busy(True)
+        self.confirm_button.setText("Processing...")
+        executor.submit(self, client.post, f"Transactions/{self.action}", data=data,
+                        on_success=lambda response: self.on_transaction_done(response, amount),
+                        on_error=self.on_transaction_error)
+
+    def on_transaction_done(self, response, amount):
+        self.set_busy(False)
+        self.confirm_button.setText("Confirm Transaction")
+        if response.status_code == 200:
+            QMessageBox.information(self, "Success", f"{self.action.capitalize()} completed successfully.")
+            self.show_portfolio(response.json().get("portfolio"))
+        else:
+            QMessageBox.warning(self, "Failed", f"{self.action.capitalize()} failed.")
+
+    def on_transaction_error(self, error):
+        self.confirm_button.setText("Confirm Transaction")
+        self.on_request_error(error)